@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Index build time and query latency for full-text hybrid retrieval.
+
+Generates synthetic full-text papers, chunks them with ``TextChunker``, and
+times building the vector store and the BM25 index, then compares query
+latency of vector-only, BM25-only and hybrid (RRF) retrieval with and without
+the BM25 pre-filter. Embeddings are synthetic (topic centroid + noise), so the
+benchmark needs no API key.
+
+Usage:
+    python benchmarks/bench_hybrid_retrieval.py
+    python benchmarks/bench_hybrid_retrieval.py --papers 2000 --words 6000 --dimension 1536
+    python benchmarks/bench_hybrid_retrieval.py --chunk-tokens 256 --overlap-tokens 32
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from arakis.models.paper import Paper
+from arakis.models.rag import RetrievalQuery
+from arakis.rag.bm25 import BM25Index
+from arakis.rag.chunker import TextChunker
+from arakis.rag.hybrid import HybridRetriever
+from arakis.rag.vector_store import VectorStore
+
+console = Console()
+
+
+class SyntheticEmbedder:
+    """Stands in for ``Embedder``: query vectors come from a lookup table."""
+
+    model = "synthetic"
+
+    def __init__(self, query_vectors: dict[str, np.ndarray]):
+        self.query_vectors = query_vectors
+
+    async def embed_texts(self, texts, use_cache=True):
+        return [self.query_vectors[text].tolist() for text in texts]
+
+
+def make_papers(count: int, words: int, topics: int, rng: np.random.Generator):
+    """Papers whose text mixes a shared vocabulary with topic-specific terms."""
+    common = [f"term{i}" for i in range(5000)]
+    topic_terms = [[f"topic{t}word{i}" for i in range(50)] for t in range(topics)]
+    zipf = 1.0 / np.arange(1, len(common) + 1)
+    zipf /= zipf.sum()
+
+    papers, paper_topics = [], []
+    for i in range(count):
+        topic = int(rng.integers(topics))
+        body = list(rng.choice(common, size=words, p=zipf))
+        for pos in rng.integers(0, words, size=words // 20):
+            body[pos] = topic_terms[topic][int(rng.integers(50))]
+        papers.append(
+            Paper(
+                id=f"paper{i}",
+                title=f"Synthetic paper {i}",
+                abstract=" ".join(body[:200]),
+                full_text=" ".join(body),
+            )
+        )
+        paper_topics.append(topic)
+    return papers, paper_topics, topic_terms
+
+
+def timed(func, *args, **kwargs):
+    """Call func and return (result, seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=500)
+    parser.add_argument("--words", type=int, default=4000, help="Full-text words per paper")
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--chunk-tokens", type=int, default=512)
+    parser.add_argument("--overlap-tokens", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    papers, paper_topics, topic_terms = make_papers(args.papers, args.words, args.topics, rng)
+    chunker = TextChunker(chunk_tokens=args.chunk_tokens, overlap_tokens=args.overlap_tokens)
+
+    build = Table(title=f"Index build ({args.papers} full-text papers)")
+    for column in ("stage", "seconds", "items"):
+        build.add_column(column, justify="right")
+
+    chunks, seconds = timed(lambda: [c for p in papers for c in chunker.chunk_paper(p)])
+    build.add_row("chunk full text", f"{seconds:.2f}", f"{len(chunks):,} chunks")
+
+    centers = rng.standard_normal((args.topics, args.dimension)).astype(np.float32)
+    paper_index = {paper.best_identifier: i for i, paper in enumerate(papers)}
+    vectors = centers[[paper_topics[paper_index[c.paper_id]] for c in chunks]]
+    vectors = vectors + 0.5 * rng.standard_normal(vectors.shape).astype(np.float32)
+
+    store = VectorStore(dimension=args.dimension, index_type="auto", metric="cosine")
+    _, seconds = timed(store.add_vectors, chunks, vectors)
+    build.add_row(f"vector store ({store.active_type})", f"{seconds:.2f}", f"{store.size:,}")
+
+    bm25 = BM25Index()
+    _, seconds = timed(bm25.add_batch, chunks)
+    build.add_row("bm25 index", f"{seconds:.2f}", f"{len(bm25.postings):,} terms")
+    console.print(build)
+
+    query_vectors, queries = {}, []
+    for i in range(args.queries):
+        topic = int(rng.integers(args.topics))
+        text = " ".join(rng.choice(topic_terms[topic], size=3)) + f" q{i}"
+        noise = 0.5 * rng.standard_normal(args.dimension).astype(np.float32)
+        query_vectors[text] = centers[topic] + noise
+        queries.append(RetrievalQuery(query_text=text, top_k=args.k))
+
+    latency = Table(title=f"Query latency (k={args.k}, {args.queries} queries)")
+    for column in ("mode", "p50 ms", "p99 ms"):
+        latency.add_column(column, justify="right")
+
+    def measure(search):
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            search(query)
+            samples.append((time.perf_counter() - start) * 1000)
+        return np.percentile(samples, 50), np.percentile(samples, 99)
+
+    embedder = SyntheticEmbedder(query_vectors)
+    loop = asyncio.new_event_loop()
+    modes = {
+        "vector": lambda q: store.search(query_vectors[q.query_text].tolist(), top_k=q.top_k),
+        "bm25": lambda q: bm25.search(q.query_text, top_k=q.top_k),
+    }
+    for label, prefilter in (("hybrid", None), ("hybrid + prefilter", args.papers // 5)):
+        retriever = HybridRetriever(
+            embedder=embedder, vector_store=store, bm25_index=bm25, prefilter_papers=prefilter
+        )
+        modes[label] = lambda q, r=retriever: loop.run_until_complete(r.retrieve(q))
+
+    for label, search in modes.items():
+        p50, p99 = measure(search)
+        latency.add_row(label, f"{p50:.2f}", f"{p99:.2f}")
+    console.print(latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Recall@k vs latency benchmark for VectorStore index modes.
+
+Builds each index type over synthetic unit-normalized vectors and compares
+approximate results against exact (flat) search.
+
+Usage:
+    python benchmarks/bench_vector_store.py
+    python benchmarks/bench_vector_store.py --sizes 1000 10000 100000 1000000 --dimension 128
+    python benchmarks/bench_vector_store.py --sizes 100000 --nprobe 8 16 32 --ef-search 32 64 128
+    python benchmarks/bench_vector_store.py --sizes 1000000 --dimension 128 --pq-refine 0
+
+The 1M set at the production dimension (1536) needs ~6 GB of RAM; use a
+smaller ``--dimension`` to sweep the largest sizes on a laptop.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from arakis.models.rag import ChunkType, TextChunk
+from arakis.rag.vector_store import VectorStore
+
+console = Console()
+
+
+def make_dataset(size: int, dimension: int, queries: int, seed: int):
+    """Clustered synthetic vectors (uniform noise makes ANN look unrealistically bad)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, size // 100), dimension)).astype(np.float32)
+    assignments = rng.integers(0, len(centers), size)
+    vectors = centers[assignments] + 0.3 * rng.standard_normal((size, dimension)).astype(np.float32)
+    query_idx = rng.choice(size, queries, replace=False)
+    query_vectors = vectors[query_idx] + 0.1 * rng.standard_normal((queries, dimension)).astype(
+        np.float32
+    )
+    return vectors, query_vectors
+
+
+def build_store(index_type: str, vectors: np.ndarray, **kwargs) -> tuple[VectorStore, float]:
+    """Build a store and return it with its build time in seconds."""
+    chunks = [
+        TextChunk(paper_id=str(i), chunk_type=ChunkType.ABSTRACT, text="")
+        for i in range(len(vectors))
+    ]
+    store = VectorStore(
+        dimension=vectors.shape[1], index_type=index_type, metric="cosine", **kwargs
+    )
+    start = time.perf_counter()
+    store.add_vectors(chunks, vectors)
+    return store, time.perf_counter() - start
+
+
+def run_queries(store: VectorStore, queries: np.ndarray, k: int):
+    """Return per-query result id sets and latencies in milliseconds."""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = store.search(query.tolist(), top_k=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({chunk.paper_id for chunk, _ in hits})
+    return results, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[16])
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[64])
+    parser.add_argument("--pq-refine", type=int, default=4, help="0 = PQ codes only")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    table = Table(title=f"VectorStore recall@{args.k} vs latency (dim={args.dimension})")
+    for column in ("vectors", "index", "params", "build s", "recall", "p50 ms", "p99 ms"):
+        table.add_column(column, justify="right")
+
+    for size in args.sizes:
+        vectors, queries = make_dataset(size, args.dimension, args.queries, args.seed)
+
+        exact, build_s = build_store("flat", vectors)
+        truth, latencies = run_queries(exact, queries, args.k)
+        table.add_row(
+            f"{size:,}",
+            "flat",
+            "exact",
+            f"{build_s:.2f}",
+            "1.000",
+            f"{np.percentile(latencies, 50):.2f}",
+            f"{np.percentile(latencies, 99):.2f}",
+        )
+        del exact
+
+        candidates = [("hnsw", {"ef_search": ef}) for ef in args.ef_search]
+        candidates += [
+            ("ivfpq", {"nprobe": nprobe, "pq_refine": args.pq_refine}) for nprobe in args.nprobe
+        ]
+        for index_type, params in candidates:
+            store, build_s = build_store(index_type, vectors, **params)
+            if store.active_type != index_type:
+                # Too few vectors to train the quantizers; the store stayed exact
+                continue
+            found, latencies = run_queries(store, queries, args.k)
+            recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+            table.add_row(
+                f"{size:,}",
+                index_type,
+                ", ".join(f"{key}={value}" for key, value in params.items()),
+                f"{build_s:.2f}",
+                f"{recall:.3f}",
+                f"{np.percentile(latencies, 50):.2f}",
+                f"{np.percentile(latencies, 99):.2f}",
+            )
+            del store
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,45 @@
 'use client';
 
-import { useCallback } from 'react';
+import { useCallback, useEffect } from 'react';
 import { api } from '@/lib/api/client';
 import { useStore } from '@/store';
 import { usePolling } from './usePolling';
-import type { WorkflowCreateRequest, WorkflowResponse } from '@/types';
+import type {
+  ProgressStreamMessage,
+  StageCheckpoint,
+  StageProgress,
+  WorkflowCreateRequest,
+  WorkflowResponse,
+} from '@/types';
+
+const MAX_RECENT_EVENTS = 20;
+
+// Merge a live progress message into the stage checkpoints
+function applyProgressMessage(
+  stages: StageCheckpoint[],
+  message: ProgressStreamMessage
+): StageCheckpoint[] {
+  if (message.type === 'snapshot') {
+    return stages.map((s) =>
+      message.stages[s.stage]
+        ? { ...s, progress: { ...s.progress, ...message.stages[s.stage] } as StageProgress }
+        : s
+    );
+  }
+  if (message.type === 'progress') {
+    return stages.map((s) => {
+      if (s.stage !== message.stage) return s;
+      const recent = [...(s.progress?.recent_decisions ?? []), message.event];
+      const progress = {
+        ...s.progress,
+        ...message.changes,
+        recent_decisions: recent.slice(-MAX_RECENT_EVENTS) as Record<string, unknown>[],
+      } as StageProgress;
+      return { ...s, progress };
+    });
+  }
+  return stages;
+}
 
 export function useWorkflow() {
   const {
@@ -39,8 +74,9 @@ export function useWorkflow() {
     },
     {
       enabled: shouldPoll,
-      interval: 5000, // 5 seconds when idle
-      activeInterval: 2000, // 2 seconds when actively processing
+      // Stage progress arrives over the live stream below; polling only tracks status changes
+      interval: 10000, // 10 seconds when idle
+      activeInterval: 5000, // 5 seconds when actively processing
       jitter: true, // Prevent thundering herd
       isActive: (data) => {
         // Consider active if any stage is in_progress
@@ -109,6 +145,30 @@ export function useWorkflow() {
     }
   );
 
+  // Stream live stage progress while the workflow runs
+  useEffect(() => {
+    if (!shouldPoll || !workflowId) return;
+
+    const controller = new AbortController();
+    api
+      .streamWorkflowProgress(
+        workflowId,
+        (message) => {
+          const current = useStore.getState().workflow.current;
+          if (!current || current.id !== workflowId || !current.stages) return;
+          updateWorkflow({ ...current, stages: applyProgressMessage(current.stages, message) });
+        },
+        controller.signal
+      )
+      .catch((error) => {
+        if (!controller.signal.aborted) {
+          console.warn('[Workflow] Progress stream closed, relying on polling:', error);
+        }
+      });
+
+    return () => controller.abort();
+  }, [shouldPoll, workflowId, updateWorkflow]);
+
   const createWorkflow = useCallback(
     async (data: WorkflowCreateRequest): Promise<WorkflowResponse> => {
       setIsCreating(true);
@@ -206,7 +266,7 @@ export function useWorkflow() {
           setIsPolling(workflowData.status === 'running');
           addMessage({
             role: 'assistant',
-            content: `Stage "${stage}" has been rerun successfully.`,
+            content: `Stage "${stage}" has been queued for re-run.`,
           });
         } else {
           addMessage({
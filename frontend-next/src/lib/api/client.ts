@@ -10,6 +10,7 @@ import type {
   OAuthLoginResponse,
   StageCheckpoint,
   StageRerunResponse,
+  ProgressStreamMessage,
 } from '@/types';
 import { ACCESS_TOKEN_KEY, REFRESH_TOKEN_KEY } from '@/types';
 
@@ -262,6 +263,52 @@ class ApiClient {
     return this.request(`/api/workflows/${workflowId}/stages`);
   }
 
+  // Live progress over Server-Sent Events. Uses fetch rather than EventSource so the
+  // Authorization header can be sent. Resolves when the server closes the stream.
+  async streamWorkflowProgress(
+    workflowId: string,
+    onMessage: (message: ProgressStreamMessage) => void,
+    signal?: AbortSignal
+  ): Promise<void> {
+    const headers: Record<string, string> = { Accept: 'text/event-stream' };
+    const token = this.getAccessToken();
+    if (token) {
+      headers['Authorization'] = `Bearer ${token}`;
+    }
+
+    const response = await fetch(`${this.baseUrl}/api/workflows/${workflowId}/progress/stream`, {
+      headers,
+      signal,
+    });
+    if (!response.ok || !response.body) {
+      throw new ApiError(response.status, `Progress stream failed with status ${response.status}`);
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+
+      // Events are separated by a blank line; lines starting with ':' are keep-alives
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const data = buffer
+          .slice(0, boundary)
+          .split('\n')
+          .filter((line) => line.startsWith('data: '))
+          .map((line) => line.slice(6))
+          .join('\n');
+        buffer = buffer.slice(boundary + 2);
+        if (data) {
+          onMessage(JSON.parse(data));
+        }
+        boundary = buffer.indexOf('\n\n');
+      }
+    }
+  }
+
   // ============= Manuscript Endpoints =============
 
   async getManuscript(workflowId: string): Promise<ManuscriptResponse> {
@@ -76,6 +76,18 @@ export interface StageProgress {
   word_count: number;
 }
 
+// Messages on the live progress stream (GET /api/workflows/{id}/progress/stream)
+export type ProgressStreamMessage =
+  | { type: 'snapshot'; workflow_id: string; stages: Record<string, Partial<StageProgress>> }
+  | {
+      type: 'progress';
+      workflow_id: string;
+      stage: string;
+      event: Record<string, unknown>;
+      changes: Partial<StageProgress>;
+    }
+  | { type: 'stage_finalized'; workflow_id: string; stage: string };
+
 export interface StageCheckpoint {
   stage: string;
   status: StageStatus;
@@ -23,7 +23,7 @@ from arakis.models.extraction import (
     ReviewerDecision,
 )
 from arakis.models.paper import Paper
-from arakis.utils import BatchProcessor, retry_with_exponential_backoff
+from arakis.utils import BatchProcessor, get_token_encoding, retry_with_exponential_backoff
 
 # Module logger
 _logger = get_logger("extractor")
@@ -265,9 +265,7 @@ Use the extract_data function to provide your extractions."""
         Returns:
             Token count
         """
-        import tiktoken
-
-        encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 encoding
+        encoding = get_token_encoding("cl100k_base")  # GPT-4 encoding
         return len(encoding.encode(text))
 
     def _truncate_to_tokens(self, text: str, max_tokens: int) -> str:
@@ -281,9 +279,7 @@ Use the extract_data function to provide your extractions."""
         Returns:
             Truncated text
         """
-        import tiktoken
-
-        encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = get_token_encoding("cl100k_base")
         tokens = encoding.encode(text)
 
         if len(tokens) <= max_tokens:
@@ -779,6 +775,7 @@ Use the extract_data function."""
             if progress_callback:
                 # Try new detailed signature first
                 import inspect
+
                 try:
                     sig = inspect.signature(progress_callback)
                     param_count = len(sig.parameters)
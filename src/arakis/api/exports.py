@@ -0,0 +1,478 @@
+"""Manuscript export service.
+
+Builds Markdown from the manuscript and converts it with pandoc. Conversions
+run as asyncio subprocesses under a concurrency cap, so a slow PDF build
+never blocks the event loop. Artifacts are cached by a content hash of the
+manuscript JSON (which includes its figures): in object storage when it is
+configured, otherwise on local disk. The same hash is the HTTP ETag, so
+unchanged manuscripts are answered with 304 without touching pandoc.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from arakis.api.schemas.manuscript import (
+    Figure,
+    ManuscriptResponse,
+    Table,
+    WorkflowMetadata,
+)
+from arakis.config import get_settings
+from arakis.database.models import Manuscript, Workflow
+
+logger = logging.getLogger(__name__)
+
+# Bump when Markdown layout or pandoc options change, to invalidate cached artifacts
+EXPORT_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    """How to produce and serve one export format."""
+
+    name: str
+    extension: str
+    media_type: str
+    label: str
+    pandoc_args: Optional[tuple[str, ...]] = None  # None: served as Markdown, no conversion
+
+
+EXPORT_FORMATS: dict[str, ExportFormat] = {
+    "markdown": ExportFormat("markdown", "md", "text/markdown", "Markdown"),
+    "pdf": ExportFormat(
+        "pdf",
+        "pdf",
+        "application/pdf",
+        "PDF",
+        pandoc_args=("--pdf-engine=xelatex", "-V", "geometry:margin=1in"),
+    ),
+    "docx": ExportFormat(
+        "docx",
+        "docx",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "DOCX",
+        pandoc_args=(),
+    ),
+}
+
+
+class ExportError(Exception):
+    """Raised when pandoc fails to convert a manuscript."""
+
+
+@dataclass
+class ExportArtifact:
+    """A rendered manuscript export."""
+
+    content: bytes
+    etag: str
+    format: ExportFormat
+    cached: bool = False
+
+
+def content_hash(manuscript_data: ManuscriptResponse) -> str:
+    """Stable hash of everything that ends up in an export."""
+    payload = json.dumps(manuscript_data.model_dump(mode="json"), sort_keys=True, default=str)
+    return hashlib.sha256(f"{EXPORT_VERSION}:{payload}".encode()).hexdigest()[:32]
+
+
+def export_etag(manuscript_data: ManuscriptResponse, fmt: str) -> str:
+    """Strong ETag of a manuscript export."""
+    return f'"{content_hash(manuscript_data)}-{fmt}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ExportService:
+    """Renders manuscript exports with caching and a concurrency cap."""
+
+    def __init__(
+        self,
+        storage=None,
+        cache_dir: Optional[str | Path] = None,
+        max_concurrency: int = 2,
+        timeout: float = 120.0,
+        pandoc_path: str = "pandoc",
+    ):
+        """Initialize the service.
+
+        Args:
+            storage: StorageClient for cached artifacts (local disk is used when
+                it is missing or not configured)
+            cache_dir: Local artifact cache directory
+            max_concurrency: Maximum pandoc processes run at once
+            timeout: Seconds before a pandoc run is killed
+            pandoc_path: pandoc executable
+        """
+        self.storage = storage if storage is not None and storage.is_configured else None
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.pandoc_path = pandoc_path
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def export(
+        self, workflow_id: str, fmt: str, manuscript_data: ManuscriptResponse
+    ) -> ExportArtifact:
+        """Render (or fetch from cache) a manuscript export.
+
+        Concurrent requests for the same artifact share one conversion.
+
+        Args:
+            workflow_id: Workflow the manuscript belongs to
+            fmt: Key of ``EXPORT_FORMATS``
+            manuscript_data: Manuscript to export
+
+        Returns:
+            The rendered artifact
+
+        Raises:
+            FileNotFoundError: pandoc is not installed
+            ExportError: pandoc failed or timed out
+        """
+        export_format = EXPORT_FORMATS[fmt]
+        digest = content_hash(manuscript_data)
+        etag = f'"{digest}-{fmt}"'
+
+        if export_format.pandoc_args is None:
+            content = build_markdown(manuscript_data).encode("utf-8")
+            return ExportArtifact(content=content, etag=etag, format=export_format)
+
+        key = f"exports/{workflow_id}/{digest}.{export_format.extension}"
+        cached = await self._load(key)
+        if cached is not None:
+            return ExportArtifact(content=cached, etag=etag, format=export_format, cached=True)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._render(key, export_format, manuscript_data))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded: a disconnecting client must not kill a conversion others wait on
+        content = await asyncio.shield(task)
+        return ExportArtifact(content=content, etag=etag, format=export_format)
+
+    async def _render(
+        self, key: str, export_format: ExportFormat, manuscript_data: ManuscriptResponse
+    ) -> bytes:
+        content = await self.convert(build_markdown(manuscript_data), export_format)
+        try:
+            await self._store(key, content, export_format.media_type)
+        except Exception as e:
+            logger.warning(f"[export] Failed to cache {key}: {e}")
+        return content
+
+    async def convert(self, markdown: str, export_format: ExportFormat) -> bytes:
+        """Convert Markdown with pandoc in a subprocess.
+
+        Args:
+            markdown: Markdown document
+            export_format: Target format
+
+        Returns:
+            Converted document bytes
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            with tempfile.TemporaryDirectory(prefix="arakis-export-") as tmp_dir:
+                md_path = os.path.join(tmp_dir, "manuscript.md")
+                out_path = os.path.join(tmp_dir, f"manuscript.{export_format.extension}")
+                with open(md_path, "w", encoding="utf-8") as f:
+                    f.write(markdown)
+
+                process = await asyncio.create_subprocess_exec(
+                    self.pandoc_path,
+                    md_path,
+                    "-o",
+                    out_path,
+                    *export_format.pandoc_args,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                try:
+                    _, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+                except asyncio.TimeoutError:
+                    raise ExportError(f"pandoc timed out after {self.timeout:.0f}s")
+                finally:
+                    if process.returncode is None:
+                        process.kill()
+                        await process.wait()
+
+                if process.returncode != 0:
+                    message = stderr.decode("utf-8", errors="replace").strip()
+                    raise ExportError(message or f"pandoc exited with code {process.returncode}")
+
+                with open(out_path, "rb") as f:
+                    return f.read()
+
+    async def _load(self, key: str) -> Optional[bytes]:
+        """Read a cached artifact."""
+        if self.storage is not None:
+            if not await asyncio.to_thread(self.storage.exists, key):
+                return None
+            content, result = await asyncio.to_thread(self.storage.download_bytes, key)
+            return content if result.success else None
+
+        if self.cache_dir is not None:
+            path = self.cache_dir / key
+            if path.exists():
+                return await asyncio.to_thread(path.read_bytes)
+        return None
+
+    async def _store(self, key: str, content: bytes, media_type: str) -> None:
+        """Cache an artifact."""
+        if self.storage is not None:
+            result = await asyncio.to_thread(self.storage.upload_bytes, content, key, media_type)
+            if not result.success:
+                logger.warning(f"[export] Failed to upload {key}: {result.error}")
+            return
+
+        if self.cache_dir is not None:
+            path = self.cache_dir / key
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Older renders of this format are stale once the manuscript changed
+            for stale in path.parent.glob(f"*{path.suffix}"):
+                stale.unlink(missing_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            await asyncio.to_thread(tmp_path.write_bytes, content)
+            os.replace(tmp_path, path)
+
+
+# Global export service instance
+_export_service: Optional[ExportService] = None
+
+
+def get_export_service() -> ExportService:
+    """Get the process-wide export service."""
+    global _export_service
+    if _export_service is None:
+        from arakis.storage import get_storage_client
+
+        settings = get_settings()
+        _export_service = ExportService(
+            storage=get_storage_client(),
+            cache_dir=settings.export_cache_dir,
+            max_concurrency=settings.export_max_concurrency,
+            timeout=settings.export_timeout_seconds,
+        )
+    return _export_service
+
+
+async def load_manuscript_response(
+    db: AsyncSession, workflow: Workflow
+) -> Optional[ManuscriptResponse]:
+    """Load a workflow's manuscript as export data.
+
+    Args:
+        db: Async database session
+        workflow: Workflow the manuscript belongs to
+
+    Returns:
+        Manuscript data, or None if no manuscript has been assembled yet
+    """
+    result = await db.execute(select(Manuscript).where(Manuscript.workflow_id == workflow.id))
+    manuscript = result.scalar_one_or_none()
+    if manuscript is None:
+        return None
+    return build_manuscript_response(workflow, manuscript)
+
+
+async def pregenerate_exports(db: AsyncSession, workflow_id: str, formats: list[str]) -> list[str]:
+    """Render and cache exports ahead of the first download.
+
+    Args:
+        db: Async database session
+        workflow_id: Workflow ID
+        formats: Export formats to render
+
+    Returns:
+        Error messages of formats that failed
+    """
+    workflow = await db.get(Workflow, workflow_id)
+    manuscript_data = await load_manuscript_response(db, workflow) if workflow else None
+    if manuscript_data is None:
+        return [f"Manuscript for workflow {workflow_id} not found"]
+
+    service = get_export_service()
+    errors = []
+    for fmt in formats:
+        try:
+            await service.export(workflow_id, fmt, manuscript_data)
+            logger.info(f"[export] Pre-generated {fmt} export for workflow {workflow_id}")
+        except Exception as e:
+            errors.append(f"{fmt}: {e}")
+    return errors
+
+
+def build_manuscript_response(workflow: Workflow, manuscript: Manuscript) -> ManuscriptResponse:
+    """Build the structured manuscript returned by the JSON export."""
+    # Build metadata
+    metadata = WorkflowMetadata(
+        workflow_id=workflow.id,
+        research_question=workflow.research_question,
+        papers_found=workflow.papers_found,
+        papers_included=workflow.papers_included,
+        total_cost=workflow.total_cost,
+        databases_searched=workflow.databases or [],
+    )
+
+    # Build manuscript sections
+    manuscript_sections = {
+        "title": manuscript.title or "Untitled Systematic Review",
+        "abstract": manuscript.abstract or "",
+        "introduction": manuscript.introduction or "",
+        "methods": manuscript.methods or generate_methods_section(workflow),
+        "results": manuscript.results or "",
+        "discussion": manuscript.discussion or "",
+        "conclusions": manuscript.conclusions or "",
+    }
+
+    # Parse figures
+    figures = []
+    if manuscript.figures:
+        for fig_id, fig_data in manuscript.figures.items():
+            # Generate API URL for serving the figure
+            figure_url = f"/api/manuscripts/{workflow.id}/figures/{fig_id}"
+            figures.append(
+                Figure(
+                    id=fig_id,
+                    title=fig_data.get("title", ""),
+                    caption=fig_data.get("caption", ""),
+                    file_path=figure_url,  # Use API endpoint instead of filesystem path
+                    figure_type=fig_data.get("figure_type") or fig_data.get("type", "unknown"),
+                )
+            )
+
+    # Parse tables
+    tables = []
+    if manuscript.tables:
+        for table_id, table_data in manuscript.tables.items():
+            tables.append(
+                Table(
+                    id=table_id,
+                    title=table_data.get("title", ""),
+                    headers=table_data.get("headers", []),
+                    rows=table_data.get("rows", []),
+                    footnotes=table_data.get("footnotes"),
+                )
+            )
+
+    return ManuscriptResponse(
+        metadata=metadata,
+        manuscript=manuscript_sections,
+        figures=figures,
+        tables=tables,
+        references=manuscript.references or [],
+    )
+
+
+def generate_methods_section(workflow: Workflow) -> str:
+    """Generate methods section from workflow metadata."""
+    methods = f"""## Methods
+
+### Search Strategy
+
+We conducted a systematic search of the following databases: {", ".join(workflow.databases or [])}.
+
+**Research Question:** {workflow.research_question}
+
+**Inclusion Criteria:**
+{chr(10).join("- " + c.strip() for c in (workflow.inclusion_criteria or "").split(","))}
+
+**Exclusion Criteria:**
+{chr(10).join("- " + c.strip() for c in (workflow.exclusion_criteria or "").split(","))}
+
+### Study Selection
+
+Two independent reviewers screened all titles and abstracts. Conflicts were resolved through discussion.
+
+### Data Extraction
+
+Structured data was extracted from included studies using a standardized form.
+
+### Statistical Analysis
+
+Statistical analyses were performed as appropriate for the included studies.
+"""
+    return methods
+
+
+def build_markdown(manuscript_data: ManuscriptResponse) -> str:
+    """Build complete Markdown document from manuscript data."""
+    sections = []
+
+    # Title
+    sections.append(f"# {manuscript_data.manuscript.get('title', 'Untitled Review')}\n")
+
+    # Abstract
+    if manuscript_data.manuscript.get("abstract"):
+        sections.append("## Abstract\n")
+        sections.append(manuscript_data.manuscript["abstract"])
+        sections.append("\n")
+
+    # Introduction
+    if manuscript_data.manuscript.get("introduction"):
+        sections.append("## Introduction\n")
+        sections.append(manuscript_data.manuscript["introduction"])
+        sections.append("\n")
+
+    # Methods
+    if manuscript_data.manuscript.get("methods"):
+        sections.append(manuscript_data.manuscript["methods"])
+        sections.append("\n")
+
+    # Results
+    if manuscript_data.manuscript.get("results"):
+        sections.append("## Results\n")
+        sections.append(manuscript_data.manuscript["results"])
+        sections.append("\n")
+
+    # Discussion
+    if manuscript_data.manuscript.get("discussion"):
+        sections.append("## Discussion\n")
+        sections.append(manuscript_data.manuscript["discussion"])
+        sections.append("\n")
+
+    # Conclusions
+    if manuscript_data.manuscript.get("conclusions"):
+        sections.append("## Conclusions\n")
+        sections.append(manuscript_data.manuscript["conclusions"])
+        sections.append("\n")
+
+    # References
+    if manuscript_data.references:
+        sections.append("## References\n")
+        for i, ref in enumerate(manuscript_data.references, 1):
+            sections.append(f"{i}. {ref.get('citation', 'No citation')}\n")
+
+    # Metadata footer
+    sections.append("\n---\n")
+    sections.append("\nGenerated by Arakis Systematic Review Platform\n")
+    sections.append(f"Research Question: {manuscript_data.metadata.research_question}\n")
+    sections.append(
+        f"Papers Found: {manuscript_data.metadata.papers_found} | "
+        f"Papers Included: {manuscript_data.metadata.papers_included}\n"
+    )
+
+    return "\n".join(sections)
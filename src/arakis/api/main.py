@@ -1,5 +1,6 @@
 """FastAPI application for Arakis systematic review platform."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -11,6 +12,7 @@ from arakis.api.routers import auth, manuscripts, workflows
 from arakis.api.routers import settings as settings_router
 from arakis.config import get_settings
 from arakis.database.connection import async_engine
+from arakis.workflow.broadcast import get_progress_broadcaster, shutdown_progress_broadcaster
 
 app_settings = get_settings()
 
@@ -37,6 +39,22 @@ def run_migrations():
         print(f"⚠️ Migration skipped: {e}")
 
 
+async def _run_inline_worker(stop: asyncio.Event):
+    """Run a workflow worker inside the API process until stop is set."""
+    from arakis.database.connection import AsyncSessionLocal
+    from arakis.workflow.queue import JobQueue
+    from arakis.workflow.worker import Worker
+
+    worker = Worker(
+        JobQueue(AsyncSessionLocal, lease_seconds=app_settings.worker_lease_seconds),
+        AsyncSessionLocal,
+        concurrency=app_settings.worker_concurrency,
+        poll_interval=app_settings.worker_poll_interval,
+        heartbeat_interval=app_settings.worker_heartbeat_seconds,
+    )
+    await worker.run(stop)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -57,11 +75,25 @@ async def lifespan(app: FastAPI):
     # Initialize rate limiter
     await get_rate_limiter()
 
+    # Initialize live progress channel
+    await get_progress_broadcaster()
+
+    # Optional in-process worker (single-node setups without `arakis worker`)
+    worker_stop = asyncio.Event()
+    worker_task = None
+    if app_settings.worker_inline:
+        worker_task = asyncio.create_task(_run_inline_worker(worker_stop))
+        print("👷 Inline workflow worker started")
+
     yield
 
     # Shutdown
     print("🛑 Shutting down Arakis API...")
+    if worker_task is not None:
+        worker_stop.set()
+        await worker_task
     await shutdown_rate_limiter()
+    await shutdown_progress_broadcaster()
     await async_engine.dispose()
     print("✅ Database connections closed")
 
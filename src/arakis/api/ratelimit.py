@@ -1,13 +1,13 @@
 """Rate limiting for API endpoints.
 
 Provides rate limiting with Redis backend (production) and in-memory fallback (development).
-Uses sliding window algorithm for accurate rate limiting.
+Uses the generic cell rate algorithm (GCRA), a sliding-window limit that stores one
+timestamp per key regardless of request volume.
 """
 
-import asyncio
 import hashlib
+import math
 import time
-from collections import defaultdict
 from dataclasses import dataclass
 from functools import wraps
 from typing import Callable, Optional
@@ -38,15 +38,54 @@ class RateLimitExceeded(HTTPException):
         self.retry_after = retry_after
 
 
+# Absorbs float rounding so exactly `limit` simultaneous requests are admitted
+_EPSILON = 1e-6
+
+
+def gcra(tat: float, now: float, limit: int, window_seconds: float) -> tuple[bool, float, int, int]:
+    """
+    Apply the generic cell rate algorithm (GCRA) to one request.
+
+    GCRA is equivalent to a sliding window of ``limit`` requests per
+    ``window_seconds`` but keeps a single timestamp per key: the theoretical
+    arrival time (TAT) at which the key's bucket is empty again.
+
+    Args:
+        tat: Stored theoretical arrival time for the key (0 if unseen)
+        now: Current time in seconds
+        limit: Maximum number of requests allowed in the window
+        window_seconds: Time window in seconds
+
+    Returns:
+        Tuple of (is_allowed, new_tat, remaining_requests, retry_after_seconds).
+        When the request is rejected ``new_tat`` equals the stored value.
+    """
+    interval = window_seconds / limit
+    # Time until the bucket would be empty again if this request is admitted
+    backlog = max(tat - now, 0.0) + interval
+
+    if backlog > window_seconds + _EPSILON:
+        retry_after = math.ceil(backlog - window_seconds)
+        return False, tat, 0, max(retry_after, 1)
+
+    remaining = int((window_seconds - backlog) / interval + _EPSILON)
+    return True, now + backlog, remaining, 0
+
+
 class InMemoryRateLimiter:
-    """In-memory rate limiter using sliding window algorithm.
+    """In-memory GCRA rate limiter.
 
-    Suitable for development and single-instance deployments.
+    Suitable for development and single-instance deployments. State is one
+    float per key, and each check reads and writes it without awaiting, so no
+    lock is needed on the event loop.
     """
 
+    # Seconds between sweeps of keys whose bucket has fully drained
+    CLEANUP_INTERVAL = 60.0
+
     def __init__(self):
-        self._requests: dict[str, list[float]] = defaultdict(list)
-        self._lock = asyncio.Lock()
+        self._tats: dict[str, float] = {}
+        self._next_cleanup = time.monotonic() + self.CLEANUP_INTERVAL
 
     async def is_allowed(self, key: str, limit: int, window_seconds: int) -> tuple[bool, int, int]:
         """
@@ -60,63 +99,68 @@ class InMemoryRateLimiter:
         Returns:
             Tuple of (is_allowed, remaining_requests, retry_after_seconds)
         """
-        now = time.time()
-        window_start = now - window_seconds
-
-        async with self._lock:
-            # Clean up old requests
-            self._requests[key] = [
-                req_time for req_time in self._requests[key] if req_time > window_start
-            ]
-
-            current_count = len(self._requests[key])
-
-            if current_count >= limit:
-                # Calculate retry-after time
-                oldest_request = min(self._requests[key]) if self._requests[key] else now
-                retry_after = int(oldest_request + window_seconds - now) + 1
-                return False, 0, max(retry_after, 1)
-
-            # Add current request
-            self._requests[key].append(now)
-            remaining = limit - current_count - 1
+        now = time.monotonic()
+        if now >= self._next_cleanup:
+            self._sweep(now)
 
-            return True, remaining, 0
+        allowed, tat, remaining, retry_after = gcra(
+            self._tats.get(key, 0.0), now, limit, window_seconds
+        )
+        if allowed:
+            self._tats[key] = tat
+        return allowed, remaining, retry_after
 
     async def reset(self, key: str) -> None:
         """Reset rate limit for a key."""
-        async with self._lock:
-            self._requests.pop(key, None)
+        self._tats.pop(key, None)
 
     async def cleanup(self) -> int:
         """Remove expired entries. Returns number of cleaned entries."""
-        now = time.time()
-        cleaned = 0
-
-        async with self._lock:
-            keys_to_remove = []
-            for key, requests in self._requests.items():
-                # Remove entries older than 1 hour (max reasonable window)
-                self._requests[key] = [r for r in requests if r > now - 3600]
-                if not self._requests[key]:
-                    keys_to_remove.append(key)
-
-            for key in keys_to_remove:
-                del self._requests[key]
-                cleaned += 1
-
-        return cleaned
+        return self._sweep(time.monotonic())
+
+    def _sweep(self, now: float) -> int:
+        """Drop keys whose bucket has drained; they behave exactly like unseen keys."""
+        expired = [key for key, tat in self._tats.items() if tat <= now]
+        for key in expired:
+            del self._tats[key]
+        self._next_cleanup = now + self.CLEANUP_INTERVAL
+        return len(expired)
+
+
+# GCRA in a single atomic round trip. Uses the Redis server clock so API
+# instances with skewed clocks share one view of time. Fractions are returned
+# as strings because Lua numbers are truncated to integers in replies.
+_GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local epsilon = 1e-6
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local interval = window / limit
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or 0)
+local backlog = math.max(tat - now, 0) + interval
+
+if backlog > window + epsilon then
+    return {0, 0, tostring(backlog - window)}
+end
+
+redis.call('SET', KEYS[1], string.format('%.6f', now + backlog), 'PX', math.ceil(backlog * 1000))
+return {1, math.floor((window - backlog) / interval + epsilon), '0'}
+"""
 
 
 class RedisRateLimiter:
-    """Redis-backed rate limiter using sliding window algorithm.
+    """Redis-backed GCRA rate limiter.
 
-    Suitable for production multi-instance deployments.
+    Suitable for production multi-instance deployments. Each check is one
+    EVALSHA of a Lua script holding a single string key per client.
     """
 
     def __init__(self, redis_url: str):
         self.redis_url = redis_url
         self._redis = None
+        self._script = None
 
     async def connect(self) -> bool:
         """Connect to Redis. Returns True if successful."""
@@ -130,6 +174,7 @@ class RedisRateLimiter:
             )
             # Test connection
             await self._redis.ping()
+            self._script = self._redis.register_script(_GCRA_SCRIPT)
             return True
         except Exception as e:
             print(f"⚠️ Redis connection failed: {e}")
@@ -141,61 +186,31 @@ class RedisRateLimiter:
         if self._redis:
             await self._redis.close()
             self._redis = None
+            self._script = None
 
     async def is_allowed(self, key: str, limit: int, window_seconds: int) -> tuple[bool, int, int]:
         """
         Check if request is allowed under rate limit.
 
-        Uses Redis sorted sets for sliding window implementation.
+        Runs the GCRA Lua script, which reads and updates the key atomically.
         """
         if not self._redis:
             # Fallback: allow all if Redis is not connected
             return True, limit, 0
 
-        now = time.time()
-        window_start = now - window_seconds
-        redis_key = f"ratelimit:{key}"
-
         try:
-            pipe = self._redis.pipeline()
-
-            # Remove old entries
-            pipe.zremrangebyscore(redis_key, 0, window_start)
-
-            # Count current requests in window
-            pipe.zcard(redis_key)
-
-            # Add current request (will be undone if over limit)
-            pipe.zadd(redis_key, {f"{now}": now})
-
-            # Set expiry on the key
-            pipe.expire(redis_key, window_seconds + 1)
-
-            results = await pipe.execute()
-            current_count = results[1]
-
-            if current_count >= limit:
-                # Remove the request we just added
-                await self._redis.zrem(redis_key, f"{now}")
-
-                # Get oldest request to calculate retry-after
-                oldest = await self._redis.zrange(redis_key, 0, 0, withscores=True)
-                if oldest:
-                    oldest_time = oldest[0][1]
-                    retry_after = int(oldest_time + window_seconds - now) + 1
-                else:
-                    retry_after = window_seconds
-
-                return False, 0, max(retry_after, 1)
-
-            remaining = limit - current_count - 1
-            return True, remaining, 0
-
+            allowed, remaining, retry_after = await self._script(
+                keys=[f"ratelimit:{key}"], args=[limit, window_seconds]
+            )
         except Exception as e:
             print(f"⚠️ Redis rate limit error: {e}")
             # Fallback: allow request on Redis errors
             return True, limit, 0
 
+        if not allowed:
+            return False, 0, max(math.ceil(float(retry_after)), 1)
+        return True, int(remaining), 0
+
     async def reset(self, key: str) -> None:
         """Reset rate limit for a key."""
         if self._redis:
@@ -1,24 +1,40 @@
 """Manuscript export endpoints in multiple formats."""
 
-import tempfile
+import asyncio
+import hashlib
+import mimetypes
+import os
+import re
+from collections.abc import AsyncIterator
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from arakis.api.dependencies import get_current_user, get_db
-from arakis.api.schemas.manuscript import (
-    Figure,
-    ManuscriptResponse,
-    Table,
-    WorkflowMetadata,
+from arakis.api.exports import (
+    EXPORT_FORMATS,
+    etag_matches,
+    export_etag,
+    get_export_service,
+    load_manuscript_response,
 )
-from arakis.database.models import Manuscript, User, Workflow
+from arakis.api.schemas.manuscript import ManuscriptResponse
+from arakis.config import get_settings
+from arakis.database.models import Manuscript, User, Workflow, WorkflowFigure
+from arakis.storage import StorageClient, get_storage_client
+from arakis.storage.client import IMMUTABLE_CACHE_CONTROL
 
 router = APIRouter(prefix="/api/manuscripts", tags=["manuscripts"])
 
+# Bytes read from object storage per chunk when streaming figures
+FIGURE_CHUNK_SIZE = 64 * 1024
+
+# A single byte range ("bytes=0-1023", "bytes=512-", "bytes=-256")
+RANGE_PATTERN = re.compile(r"bytes=(\d+-\d*|-\d+)")
+
 
 async def _verify_workflow_access(
     workflow_id: str,
@@ -65,26 +81,120 @@ async def get_figure(
     """
     Serve a generated figure image (PRISMA diagram, forest plot, etc.).
 
-    Returns the PNG image file for display in the frontend.
+    Figures uploaded to object storage are served with a redirect to a
+    presigned URL, or streamed from storage (with Range support) when
+    ``figure_delivery`` is ``stream``. Their keys are timestamped, so responses
+    are cacheable forever. Figures that only exist on local disk fall back to a
+    file response.
+
     Only returns figures for workflows owned by the current user.
     """
-    import os
-
     # Verify workflow access
     await _verify_workflow_access(workflow_id, request, db, current_user)
 
-    # Get manuscript to find figure path
-    result = await db.execute(select(Manuscript).where(Manuscript.workflow_id == workflow_id))
-    manuscript = result.scalar_one_or_none()
+    result = await db.execute(
+        select(WorkflowFigure.r2_key)
+        .where(
+            WorkflowFigure.workflow_id == workflow_id,
+            WorkflowFigure.figure_type == figure_id,
+            WorkflowFigure.r2_key.is_not(None),
+        )
+        .order_by(WorkflowFigure.id.desc())
+        .limit(1)
+    )
+    r2_key = result.scalar_one_or_none()
+
+    storage = get_storage_client()
+    if r2_key and storage.is_configured:
+        return await _storage_figure(r2_key, request, storage)
+
+    return await _local_figure(workflow_id, figure_id, request, db)
+
+
+async def _storage_figure(key: str, request: Request, storage: StorageClient) -> Response:
+    """Redirect to or stream a figure held in object storage."""
+    etag = f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+    media_type = mimetypes.guess_type(key)[0] or "image/png"
+    cache_headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    settings = get_settings()
+    if settings.figure_delivery == "redirect":
+        expires_in = settings.figure_url_expires_seconds
+        url = storage.get_presigned_url(
+            key,
+            expires_in=expires_in,
+            response_headers={
+                "ResponseCacheControl": IMMUTABLE_CACHE_CONTROL,
+                "ResponseContentType": media_type,
+            },
+        )
+        if url:
+            # The redirect may only be reused while the signed URL is still valid
+            return RedirectResponse(
+                url,
+                status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+                headers={"Cache-Control": f"private, max-age={expires_in // 2}"},
+            )
+
+    # Only single byte ranges are passed through; anything else gets the whole object
+    byte_range = request.headers.get("range")
+    if byte_range and not RANGE_PATTERN.fullmatch(byte_range.strip()):
+        byte_range = None
 
-    if manuscript is None:
+    obj, storage_result = await asyncio.to_thread(storage.open_object, key, byte_range)
+    if obj is None:
+        if storage_result.error == "InvalidRange":
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail="Requested range not satisfiable",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Figure file not found in storage: {storage_result.error}",
+        )
+
+    headers = {**cache_headers, "Accept-Ranges": "bytes", "Content-Disposition": "inline"}
+    if obj.get("ContentLength") is not None:
+        headers["Content-Length"] = str(obj["ContentLength"])
+    if obj.get("ContentRange"):
+        headers["Content-Range"] = obj["ContentRange"]
+
+    return StreamingResponse(
+        _iter_body(obj["Body"]),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if obj.get("ContentRange") else 200,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+async def _iter_body(body, chunk_size: int = FIGURE_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read a blocking storage body in chunks off the event loop."""
+    try:
+        while chunk := await asyncio.to_thread(body.read, chunk_size):
+            yield chunk
+    finally:
+        body.close()
+
+
+async def _local_figure(
+    workflow_id: str, figure_id: str, request: Request, db: AsyncSession
+) -> Response:
+    """Serve a figure written to local disk by the manuscript assembler."""
+    # Only the figures column; the manuscript text is not needed here
+    result = await db.execute(
+        select(Manuscript.figures).where(Manuscript.workflow_id == workflow_id)
+    )
+    figures = result.scalar_one_or_none()
+
+    if figures is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Manuscript for workflow {workflow_id} not found",
         )
 
-    # Find figure in manuscript
-    figures = manuscript.figures or {}
     if figure_id not in figures:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -103,15 +213,21 @@ async def get_figure(
                 detail=f"Figure file not found at {file_path}",
             )
 
-    # Read and return the image
-    with open(file_path, "rb") as f:
-        image_bytes = f.read()
-
-    return Response(
-        content=image_bytes,
-        media_type="image/png",
-        headers={"Content-Disposition": f"inline; filename={figure_id}.png"},
+    # Local files can be regenerated in place, so clients must revalidate
+    response = FileResponse(
+        file_path,
+        media_type=mimetypes.guess_type(file_path)[0] or "image/png",
+        headers={"Cache-Control": "private, no-cache"},
+        filename=os.path.basename(file_path),
+        stat_result=os.stat(file_path),
+        content_disposition_type="inline",
     )
+    if etag_matches(request.headers.get("if-none-match"), response.headers["etag"]):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": response.headers["etag"], "Cache-Control": "private, no-cache"},
+        )
+    return response
 
 
 @router.get("/{workflow_id}/json", response_model=ManuscriptResponse)
@@ -135,74 +251,14 @@ async def export_manuscript_json(
     # Verify workflow access and get workflow
     workflow = await _verify_workflow_access(workflow_id, request, db, current_user)
 
-    # Get manuscript
-    result = await db.execute(select(Manuscript).where(Manuscript.workflow_id == workflow_id))
-    manuscript = result.scalar_one_or_none()
-
-    if manuscript is None:
+    manuscript_data = await load_manuscript_response(db, workflow)
+    if manuscript_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Manuscript for workflow {workflow_id} not found. The workflow may still be running.",
         )
 
-    # Build metadata
-    metadata = WorkflowMetadata(
-        workflow_id=workflow.id,
-        research_question=workflow.research_question,
-        papers_found=workflow.papers_found,
-        papers_included=workflow.papers_included,
-        total_cost=workflow.total_cost,
-        databases_searched=workflow.databases or [],
-    )
-
-    # Build manuscript sections
-    manuscript_sections = {
-        "title": manuscript.title or "Untitled Systematic Review",
-        "abstract": manuscript.abstract or "",
-        "introduction": manuscript.introduction or "",
-        "methods": manuscript.methods or _generate_methods_section(workflow),
-        "results": manuscript.results or "",
-        "discussion": manuscript.discussion or "",
-        "conclusions": manuscript.conclusions or "",
-    }
-
-    # Parse figures
-    figures = []
-    if manuscript.figures:
-        for fig_id, fig_data in manuscript.figures.items():
-            # Generate API URL for serving the figure
-            figure_url = f"/api/manuscripts/{workflow_id}/figures/{fig_id}"
-            figures.append(
-                Figure(
-                    id=fig_id,
-                    title=fig_data.get("title", ""),
-                    caption=fig_data.get("caption", ""),
-                    file_path=figure_url,  # Use API endpoint instead of filesystem path
-                    figure_type=fig_data.get("figure_type") or fig_data.get("type", "unknown"),
-                )
-            )
-
-    # Parse tables
-    tables = []
-    if manuscript.tables:
-        for table_id, table_data in manuscript.tables.items():
-            tables.append(
-                Table(
-                    id=table_id,
-                    title=table_data.get("title", ""),
-                    headers=table_data.get("headers", []),
-                    rows=table_data.get("rows", []),
-                    footnotes=table_data.get("footnotes"),
-                )
-            )
-
-    return ManuscriptResponse(
-        metadata=metadata,
-        manuscript=manuscript_sections,
-        figures=figures,
-        tables=tables,
-        references=manuscript.references or [],
-    )
+    return manuscript_data
 
 
 @router.get("/{workflow_id}/markdown")
@@ -217,18 +273,7 @@ async def export_manuscript_markdown(
 
     Returns a downloadable Markdown file containing the complete manuscript.
     """
-    # Get manuscript JSON data (access check is done in export_manuscript_json)
-    manuscript_data = await export_manuscript_json(workflow_id, request, db, current_user)
-
-    # Build Markdown content
-    markdown_content = _build_markdown(manuscript_data)
-
-    # Return as downloadable file
-    return Response(
-        content=markdown_content.encode("utf-8"),
-        media_type="text/markdown",
-        headers={"Content-Disposition": f"attachment; filename=manuscript_{workflow_id}.md"},
-    )
+    return await _export_file(workflow_id, "markdown", request, db, current_user)
 
 
 @router.get("/{workflow_id}/pdf")
@@ -244,31 +289,7 @@ async def export_manuscript_pdf(
     Converts Markdown to PDF using pandoc.
     Requires pandoc to be installed on the system.
     """
-    # Get manuscript JSON data (access check is done in export_manuscript_json)
-    manuscript_data = await export_manuscript_json(workflow_id, request, db, current_user)
-
-    # Build Markdown content
-    markdown_content = _build_markdown(manuscript_data)
-
-    try:
-        # Convert to PDF using pandoc
-        pdf_bytes = await _convert_markdown_to_pdf(markdown_content)
-
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename=manuscript_{workflow_id}.pdf"},
-        )
-    except FileNotFoundError:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Pandoc is not installed. Please install pandoc to generate PDF exports.",
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate PDF: {str(e)}",
-        )
+    return await _export_file(workflow_id, "pdf", request, db, current_user)
 
 
 @router.get("/{workflow_id}/docx")
@@ -284,196 +305,53 @@ async def export_manuscript_docx(
     Converts Markdown to DOCX using pandoc.
     Requires pandoc to be installed on the system.
     """
+    return await _export_file(workflow_id, "docx", request, db, current_user)
+
+
+# Helper functions
+
+
+async def _export_file(
+    workflow_id: str,
+    fmt: str,
+    request: Request,
+    db: AsyncSession,
+    current_user: Optional[User],
+) -> Response:
+    """Serve a manuscript export, revalidated by ETag and rendered at most once per version."""
     # Get manuscript JSON data (access check is done in export_manuscript_json)
     manuscript_data = await export_manuscript_json(workflow_id, request, db, current_user)
 
-    # Build Markdown content
-    markdown_content = _build_markdown(manuscript_data)
+    # Conversions can take seconds; don't hold a database connection meanwhile
+    await db.close()
 
-    try:
-        # Convert to DOCX using pandoc
-        docx_bytes = await _convert_markdown_to_docx(markdown_content)
+    export_format = EXPORT_FORMATS[fmt]
+    etag = export_etag(manuscript_data, fmt)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
 
-        return Response(
-            content=docx_bytes,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={"Content-Disposition": f"attachment; filename=manuscript_{workflow_id}.docx"},
-        )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    try:
+        artifact = await get_export_service().export(workflow_id, fmt, manuscript_data)
     except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Pandoc is not installed. Please install pandoc to generate DOCX exports.",
+            detail=f"Pandoc is not installed. Please install pandoc to generate {export_format.label} exports.",
         )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate DOCX: {str(e)}",
+            detail=f"Failed to generate {export_format.label}: {str(e)}",
         )
 
-
-# Helper functions
-
-
-def _generate_methods_section(workflow: Workflow) -> str:
-    """Generate methods section from workflow metadata."""
-    methods = f"""## Methods
-
-### Search Strategy
-
-We conducted a systematic search of the following databases: {", ".join(workflow.databases or [])}.
-
-**Research Question:** {workflow.research_question}
-
-**Inclusion Criteria:**
-{chr(10).join("- " + c.strip() for c in (workflow.inclusion_criteria or "").split(","))}
-
-**Exclusion Criteria:**
-{chr(10).join("- " + c.strip() for c in (workflow.exclusion_criteria or "").split(","))}
-
-### Study Selection
-
-Two independent reviewers screened all titles and abstracts. Conflicts were resolved through discussion.
-
-### Data Extraction
-
-Structured data was extracted from included studies using a standardized form.
-
-### Statistical Analysis
-
-Statistical analyses were performed as appropriate for the included studies.
-"""
-    return methods
-
-
-def _build_markdown(manuscript_data: ManuscriptResponse) -> str:
-    """Build complete Markdown document from manuscript data."""
-    sections = []
-
-    # Title
-    sections.append(f"# {manuscript_data.manuscript.get('title', 'Untitled Review')}\n")
-
-    # Abstract
-    if manuscript_data.manuscript.get("abstract"):
-        sections.append("## Abstract\n")
-        sections.append(manuscript_data.manuscript["abstract"])
-        sections.append("\n")
-
-    # Introduction
-    if manuscript_data.manuscript.get("introduction"):
-        sections.append("## Introduction\n")
-        sections.append(manuscript_data.manuscript["introduction"])
-        sections.append("\n")
-
-    # Methods
-    if manuscript_data.manuscript.get("methods"):
-        sections.append(manuscript_data.manuscript["methods"])
-        sections.append("\n")
-
-    # Results
-    if manuscript_data.manuscript.get("results"):
-        sections.append("## Results\n")
-        sections.append(manuscript_data.manuscript["results"])
-        sections.append("\n")
-
-    # Discussion
-    if manuscript_data.manuscript.get("discussion"):
-        sections.append("## Discussion\n")
-        sections.append(manuscript_data.manuscript["discussion"])
-        sections.append("\n")
-
-    # Conclusions
-    if manuscript_data.manuscript.get("conclusions"):
-        sections.append("## Conclusions\n")
-        sections.append(manuscript_data.manuscript["conclusions"])
-        sections.append("\n")
-
-    # References
-    if manuscript_data.references:
-        sections.append("## References\n")
-        for i, ref in enumerate(manuscript_data.references, 1):
-            sections.append(f"{i}. {ref.get('citation', 'No citation')}\n")
-
-    # Metadata footer
-    sections.append("\n---\n")
-    sections.append("\nGenerated by Arakis Systematic Review Platform\n")
-    sections.append(f"Research Question: {manuscript_data.metadata.research_question}\n")
-    sections.append(
-        f"Papers Found: {manuscript_data.metadata.papers_found} | "
-        f"Papers Included: {manuscript_data.metadata.papers_included}\n"
+    return Response(
+        content=artifact.content,
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=manuscript_{workflow_id}.{export_format.extension}"
+            ),
+            **cache_headers,
+        },
     )
-
-    return "\n".join(sections)
-
-
-async def _convert_markdown_to_pdf(markdown_content: str) -> bytes:
-    """Convert Markdown to PDF using pandoc."""
-    import subprocess
-
-    # Create temporary files
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as md_file:
-        md_file.write(markdown_content)
-        md_path = md_file.name
-
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as pdf_file:
-        pdf_path = pdf_file.name
-
-    try:
-        # Run pandoc
-        subprocess.run(
-            [
-                "pandoc",
-                md_path,
-                "-o",
-                pdf_path,
-                "--pdf-engine=xelatex",
-                "-V",
-                "geometry:margin=1in",
-            ],
-            check=True,
-            capture_output=True,
-        )
-
-        # Read PDF bytes
-        with open(pdf_path, "rb") as f:
-            pdf_bytes = f.read()
-
-        return pdf_bytes
-    finally:
-        # Clean up temporary files
-        import os
-
-        os.unlink(md_path)
-        os.unlink(pdf_path)
-
-
-async def _convert_markdown_to_docx(markdown_content: str) -> bytes:
-    """Convert Markdown to DOCX using pandoc."""
-    import subprocess
-
-    # Create temporary files
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as md_file:
-        md_file.write(markdown_content)
-        md_path = md_file.name
-
-    with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as docx_file:
-        docx_path = docx_file.name
-
-    try:
-        # Run pandoc
-        subprocess.run(
-            ["pandoc", md_path, "-o", docx_path],
-            check=True,
-            capture_output=True,
-        )
-
-        # Read DOCX bytes
-        with open(docx_path, "rb") as f:
-            docx_bytes = f.read()
-
-        return docx_bytes
-    finally:
-        # Clean up temporary files
-        import os
-
-        os.unlink(md_path)
-        os.unlink(docx_path)
@@ -1,10 +1,12 @@
 """Workflow CRUD and execution endpoints."""
 
+import json
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,28 +21,32 @@ from arakis.api.schemas.workflow import (
     WorkflowResponse,
 )
 from arakis.database.models import User, Workflow, WorkflowFigure, WorkflowStageCheckpoint
+from arakis.workflow.broadcast import get_progress_broadcaster
+from arakis.workflow.queue import JOB_EXECUTE, JOB_RERUN, JOB_RESUME, enqueue_job
 
 router = APIRouter(prefix="/api/workflows", tags=["workflows"])
 
+# Seconds between keep-alive comments on idle progress streams
+SSE_KEEPALIVE_SECONDS = 15.0
+
 
 @router.post("/", response_model=WorkflowResponse, status_code=status.HTTP_201_CREATED)
 async def create_workflow(
     workflow_data: WorkflowCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user),
 ):
     """
-    Create a new systematic review workflow and start execution in background.
+    Create a new systematic review workflow and queue it for execution.
 
     Trial Mode:
     - Anonymous users get ONE free workflow (tracked via session cookie)
     - Second workflow attempt returns 402 (Payment Required) with X-Auth-Required header
     - After authentication, trial workflows are automatically claimed
 
-    The workflow will run asynchronously and update its status as it progresses:
+    The workflow is run by an `arakis worker` process and updates its status as it progresses:
     - pending → running → completed (or failed)
 
     You can poll GET /api/workflows/{id} to check status.
@@ -95,19 +101,49 @@ async def create_workflow(
     )
 
     db.add(workflow)
-    await db.commit()
-    await db.refresh(workflow)
 
-    # Start workflow execution in background
-    background_tasks.add_task(
-        execute_workflow,
-        workflow_id=workflow_id,
-        workflow_data=workflow_data,
+    # Queue execution in the same transaction, so a created workflow always has a job
+    await enqueue_job(
+        db,
+        workflow_id,
+        JOB_EXECUTE,
+        payload={
+            "initial_data": _build_initial_data(workflow_data),
+            "skip_stages": _build_skip_stages(workflow_data),
+        },
     )
+    await db.commit()
+    await db.refresh(workflow)
 
     return await _build_workflow_response(workflow, db)
 
 
+def _build_initial_data(workflow_data: WorkflowCreate) -> dict:
+    """Build the orchestrator's initial input data from a create request."""
+    # Convert comma-separated criteria to lists for stage executors
+    inclusion_list = [c.strip() for c in workflow_data.inclusion_criteria.split(",")]
+    exclusion_list = [c.strip() for c in workflow_data.exclusion_criteria.split(",")]
+
+    return {
+        "research_question": workflow_data.research_question,
+        "inclusion_criteria": inclusion_list,
+        "exclusion_criteria": exclusion_list,
+        "databases": workflow_data.databases or ["pubmed"],
+        "max_results_per_query": workflow_data.max_results_per_query or 100,
+        "fast_mode": workflow_data.fast_mode or False,
+    }
+
+
+def _build_skip_stages(workflow_data: WorkflowCreate) -> list[str]:
+    """Determine stages to skip based on workflow options."""
+    skip_stages = []
+    if workflow_data.skip_analysis:
+        skip_stages.extend(["analysis"])
+    if workflow_data.skip_writing:
+        skip_stages.extend(["introduction", "methods", "results", "discussion"])
+    return skip_stages
+
+
 @router.get("/", response_model=WorkflowList)
 async def list_workflows(
     request: Request,
@@ -246,6 +282,9 @@ async def delete_workflow(
     await db.delete(workflow)
     await db.commit()
 
+    broadcaster = await get_progress_broadcaster()
+    await broadcaster.discard(workflow_id)
+
 
 @router.post("/claim/{workflow_id}", response_model=WorkflowResponse)
 async def claim_workflow(
@@ -289,6 +328,46 @@ async def claim_workflow(
     return await _build_workflow_response(workflow, db)
 
 
+def _build_stage_progress(progress_data: Optional[dict]) -> Optional[StageProgress]:
+    """Build StageProgress from a stage's progress data JSON."""
+    if not progress_data:
+        return None
+    return StageProgress(
+        phase=progress_data.get("phase"),
+        thought_process=progress_data.get("thought_process"),
+        estimated_remaining_seconds=progress_data.get("estimated_remaining_seconds"),
+        updated_at=progress_data.get("updated_at"),
+        current_item=progress_data.get("current_item"),
+        summary=progress_data.get("summary"),
+        recent_decisions=progress_data.get("recent_decisions", []),
+        current_database=progress_data.get("current_database"),
+        databases_completed=progress_data.get("databases_completed", []),
+        queries=progress_data.get("queries", {}),
+        results_per_database=progress_data.get("results_per_database", {}),
+        current_subsection=progress_data.get("current_subsection"),
+        subsections_completed=progress_data.get("subsections_completed", []),
+        subsections_pending=progress_data.get("subsections_pending", []),
+        word_count=progress_data.get("word_count", 0),
+    )
+
+
+async def _live_progress(workflow_id: str, checkpoints) -> dict[str, dict]:
+    """Live progress snapshots for stages still in progress.
+
+    Checkpoints are only persisted at phase boundaries, so in-flight progress
+    comes from the progress broadcaster.
+    """
+    if not any(cp.status == "in_progress" for cp in checkpoints):
+        return {}
+    broadcaster = await get_progress_broadcaster()
+    snapshot = await broadcaster.snapshot(workflow_id)
+    return {
+        cp.stage: snapshot[cp.stage]
+        for cp in checkpoints
+        if cp.status == "in_progress" and cp.stage in snapshot
+    }
+
+
 # Helper function to build workflow response with stages and figures
 async def _build_workflow_response(workflow: Workflow, db: AsyncSession) -> WorkflowResponse:
     """Build WorkflowResponse with stages, progress, and figure URLs."""
@@ -299,29 +378,12 @@ async def _build_workflow_response(workflow: Workflow, db: AsyncSession) -> Work
         .order_by(WorkflowStageCheckpoint.started_at)
     )
     checkpoints = result.scalars().all()
+    live_progress = await _live_progress(workflow.id, checkpoints)
 
     stages = []
     for cp in checkpoints:
-        # Build progress data from checkpoint's progress_data JSON
-        progress = None
-        if cp.progress_data:
-            progress = StageProgress(
-                phase=cp.progress_data.get("phase"),
-                thought_process=cp.progress_data.get("thought_process"),
-                estimated_remaining_seconds=cp.progress_data.get("estimated_remaining_seconds"),
-                updated_at=cp.progress_data.get("updated_at"),
-                current_item=cp.progress_data.get("current_item"),
-                summary=cp.progress_data.get("summary"),
-                recent_decisions=cp.progress_data.get("recent_decisions", []),
-                current_database=cp.progress_data.get("current_database"),
-                databases_completed=cp.progress_data.get("databases_completed", []),
-                queries=cp.progress_data.get("queries", {}),
-                results_per_database=cp.progress_data.get("results_per_database", {}),
-                current_subsection=cp.progress_data.get("current_subsection"),
-                subsections_completed=cp.progress_data.get("subsections_completed", []),
-                subsections_pending=cp.progress_data.get("subsections_pending", []),
-                word_count=cp.progress_data.get("word_count", 0),
-            )
+        # Running stages: live progress from the broadcaster, else the last persisted phase
+        progress = _build_stage_progress(live_progress.get(cp.stage) or cp.progress_data)
 
         stages.append(
             StageCheckpoint(
@@ -420,29 +482,12 @@ async def get_stage_checkpoints(
         .order_by(WorkflowStageCheckpoint.started_at)
     )
     checkpoints = result.scalars().all()
+    live_progress = await _live_progress(workflow_id, checkpoints)
 
     stages = []
     for cp in checkpoints:
-        # Build progress data from checkpoint's progress_data JSON
-        progress = None
-        if cp.progress_data:
-            progress = StageProgress(
-                phase=cp.progress_data.get("phase"),
-                thought_process=cp.progress_data.get("thought_process"),
-                estimated_remaining_seconds=cp.progress_data.get("estimated_remaining_seconds"),
-                updated_at=cp.progress_data.get("updated_at"),
-                current_item=cp.progress_data.get("current_item"),
-                summary=cp.progress_data.get("summary"),
-                recent_decisions=cp.progress_data.get("recent_decisions", []),
-                current_database=cp.progress_data.get("current_database"),
-                databases_completed=cp.progress_data.get("databases_completed", []),
-                queries=cp.progress_data.get("queries", {}),
-                results_per_database=cp.progress_data.get("results_per_database", {}),
-                current_subsection=cp.progress_data.get("current_subsection"),
-                subsections_completed=cp.progress_data.get("subsections_completed", []),
-                subsections_pending=cp.progress_data.get("subsections_pending", []),
-                word_count=cp.progress_data.get("word_count", 0),
-            )
+        # Running stages: live progress from the broadcaster, else the last persisted phase
+        progress = _build_stage_progress(live_progress.get(cp.stage) or cp.progress_data)
 
         stages.append(
             StageCheckpoint(
@@ -460,21 +505,99 @@ async def get_stage_checkpoints(
     return stages
 
 
+@router.get("/{workflow_id}/progress/stream")
+async def stream_workflow_progress(
+    workflow_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user),
+):
+    """
+    Stream live progress of a workflow as Server-Sent Events.
+
+    The stream opens with a `snapshot` event holding the current progress of
+    every stage, followed by `progress` events that carry the progress event
+    and only the fields it changed, and `stage_finalized` events. A fresh
+    `snapshot` is sent if the client falls too far behind. Comment lines are
+    sent periodically as keep-alives.
+    """
+    # Verify ownership
+    query = select(Workflow).where(Workflow.id == workflow_id)
+    if current_user:
+        query = query.where(Workflow.user_id == current_user.id)
+    else:
+        session_id = request.cookies.get("arakis_session")
+        if not session_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Workflow {workflow_id} not found",
+            )
+        query = query.where(Workflow.session_id == session_id)
+
+    result = await db.execute(query)
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Workflow {workflow_id} not found",
+        )
+
+    result = await db.execute(
+        select(WorkflowStageCheckpoint.stage, WorkflowStageCheckpoint.progress_data).where(
+            WorkflowStageCheckpoint.workflow_id == workflow_id
+        )
+    )
+    persisted = {stage: data for stage, data in result.all() if data}
+
+    # Don't hold a database connection for the lifetime of the stream
+    await db.close()
+
+    broadcaster = await get_progress_broadcaster()
+
+    async def snapshot_event() -> str:
+        stages = {**persisted, **await broadcaster.snapshot(workflow_id)}
+        return _sse_event("snapshot", {"workflow_id": workflow_id, "stages": stages})
+
+    async def event_stream():
+        # Subscribe before taking the snapshot so no event falls in between
+        async with broadcaster.subscribe(workflow_id) as subscription:
+            yield await snapshot_event()
+            while not await request.is_disconnected():
+                message = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if subscription.lagged:
+                    subscription.drain()
+                    yield await snapshot_event()
+                elif message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield _sse_event(message.get("type", "progress"), message)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 @router.post("/{workflow_id}/stages/{stage}/rerun", response_model=StageRerunResponse)
 async def rerun_stage(
     workflow_id: str,
     stage: str,
     request: Request,
     rerun_request: StageRerunRequest = None,
-    background_tasks: BackgroundTasks = None,
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user),
 ):
     """
-    Re-run a specific stage of a workflow.
+    Queue a re-run of a specific stage of a workflow.
 
     This allows you to retry a failed stage or re-run a completed stage
-    with modified input data.
+    with modified input data. The stage runs on a worker; poll
+    GET /api/workflows/{id}/stages for its checkpoint.
     """
     from arakis.workflow.orchestrator import WorkflowOrchestrator
 
@@ -521,34 +644,29 @@ async def rerun_stage(
         )
 
     try:
-        orchestrator = WorkflowOrchestrator(db)
-        input_override = rerun_request.input_override if rerun_request else None
-        result = await orchestrator.rerun_stage(workflow_id, stage, input_override)
-
-        return StageRerunResponse(
-            success=result.success,
-            stage=stage,
-            output_data=result.output_data if result.success else None,
-            error=result.error,
-            cost=result.cost,
-        )
+        await WorkflowOrchestrator(db).validate_rerun(workflow_id, stage)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to re-run stage: {str(e)}",
-        )
+
+    input_override = rerun_request.input_override if rerun_request else None
+    job = await enqueue_job(
+        db,
+        workflow_id,
+        JOB_RERUN,
+        payload={"stage": stage, "input_override": input_override},
+    )
+    await db.commit()
+
+    return StageRerunResponse(success=True, stage=stage, job_id=job.id)
 
 
 @router.post("/{workflow_id}/resume", response_model=WorkflowResponse)
 async def resume_workflow(
     workflow_id: str,
     request: Request,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user),
 ):
@@ -585,11 +703,8 @@ async def resume_workflow(
             detail=f"Workflow is not paused. Current status: {workflow.status}",
         )
 
-    # Start resume in background
-    background_tasks.add_task(
-        execute_workflow_resume,
-        workflow_id=workflow_id,
-    )
+    # Queue the resume; the status change and the job commit together
+    await enqueue_job(db, workflow_id, JOB_RESUME)
 
     # Update status to running
     workflow.status = "running"
@@ -599,142 +714,3 @@ async def resume_workflow(
     await db.refresh(workflow)
 
     return await _build_workflow_response(workflow, db)
-
-
-# Background task for resuming workflow
-async def execute_workflow_resume(workflow_id: str):
-    """Resume workflow execution in background."""
-    from arakis.database.connection import AsyncSessionLocal
-    from arakis.workflow.orchestrator import WorkflowOrchestrator
-
-    async with AsyncSessionLocal() as db:
-        try:
-            orchestrator = WorkflowOrchestrator(db)
-            await orchestrator.resume_workflow(workflow_id)
-        except Exception as e:
-            import traceback
-
-            print(f"[{workflow_id}] Resume failed: {e}")
-            print(traceback.format_exc())
-
-            # Mark as failed
-            result = await db.execute(select(Workflow).where(Workflow.id == workflow_id))
-            workflow = result.scalar_one_or_none()
-            if workflow:
-                workflow.status = "failed"
-                workflow.error_message = str(e)
-                await db.commit()
-
-
-# Background task execution function
-async def execute_workflow(workflow_id: str, workflow_data: WorkflowCreate):
-    """
-    Execute complete systematic review workflow pipeline in background.
-
-    Uses WorkflowOrchestrator to run 12 stages with checkpointing:
-    1. search - Multi-database literature search
-    2. screen - AI-powered paper screening (NO 50-paper limit)
-    3. pdf_fetch - Download PDFs and extract text
-    4. extract - Structured data extraction from papers
-    5. rob - Risk of Bias assessment (auto-detect tool)
-    6. analysis - Meta-analysis with forest/funnel plots
-    7. prisma - Flow diagram generation
-    8. tables - Generate all 3 tables (characteristics, RoB, GRADE)
-    9. introduction - Write introduction section
-    10. methods - Write methods section
-    11. results - Write results section
-    12. discussion - Write discussion section
-
-    Note: This function runs in a background task with its own DB session.
-    """
-    import traceback
-
-    from arakis.database.connection import AsyncSessionLocal
-    from arakis.workflow.orchestrator import WorkflowOrchestrator
-
-    async with AsyncSessionLocal() as db:
-        try:
-            # Update status to running
-            result = await db.execute(select(Workflow).where(Workflow.id == workflow_id))
-            workflow = result.scalar_one()
-            workflow.status = "running"
-            await db.commit()
-
-            # Prepare initial data for orchestrator
-            # Convert comma-separated criteria to lists for stage executors
-            inclusion_list = [c.strip() for c in workflow_data.inclusion_criteria.split(",")]
-            exclusion_list = [c.strip() for c in workflow_data.exclusion_criteria.split(",")]
-
-            initial_data = {
-                "research_question": workflow_data.research_question,
-                "inclusion_criteria": inclusion_list,
-                "exclusion_criteria": exclusion_list,
-                "databases": workflow_data.databases or ["pubmed"],
-                "max_results_per_query": workflow_data.max_results_per_query or 100,
-                "fast_mode": workflow_data.fast_mode or False,
-            }
-
-            # Determine stages to skip based on workflow options
-            skip_stages = []
-            if workflow_data.skip_analysis:
-                skip_stages.extend(["analysis"])
-            if workflow_data.skip_writing:
-                skip_stages.extend(["introduction", "methods", "results", "discussion"])
-
-            # Run the orchestrator
-            orchestrator = WorkflowOrchestrator(db)
-            result = await orchestrator.execute_workflow(
-                workflow_id=workflow_id,
-                initial_data=initial_data,
-                skip_stages=skip_stages if skip_stages else None,
-            )
-
-            print(f"[{workflow_id}] Workflow finished with status: {result['status']}")
-
-        except Exception as e:
-            # Mark workflow as failed with error message
-            error_msg = str(e)
-            full_error = traceback.format_exc()
-
-            # Extract more useful error info
-            if "Semantic Scholar" in full_error:
-                error_msg = (
-                    "Semantic Scholar rate limit exceeded. Try using only PubMed or OpenAlex."
-                )
-            elif "OpenAlex" in full_error and "RateLimitError" in full_error:
-                error_msg = "OpenAlex rate limit exceeded. Try using only PubMed."
-            elif "PubMed" in full_error and "RateLimitError" in full_error:
-                error_msg = "PubMed rate limit exceeded. Please wait a minute and try again."
-            elif "RateLimitError" in error_msg or "RateLimitError" in full_error:
-                if "openai" in full_error.lower():
-                    error_msg = (
-                        "OpenAI API rate limit exceeded. Please wait a few minutes and try again."
-                    )
-                else:
-                    error_msg = (
-                        "API rate limit exceeded. Try using fewer databases or wait a moment."
-                    )
-            elif "APIError" in error_msg or "APIError" in full_error:
-                error_msg = "OpenAI API error. Please check your API key and try again."
-            elif "HTTPStatusError" in error_msg or "HTTPStatusError" in full_error:
-                if "429" in full_error:
-                    error_msg = "Database API rate limit exceeded. Please wait and try again."
-                elif "503" in full_error:
-                    error_msg = "Database service temporarily unavailable. Please try again."
-                else:
-                    error_msg = "Database search failed. Please try again with fewer databases."
-            elif "RetryError" in error_msg:
-                error_msg = "Search request failed after multiple retries. Try using only PubMed."
-
-            try:
-                result = await db.execute(select(Workflow).where(Workflow.id == workflow_id))
-                workflow = result.scalar_one()
-                workflow.status = "failed"
-                workflow.error_message = error_msg
-                workflow.completed_at = datetime.now(timezone.utc)
-                await db.commit()
-            except Exception as db_error:
-                print(f"CRITICAL: Failed to update workflow {workflow_id} status to 'failed': {db_error}")
-
-            print(f"Workflow {workflow_id} failed: {error_msg}")
-            print(f"Full traceback:\n{full_error}")
@@ -255,6 +255,7 @@ class StageRerunResponse(BaseModel):
     output_data: Optional[dict] = None
     error: Optional[str] = None
     cost: float = 0.0
+    job_id: Optional[int] = None  # Queued job running the stage
 
 
 class WorkflowList(BaseModel):
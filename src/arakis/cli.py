@@ -1475,7 +1475,7 @@ def write_intro(
 
     from arakis.agents.intro_writer import IntroductionWriterAgent
     from arakis.models.paper import Paper
-    from arakis.rag import Retriever
+    from arakis.rag import Retriever, get_corpus_index
 
     console.print("[bold]Writing Introduction Section...[/bold]\n")
 
@@ -1508,7 +1508,7 @@ def write_intro(
             )
         else:
             console.print("[cyan]Indexing papers for RAG...[/cyan]")
-            retriever = Retriever(cache_dir=".arakis_cache")
+            retriever = Retriever(cache_dir=".arakis_cache", corpus_index=get_corpus_index())
             _run_async(retriever.index_papers(papers, show_progress=False))
             console.print("[green]✓ Papers indexed[/green]\n")
 
@@ -1634,7 +1634,7 @@ def write_discussion(
     from arakis.agents.discussion_writer import DiscussionWriterAgent
     from arakis.models.analysis import MetaAnalysisResult
     from arakis.models.paper import Paper
-    from arakis.rag import Retriever
+    from arakis.rag import HybridRetriever, get_corpus_index
 
     console.print("[bold]Writing Discussion Section...[/bold]\n")
 
@@ -1670,7 +1670,7 @@ def write_discussion(
             )
         else:
             console.print("[cyan]Indexing papers for RAG...[/cyan]")
-            retriever = Retriever(cache_dir=".arakis_cache")
+            retriever = HybridRetriever(cache_dir=".arakis_cache", corpus_index=get_corpus_index())
             _run_async(retriever.index_papers(papers, show_progress=False))
             console.print("[green]✓ Papers indexed[/green]\n")
 
@@ -3159,6 +3159,35 @@ def risk_of_bias(
         console.print(f"\n[green]Results saved to:[/green] {output_path}")
 
 
+@app.command()
+def worker(
+    concurrency: Optional[int] = typer.Option(
+        None, "--concurrency", "-c", help="Maximum concurrent workflow jobs (default: settings)"
+    ),
+    worker_id: Optional[str] = typer.Option(
+        None, "--id", help="Worker name used for job leases (default: host:pid)"
+    ),
+    drain: bool = typer.Option(
+        False, "--drain", help="Exit once the queue is empty instead of polling forever"
+    ),
+    log_level: str = typer.Option("INFO", "--log-level", help="Logging level"),
+):
+    """
+    Run a workflow worker.
+
+    Claims queued workflow jobs (created by the API) and runs them with the
+    workflow orchestrator. Run as many workers as needed; jobs of a crashed
+    worker are picked up by the others and continue from their last checkpoint.
+    Stops on SIGINT/SIGTERM, handing unfinished jobs back to the queue.
+    """
+    from arakis.logging import setup_logging
+    from arakis.workflow.worker import run_worker
+
+    setup_logging(level=log_level)
+    console.print("[bold]Starting Arakis workflow worker...[/bold]")
+    _run_async(run_worker(concurrency=concurrency, worker_id=worker_id, drain=drain))
+
+
 @app.command()
 def version():
     """Show version information."""
@@ -8,6 +8,7 @@ from arakis.database.models import (
     ScreeningDecision,
     User,
     Workflow,
+    WorkflowJob,
 )
 
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     "Extraction",
     "Manuscript",
     "User",
+    "WorkflowJob",
 ]
@@ -0,0 +1,60 @@
+"""Add workflow_jobs table for the durable workflow job queue
+
+Revision ID: 2026_10_18_1200
+Revises: 2026_01_29_1700
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_10_18_1200"
+down_revision: Union[str, None] = "2026_01_29_1700"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create workflow_jobs table."""
+    op.create_table(
+        "workflow_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "workflow_id",
+            sa.String(36),
+            sa.ForeignKey("workflows.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(20), server_default="queued", nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("max_attempts", sa.Integer(), server_default="3", nullable=False),
+        sa.Column("run_after", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("lease_owner", sa.String(100), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_workflow_jobs_workflow_id", "workflow_jobs", ["workflow_id"])
+    op.create_index("ix_workflow_jobs_status_id", "workflow_jobs", ["status", "id"])
+
+
+def downgrade() -> None:
+    """Drop workflow_jobs table."""
+    op.drop_index("ix_workflow_jobs_status_id", table_name="workflow_jobs")
+    op.drop_index("ix_workflow_jobs_workflow_id", table_name="workflow_jobs")
+    op.drop_table("workflow_jobs")
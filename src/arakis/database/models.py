@@ -17,6 +17,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -93,6 +94,7 @@ class Workflow(Base):
         "WorkflowFigure", back_populates="workflow", cascade="all, delete-orphan"
     )
     tables = relationship("WorkflowTable", back_populates="workflow", cascade="all, delete-orphan")
+    jobs = relationship("WorkflowJob", back_populates="workflow", cascade="all, delete-orphan")
 
 
 class Paper(Base):
@@ -397,3 +399,45 @@ class WorkflowTable(Base):
 
     # Relationships
     workflow = relationship("Workflow", back_populates="tables")
+
+
+class WorkflowJob(Base):
+    """Durable queue entry for out-of-process workflow execution."""
+
+    __tablename__ = "workflow_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    workflow_id = Column(
+        String(36), ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    kind = Column(String(20), nullable=False)  # execute, resume, rerun
+    payload = Column(JSON, nullable=True)  # Kind-specific arguments (initial data, stage, ...)
+    status = Column(
+        String(20), default="queued", nullable=False
+    )  # queued, running, completed, failed
+
+    # Retry tracking
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime(timezone=True), nullable=True)  # Retry backoff
+
+    # Lease held by the worker currently running the job
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Error tracking
+    error_message = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    workflow = relationship("Workflow", back_populates="jobs")
+
+    __table_args__ = (
+        Index("ix_workflow_jobs_status_id", "status", "id"),
+        {"sqlite_autoincrement": True},
+    )
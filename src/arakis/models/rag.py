@@ -26,10 +26,13 @@ class TextChunk:
     chunk_type: ChunkType
     text: str
     metadata: dict[str, Any] = field(default_factory=dict)
+    part: Optional[int] = None  # Window index when a section is split into several chunks
 
     @property
     def chunk_id(self) -> str:
         """Unique identifier for this chunk."""
+        if self.part is not None:
+            return f"{self.paper_id}:{self.chunk_type.value}:{self.part}"
         return f"{self.paper_id}:{self.chunk_type.value}"
 
 
@@ -3,8 +3,12 @@
 Provides embedding, vector storage, and retrieval of relevant papers.
 """
 
+from arakis.rag.bm25 import BM25Index
 from arakis.rag.cache import EmbeddingCacheStore
+from arakis.rag.chunker import TextChunker
+from arakis.rag.corpus_index import CorpusIndex, get_corpus_index
 from arakis.rag.embedder import Embedder
+from arakis.rag.hybrid import HybridRetriever
 from arakis.rag.retriever import Retriever
 from arakis.rag.vector_store import VectorStore
 
@@ -13,4 +17,9 @@ __all__ = [
     "VectorStore",
     "Retriever",
     "EmbeddingCacheStore",
+    "CorpusIndex",
+    "get_corpus_index",
+    "TextChunker",
+    "BM25Index",
+    "HybridRetriever",
 ]
@@ -0,0 +1,273 @@
+"""In-process BM25 inverted index for lexical retrieval.
+
+Complements the FAISS vector store: exact terms (drug names, outcome
+measures, acronyms) that embeddings blur together are matched directly.
+Postings are plain dicts keyed by chunk_id, so adding and removing chunks is
+incremental and the index is saved alongside the vector store.
+"""
+
+import heapq
+import json
+import math
+import pickle
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from arakis.models.rag import ChunkType, TextChunk
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+# Common English function words; they carry no signal and bloat postings
+STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by for from had has have in into is it its
+    of on or that the their there these this to was were which with
+    """.split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokenizer used for both documents and queries.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms with stopwords removed
+    """
+    return [term for term in _TOKEN.findall(text.lower()) if term not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 inverted index over text chunks."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Initialize the index.
+
+        Args:
+            k1: Term-frequency saturation parameter
+            b: Document-length normalization parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self.clear()
+
+    def clear(self):
+        """Remove all documents from the index."""
+        # term -> {chunk_id: term frequency}
+        self.postings: dict[str, dict[str, int]] = defaultdict(dict)
+        self.doc_lengths: dict[str, int] = {}
+        self.chunks: dict[str, TextChunk] = {}
+        self._paper_chunks: dict[str, set[str]] = defaultdict(set)
+        self._total_length = 0
+
+    def add(self, chunk: TextChunk):
+        """Index a single chunk (replacing any previous version).
+
+        Args:
+            chunk: Text chunk to index
+        """
+        self.add_batch([chunk])
+
+    def add_batch(self, chunks: Iterable[TextChunk]):
+        """Index multiple chunks.
+
+        Args:
+            chunks: Text chunks to index
+        """
+        for chunk in chunks:
+            chunk_id = chunk.chunk_id
+            if chunk_id in self.chunks:
+                self.remove(chunk_id)
+
+            terms = tokenize(chunk.text)
+            for term, freq in Counter(terms).items():
+                self.postings[term][chunk_id] = freq
+
+            self.doc_lengths[chunk_id] = len(terms)
+            self._total_length += len(terms)
+            self.chunks[chunk_id] = chunk
+            self._paper_chunks[chunk.paper_id].add(chunk_id)
+
+    def remove(self, chunk_id: str) -> bool:
+        """Remove a chunk from the index.
+
+        Args:
+            chunk_id: ID of chunk to remove
+
+        Returns:
+            True if removed, False if not found
+        """
+        chunk = self.chunks.pop(chunk_id, None)
+        if chunk is None:
+            return False
+
+        for term in set(tokenize(chunk.text)):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self.postings[term]
+
+        self._total_length -= self.doc_lengths.pop(chunk_id)
+        paper_chunks = self._paper_chunks[chunk.paper_id]
+        paper_chunks.discard(chunk_id)
+        if not paper_chunks:
+            del self._paper_chunks[chunk.paper_id]
+        return True
+
+    def remove_paper(self, paper_id: str) -> int:
+        """Remove every chunk of a paper.
+
+        Args:
+            paper_id: Paper identifier
+
+        Returns:
+            Number of chunks removed
+        """
+        chunk_ids = list(self._paper_chunks.get(paper_id, ()))
+        for chunk_id in chunk_ids:
+            self.remove(chunk_id)
+        return len(chunk_ids)
+
+    def score(
+        self,
+        query: str,
+        paper_ids: Optional[Iterable[str]] = None,
+        chunk_types: Optional[Iterable[ChunkType]] = None,
+        exclude_paper_ids: Optional[Iterable[str]] = None,
+    ) -> dict[str, float]:
+        """Score every chunk matching at least one query term.
+
+        Filters are checked once per candidate chunk before any scoring work,
+        so restricting to a handful of papers or chunk types stays cheap.
+
+        Args:
+            query: Query text
+            paper_ids: Only score chunks of these papers (None = all papers)
+            chunk_types: Only score chunks of these types (None = all types)
+            exclude_paper_ids: Never score chunks of these papers
+
+        Returns:
+            Mapping of chunk_id to BM25 score
+        """
+        if not self.chunks:
+            return {}
+
+        include = set(paper_ids) if paper_ids is not None else None
+        exclude = set(exclude_paper_ids or ())
+        types = set(chunk_types) if chunk_types else None
+
+        n_docs = len(self.chunks)
+        avg_length = self._total_length / n_docs or 1.0
+
+        allowed: dict[str, bool] = {}
+        scores: dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for chunk_id, freq in postings.items():
+                ok = allowed.get(chunk_id)
+                if ok is None:
+                    chunk = self.chunks[chunk_id]
+                    ok = (
+                        (include is None or chunk.paper_id in include)
+                        and chunk.paper_id not in exclude
+                        and (types is None or chunk.chunk_type in types)
+                    )
+                    allowed[chunk_id] = ok
+                if not ok:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[chunk_id] / avg_length)
+                scores[chunk_id] += idf * freq * (self.k1 + 1) / (freq + norm)
+
+        return scores
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        paper_ids: Optional[Iterable[str]] = None,
+        chunk_types: Optional[Iterable[ChunkType]] = None,
+        exclude_paper_ids: Optional[Iterable[str]] = None,
+    ) -> list[tuple[TextChunk, float]]:
+        """Return the top-k chunks for a query.
+
+        Args:
+            query: Query text
+            top_k: Number of results to return
+            paper_ids: Restrict results to these papers (None = all papers)
+            chunk_types: Restrict results to these chunk types (None = all types)
+            exclude_paper_ids: Papers to exclude from the results
+
+        Returns:
+            List of (chunk, score) tuples, highest score first
+        """
+        scores = self.score(query, paper_ids, chunk_types, exclude_paper_ids)
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(self.chunks[chunk_id], score) for chunk_id, score in best]
+
+    def save(self, save_dir: Union[Path, str]):
+        """Save the index to disk.
+
+        Args:
+            save_dir: Directory to save to
+        """
+        save_dir = Path(save_dir)
+        save_dir.mkdir(parents=True, exist_ok=True)
+
+        # Postings are rebuilt from the chunks on load
+        with open(save_dir / "chunks.pkl", "wb") as f:
+            pickle.dump(list(self.chunks.values()), f)
+
+        with open(save_dir / "config.json", "w") as f:
+            json.dump({"k1": self.k1, "b": self.b, "total_chunks": self.size}, f, indent=2)
+
+    @classmethod
+    def load(cls, load_dir: Union[Path, str]) -> "BM25Index":
+        """Load an index from disk.
+
+        Args:
+            load_dir: Directory to load from
+
+        Returns:
+            Loaded index
+        """
+        load_dir = Path(load_dir)
+
+        with open(load_dir / "config.json") as f:
+            config = json.load(f)
+
+        index = cls(k1=config["k1"], b=config["b"])
+        with open(load_dir / "chunks.pkl", "rb") as f:
+            index.add_batch(pickle.load(f))
+        return index
+
+    @property
+    def size(self) -> int:
+        """Number of indexed chunks."""
+        return len(self.chunks)
+
+    @property
+    def paper_count(self) -> int:
+        """Number of papers with at least one indexed chunk."""
+        return len(self._paper_chunks)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get statistics about the index.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            "total_chunks": self.size,
+            "unique_papers": self.paper_count,
+            "vocabulary_size": len(self.postings),
+            "avg_chunk_terms": self._total_length / self.size if self.size else 0.0,
+        }
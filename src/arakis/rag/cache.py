@@ -1,55 +1,122 @@
 """Persistent cache for embeddings.
 
 Caches embeddings to disk to avoid re-embedding the same text.
+
+Vectors are stored as raw float32 (or float16) BLOBs rather than JSON text,
+and a single long-lived WAL-mode connection serves all reads and writes.
+Databases created by older versions (JSON ``vector`` column) are migrated
+in place on open.
 """
 
 import hashlib
 import json
 import sqlite3
+import threading
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Union
 
+import numpy as np
+
 from arakis.models.rag import Embedding, EmbeddingCache, EmbeddingStats
 
+# Bumped whenever the table layout changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 2
+
+SUPPORTED_DTYPES = ("float32", "float16")
+
+# Keep IN (...) lists below SQLite's default host parameter limit
+_MAX_QUERY_PARAMS = 900
+
+# Rows converted per transaction while migrating JSON vectors to BLOBs
+_MIGRATION_BATCH = 1000
+
 
 class EmbeddingCacheStore:
     """SQLite-based persistent cache for embeddings."""
 
-    def __init__(self, cache_dir: Union[Path, str] = ".arakis_cache"):
+    def __init__(self, cache_dir: Union[Path, str] = ".arakis_cache", dtype: str = "float32"):
         """Initialize the cache store.
 
         Args:
             cache_dir: Directory to store cache database
+            dtype: Storage precision for new vectors ("float32" or "float16")
         """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype}. Use one of {SUPPORTED_DTYPES}")
+
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = self.cache_dir / "embeddings.db"
+        self.dtype = dtype
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._init_db()
 
     def _init_db(self):
-        """Initialize the SQLite database."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        """Initialize the SQLite database, migrating older schemas."""
+        with self._lock, self._conn:
+            self._conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS embeddings (
                     chunk_id TEXT PRIMARY KEY,
                     embedding_hash TEXT NOT NULL,
                     model TEXT NOT NULL,
-                    vector TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    dtype TEXT NOT NULL DEFAULT 'float32',
                     dimensions INTEGER NOT NULL,
                     token_count INTEGER NOT NULL,
                     created_at TEXT NOT NULL
                 )
                 """
             )
-            conn.execute(
+            self._conn.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_hash_model
                 ON embeddings(embedding_hash, model)
                 """
             )
-            conn.commit()
+
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version < SCHEMA_VERSION:
+            self._migrate()
+
+    def _migrate(self):
+        """Convert a v1 database (JSON text vectors) to BLOB storage."""
+        with self._lock:
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+            with self._conn:
+                if "dtype" not in columns:
+                    self._conn.execute(
+                        "ALTER TABLE embeddings ADD COLUMN dtype TEXT NOT NULL DEFAULT 'float32'"
+                    )
+
+            while True:
+                rows = self._conn.execute(
+                    "SELECT chunk_id, vector FROM embeddings WHERE typeof(vector) = 'text' LIMIT ?",
+                    (_MIGRATION_BATCH,),
+                ).fetchall()
+                if not rows:
+                    break
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET vector = ?, dtype = ? WHERE chunk_id = ?",
+                        [
+                            (self._encode(json.loads(vector_json)), self.dtype, chunk_id)
+                            for chunk_id, vector_json in rows
+                        ],
+                    )
+
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
 
     def _hash_text(self, text: str) -> str:
         """Generate hash of text for cache lookup.
@@ -62,6 +129,15 @@ class EmbeddingCacheStore:
         """
         return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
+    def _encode(self, vector: Union[list[float], np.ndarray]) -> bytes:
+        """Pack a vector into a BLOB using the store's dtype."""
+        return np.asarray(vector, dtype=self.dtype).tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes, dtype: str) -> np.ndarray:
+        """Unpack a BLOB into a float32 array."""
+        return np.frombuffer(blob, dtype=dtype).astype(np.float32)
+
     def get(self, chunk_id: str, text: str, model: str) -> Optional[Embedding]:
         """Get cached embedding if available.
 
@@ -73,33 +149,49 @@ class EmbeddingCacheStore:
         Returns:
             Cached embedding or None if not found/invalid
         """
-        text_hash = self._hash_text(text)
+        return self.get_many([(chunk_id, text)], model).get(chunk_id)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT vector, dimensions, created_at
-                FROM embeddings
-                WHERE chunk_id = ? AND embedding_hash = ? AND model = ?
-                """,
-                (chunk_id, text_hash, model),
-            )
-            row = cursor.fetchone()
+    def get_many(self, items: Iterable[tuple[str, str]], model: str) -> dict[str, Embedding]:
+        """Get cached embeddings for many chunks at once.
 
-        if not row:
-            return None
+        Args:
+            items: (chunk_id, text) pairs; text is used for hash verification
+            model: Model name
 
-        vector_json, dimensions, created_at_str = row
-        vector = json.loads(vector_json)
-        created_at = datetime.fromisoformat(created_at_str)
+        Returns:
+            Mapping of chunk_id to embedding for every cache hit
+        """
+        expected = {chunk_id: self._hash_text(text) for chunk_id, text in items}
+        chunk_ids = list(expected)
+
+        rows = []
+        with self._lock:
+            for start in range(0, len(chunk_ids), _MAX_QUERY_PARAMS):
+                batch = chunk_ids[start : start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows.extend(
+                    self._conn.execute(
+                        f"""
+                        SELECT chunk_id, embedding_hash, vector, dtype, dimensions, created_at
+                        FROM embeddings
+                        WHERE model = ? AND chunk_id IN ({placeholders})
+                        """,
+                        (model, *batch),
+                    ).fetchall()
+                )
 
-        return Embedding(
-            chunk_id=chunk_id,
-            vector=vector,
-            model=model,
-            dimensions=dimensions,
-            created_at=created_at,
-        )
+        results = {}
+        for chunk_id, text_hash, blob, dtype, dimensions, created_at_str in rows:
+            if expected[chunk_id] != text_hash:
+                continue
+            results[chunk_id] = Embedding(
+                chunk_id=chunk_id,
+                vector=self._decode(blob, dtype).tolist(),
+                model=model,
+                dimensions=dimensions,
+                created_at=datetime.fromisoformat(created_at_str),
+            )
+        return results
 
     def put(self, chunk_id: str, text: str, embedding: Embedding, token_count: int):
         """Store embedding in cache.
@@ -110,27 +202,94 @@ class EmbeddingCacheStore:
             embedding: Embedding to cache
             token_count: Number of tokens in the text
         """
-        text_hash = self._hash_text(text)
-        vector_json = json.dumps(embedding.vector)
+        self.put_many([(chunk_id, text, embedding, token_count)])
+
+    def put_many(self, entries: Iterable[tuple[str, str, Embedding, int]]):
+        """Store many embeddings in a single transaction.
+
+        Args:
+            entries: (chunk_id, text, embedding, token_count) tuples
+        """
+        rows = [
+            (
+                chunk_id,
+                self._hash_text(text),
+                embedding.model,
+                self._encode(embedding.vector),
+                self.dtype,
+                embedding.dimensions,
+                token_count,
+                embedding.created_at.isoformat(),
+            )
+            for chunk_id, text, embedding, token_count in entries
+        ]
+        if not rows:
+            return
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        with self._lock, self._conn:
+            self._conn.executemany(
                 """
                 INSERT OR REPLACE INTO embeddings
-                (chunk_id, embedding_hash, model, vector, dimensions, token_count, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (chunk_id, embedding_hash, model, vector, dtype, dimensions, token_count, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    chunk_id,
-                    text_hash,
-                    embedding.model,
-                    vector_json,
-                    embedding.dimensions,
-                    token_count,
-                    embedding.created_at.isoformat(),
-                ),
+                rows,
             )
-            conn.commit()
+
+    def export_numpy(
+        self,
+        path: Union[Path, str],
+        model: str,
+        chunk_ids: Optional[list[str]] = None,
+    ) -> tuple[np.ndarray, list[str]]:
+        """Export cached vectors to a memory-mapped ``.npy`` file.
+
+        Intended for bulk index builds: vectors are streamed from SQLite into
+        the file without materializing Python lists, and the returned array is
+        a read-only memory map that can be handed straight to FAISS.
+
+        Args:
+            path: Destination ``.npy`` file
+            model: Model whose embeddings to export
+            chunk_ids: Restrict to these chunks (None = every chunk for the model)
+
+        Returns:
+            Tuple of (float32 memmap of shape (n, dimensions), chunk_ids in row order)
+        """
+        path = Path(path)
+
+        with self._lock:
+            if chunk_ids is None:
+                rows = self._conn.execute(
+                    "SELECT chunk_id, vector, dtype, dimensions FROM embeddings "
+                    "WHERE model = ? ORDER BY chunk_id",
+                    (model,),
+                ).fetchall()
+            else:
+                rows = []
+                for start in range(0, len(chunk_ids), _MAX_QUERY_PARAMS):
+                    batch = chunk_ids[start : start + _MAX_QUERY_PARAMS]
+                    placeholders = ",".join("?" * len(batch))
+                    rows.extend(
+                        self._conn.execute(
+                            f"SELECT chunk_id, vector, dtype, dimensions FROM embeddings "
+                            f"WHERE model = ? AND chunk_id IN ({placeholders})",
+                            (model, *batch),
+                        ).fetchall()
+                    )
+                order = {chunk_id: i for i, chunk_id in enumerate(chunk_ids)}
+                rows.sort(key=lambda row: order[row[0]])
+
+        dimensions = rows[0][3] if rows else 0
+        out = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float32, shape=(len(rows), dimensions)
+        )
+        for i, (_, blob, dtype, _) in enumerate(rows):
+            out[i] = np.frombuffer(blob, dtype=dtype)
+        out.flush()
+        del out
+
+        return np.load(path, mmap_mode="r"), [row[0] for row in rows]
 
     def get_metadata(self, chunk_id: str) -> Optional[EmbeddingCache]:
         """Get cache metadata for a chunk.
@@ -141,8 +300,8 @@ class EmbeddingCacheStore:
         Returns:
             Cache metadata or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
+        with self._lock:
+            cursor = self._conn.execute(
                 """
                 SELECT embedding_hash, model, token_count, created_at
                 FROM embeddings
@@ -172,9 +331,9 @@ class EmbeddingCacheStore:
         Returns:
             Statistics about cached embeddings
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
             # Get counts and token totals
-            cursor = conn.execute(
+            cursor = self._conn.execute(
                 """
                 SELECT
                     COUNT(*) as total,
@@ -188,7 +347,7 @@ class EmbeddingCacheStore:
             total, total_tokens, oldest_str, newest_str = row
 
             # Get unique models
-            cursor = conn.execute("SELECT DISTINCT model FROM embeddings")
+            cursor = self._conn.execute("SELECT DISTINCT model FROM embeddings")
             models = [row[0] for row in cursor.fetchall()]
 
         # Get cache file size
@@ -214,12 +373,11 @@ class EmbeddingCacheStore:
             model: If specified, only clear embeddings for this model.
                    If None, clear all embeddings.
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn:
             if model:
-                conn.execute("DELETE FROM embeddings WHERE model = ?", (model,))
+                self._conn.execute("DELETE FROM embeddings WHERE model = ?", (model,))
             else:
-                conn.execute("DELETE FROM embeddings")
-            conn.commit()
+                self._conn.execute("DELETE FROM embeddings")
 
     def delete(self, chunk_id: str):
         """Delete a specific embedding from cache.
@@ -227,6 +385,5 @@ class EmbeddingCacheStore:
         Args:
             chunk_id: Chunk identifier to delete
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM embeddings WHERE chunk_id = ?", (chunk_id,))
-            conn.commit()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM embeddings WHERE chunk_id = ?", (chunk_id,))
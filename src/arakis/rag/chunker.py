@@ -0,0 +1,103 @@
+"""Token-aware chunking of paper full text.
+
+Full text is split into overlapping windows measured in embedding-model
+tokens, so every chunk fits the embedding context and consecutive chunks
+share enough context that a passage straddling a boundary is still
+retrievable from one of them.
+"""
+
+import re
+from typing import Any, Optional
+
+from arakis.models.paper import Paper
+from arakis.models.rag import ChunkType, TextChunk
+from arakis.utils import get_token_encoding
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class TextChunker:
+    """Splits long text into overlapping token windows."""
+
+    def __init__(
+        self,
+        chunk_tokens: int = 512,
+        overlap_tokens: int = 64,
+        encoding_name: str = "cl100k_base",
+        max_chunks: Optional[int] = None,
+    ):
+        """Initialize the chunker.
+
+        Args:
+            chunk_tokens: Window size in tokens
+            overlap_tokens: Tokens shared by consecutive windows
+            encoding_name: tiktoken encoding used for token counting
+            max_chunks: Cap on windows per text (None = no cap)
+        """
+        if chunk_tokens <= 0:
+            raise ValueError("chunk_tokens must be positive")
+        if not 0 <= overlap_tokens < chunk_tokens:
+            raise ValueError("overlap_tokens must be in [0, chunk_tokens)")
+
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.max_chunks = max_chunks
+        self.encoding = get_token_encoding(encoding_name)
+
+    def split(self, text: str) -> list[tuple[str, int]]:
+        """Split text into overlapping token windows.
+
+        The text is tokenized once; windows are slices of the token array
+        decoded back to text.
+
+        Args:
+            text: Text to split
+
+        Returns:
+            List of (window_text, start_token) tuples
+        """
+        text = _WHITESPACE.sub(" ", text).strip()
+        if not text:
+            return []
+
+        tokens = self.encoding.encode_ordinary(text)
+        if len(tokens) <= self.chunk_tokens:
+            return [(text, 0)]
+
+        stride = self.chunk_tokens - self.overlap_tokens
+        windows = []
+        for start in range(0, len(tokens), stride):
+            window = self.encoding.decode(tokens[start : start + self.chunk_tokens]).strip()
+            if window:
+                windows.append((window, start))
+            if start + self.chunk_tokens >= len(tokens):
+                break
+            if self.max_chunks is not None and len(windows) >= self.max_chunks:
+                break
+        return windows
+
+    def chunk_paper(
+        self, paper: Paper, metadata: Optional[dict[str, Any]] = None
+    ) -> list[TextChunk]:
+        """Create FULL_TEXT chunks from a paper's full text.
+
+        Args:
+            paper: Paper to chunk
+            metadata: Metadata copied onto every chunk
+
+        Returns:
+            List of full-text chunks (empty if the paper has no full text)
+        """
+        if not paper.full_text:
+            return []
+
+        return [
+            TextChunk(
+                paper_id=paper.best_identifier,
+                chunk_type=ChunkType.FULL_TEXT,
+                text=window,
+                metadata={**(metadata or {}), "token_start": start},
+                part=part,
+            )
+            for part, (window, start) in enumerate(self.split(paper.full_text))
+        ]
@@ -0,0 +1,481 @@
+"""Persistent corpus-level embedding index shared across workflows.
+
+Chunks are keyed by paper identifier (DOI first, then PMID, see
+``Paper.best_identifier``) and stored in an append-only layout:
+
+- ``vectors.f32``: raw float32 rows, one per chunk ever added
+- ``log.jsonl``: append-only operation log (chunk adds and paper deletes)
+- ``config.json``: dimension and compaction generation
+
+Deletes are tombstones in the log; ``compact()`` rewrites both files without
+dead rows. Vectors are loaded through ``numpy.memmap`` so opening a large
+corpus does not deserialize anything, and other processes on the same node
+pick up appended rows incrementally via ``refresh()``.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+import numpy as np
+
+from arakis.config import get_settings
+from arakis.models.paper import Paper
+from arakis.models.rag import ChunkType, Embedding, TextChunk
+from arakis.rag.vector_store import VectorStore
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+if TYPE_CHECKING:
+    from arakis.rag.embedder import Embedder
+
+# Rows fed to FAISS per block when loading from the memory-mapped file
+_LOAD_BLOCK_ROWS = 65536
+
+
+def _hash_text(text: str) -> str:
+    """SHA256 of chunk text, used to detect changed chunks."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CorpusIndex:
+    """Append-only on-disk embedding index keyed by paper identifier."""
+
+    def __init__(
+        self,
+        index_dir: Union[Path, str],
+        dimension: int = 1536,
+        compact_threshold: float = 0.25,
+    ):
+        """Open (or create) a corpus index.
+
+        Args:
+            index_dir: Directory holding the index files
+            dimension: Embedding dimension (must match an existing index)
+            compact_threshold: Tombstone ratio above which deletes trigger compaction
+        """
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.index_dir / "vectors.f32"
+        self.log_path = self.index_dir / "log.jsonl"
+        self.config_path = self.index_dir / "config.json"
+        self.lock_path = self.index_dir / ".lock"
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+
+        with self._file_lock(exclusive=True):
+            if self.config_path.exists():
+                config = json.loads(self.config_path.read_text())
+                if config["dimension"] != dimension:
+                    raise ValueError(
+                        f"Corpus index at {self.index_dir} has dimension "
+                        f"{config['dimension']}, expected {dimension}"
+                    )
+            else:
+                self._write_config({"dimension": dimension, "generation": 0})
+                self.vectors_path.touch()
+                self.log_path.touch()
+
+            self.dimension = dimension
+            self._reset()
+            self._refresh_locked()
+
+    # ------------------------------------------------------------------
+    # Locking and file helpers
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Hold the in-process lock plus an advisory lock on the index directory."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_config(self, config: dict[str, Any]):
+        """Atomically replace config.json."""
+        tmp_path = self.config_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(config, indent=2))
+        os.replace(tmp_path, self.config_path)
+
+    def _read_generation(self) -> int:
+        return json.loads(self.config_path.read_text())["generation"]
+
+    def _reset(self):
+        """Drop in-memory state so the next refresh replays the log from scratch."""
+        self.store = VectorStore(dimension=self.dimension, index_type="auto", metric="cosine")
+        self._generation = self._read_generation()
+        self._log_offset = 0
+        self._text_hashes: dict[str, str] = {}
+
+    def _memmap_vectors(self, rows: int) -> np.ndarray:
+        """Map the first ``rows`` vectors of the vector file read-only."""
+        if rows == 0:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimension)
+        )
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def refresh(self):
+        """Apply operations appended by other workflows or processes since the last read."""
+        with self._file_lock(exclusive=False):
+            self._refresh_locked()
+
+    def _refresh_locked(self):
+        if self._read_generation() != self._generation:
+            # Another process compacted the index; row numbers changed
+            self._reset()
+
+        if self.log_path.stat().st_size == self._log_offset:
+            return
+
+        with open(self.log_path, "rb") as f:
+            f.seek(self._log_offset)
+            lines = f.readlines()
+
+        ops = []
+        for line in lines:
+            if not line.endswith(b"\n"):
+                break  # partially written line from a crashed writer
+            self._log_offset += len(line)
+            ops.append(json.loads(line))
+
+        max_row = max((op["row"] for op in ops if op["op"] == "add"), default=-1)
+        vectors = self._memmap_vectors(max_row + 1)
+
+        pending: list[tuple[int, TextChunk]] = []
+        for op in ops:
+            if op["op"] == "add":
+                chunk = TextChunk(
+                    paper_id=op["paper_id"],
+                    chunk_type=ChunkType(op["chunk_type"]),
+                    text=op["text"],
+                    metadata=op.get("metadata", {}),
+                    part=op.get("part"),
+                )
+                self._text_hashes[chunk.chunk_id] = op["text_hash"]
+                pending.append((op["row"], chunk))
+            elif op["op"] == "delete":
+                self._apply_adds(pending, vectors)
+                pending = []
+                self.store.remove_paper(op["paper_id"])
+                self._text_hashes = {
+                    cid: h for cid, h in self._text_hashes.items() if cid in self.store.chunks
+                }
+        self._apply_adds(pending, vectors)
+
+    def _apply_adds(self, pending: list[tuple[int, TextChunk]], vectors: np.ndarray):
+        """Feed logged adds to the vector store in contiguous memory-mapped blocks."""
+        for start in range(0, len(pending), _LOAD_BLOCK_ROWS):
+            block = pending[start : start + _LOAD_BLOCK_ROWS]
+            first_row = block[0][0]
+            rows = [row for row, _ in block]
+            if rows == list(range(first_row, first_row + len(block))):
+                block_vectors = vectors[first_row : first_row + len(block)]
+            else:
+                block_vectors = vectors[rows]
+            self.store.add_vectors([chunk for _, chunk in block], block_vectors)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _append(self, records: list[dict[str, Any]], vectors: Optional[np.ndarray] = None):
+        """Append vectors and log records, then apply them locally.
+
+        Must be called with the exclusive file lock held.
+        """
+        if vectors is not None and len(vectors):
+            row_start = self.vectors_path.stat().st_size // (4 * self.dimension)
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            for offset, record in enumerate(r for r in records if r["op"] == "add"):
+                record["row"] = row_start + offset
+
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._refresh_locked()
+
+    def add(self, chunks: list[TextChunk], embeddings: list[Embedding]) -> int:
+        """Append chunks whose text is new or changed.
+
+        Args:
+            chunks: Text chunks
+            embeddings: Corresponding embeddings
+
+        Returns:
+            Number of chunks appended
+        """
+        if len(chunks) != len(embeddings):
+            raise ValueError("Number of chunks and embeddings must match")
+
+        with self._file_lock(exclusive=True):
+            self._refresh_locked()
+
+            records = []
+            vectors = []
+            for chunk, embedding in zip(chunks, embeddings):
+                text_hash = _hash_text(chunk.text)
+                if self._text_hashes.get(chunk.chunk_id) == text_hash:
+                    continue
+                records.append(
+                    {
+                        "op": "add",
+                        "paper_id": chunk.paper_id,
+                        "chunk_type": chunk.chunk_type.value,
+                        "text": chunk.text,
+                        "text_hash": text_hash,
+                        "metadata": chunk.metadata,
+                        "part": chunk.part,
+                    }
+                )
+                vectors.append(embedding.vector)
+
+            if records:
+                self._append(records, np.array(vectors, dtype=np.float32))
+
+        return len(records)
+
+    def missing_chunks(self, chunks: list[TextChunk]) -> list[TextChunk]:
+        """Return chunks that are not yet indexed with identical text.
+
+        Args:
+            chunks: Candidate chunks
+
+        Returns:
+            Chunks that still need embedding
+        """
+        with self._file_lock(exclusive=False):
+            self._refresh_locked()
+            return [
+                chunk
+                for chunk in chunks
+                if self._text_hashes.get(chunk.chunk_id) != _hash_text(chunk.text)
+            ]
+
+    async def index_chunks(self, chunks: list[TextChunk], embedder: "Embedder") -> int:
+        """Embed and append only the chunks the corpus does not already hold.
+
+        Args:
+            chunks: Chunks to make available in the corpus
+            embedder: Embedder used for chunks that are missing
+
+        Returns:
+            Number of chunks appended
+        """
+        missing = self.missing_chunks(chunks)
+        if not missing:
+            return 0
+        embeddings = await embedder.embed_chunks(missing, use_cache=True)
+        return self.add(missing, embeddings)
+
+    async def index_papers(self, papers: list[Paper], embedder: "Embedder") -> int:
+        """Chunk, embed and append papers that are new or changed.
+
+        Args:
+            papers: Papers to index
+            embedder: Embedder used for chunking and embedding
+
+        Returns:
+            Number of chunks appended
+        """
+        chunks = []
+        for paper in papers:
+            chunks.extend(embedder.create_chunks_from_paper(paper))
+        return await self.index_chunks(chunks, embedder)
+
+    def delete_paper(self, paper_id: str) -> bool:
+        """Tombstone all chunks of a paper.
+
+        Compaction runs automatically once the tombstone ratio exceeds
+        ``compact_threshold``.
+
+        Args:
+            paper_id: Paper identifier (DOI/PMID key)
+
+        Returns:
+            True if the paper was present
+        """
+        with self._file_lock(exclusive=True):
+            self._refresh_locked()
+            if not self.contains(paper_id):
+                return False
+            self._append([{"op": "delete", "paper_id": paper_id}])
+
+        if self.store.tombstone_ratio > self.compact_threshold:
+            self.compact()
+        return True
+
+    def compact(self) -> int:
+        """Rewrite the vector file and log without tombstoned rows.
+
+        Returns:
+            Number of rows dropped
+        """
+        with self._file_lock(exclusive=True):
+            self._refresh_locked()
+            dropped = len(self.store.tombstones)
+            if not dropped:
+                return 0
+
+            live = [
+                pos for pos in range(len(self.store.id_map)) if pos not in self.store.tombstones
+            ]
+            vectors = self._memmap_vectors(len(self.store.id_map))
+
+            vectors_tmp = self.vectors_path.with_suffix(".f32.tmp")
+            log_tmp = self.log_path.with_suffix(".jsonl.tmp")
+            with open(vectors_tmp, "wb") as vf, open(log_tmp, "w", encoding="utf-8") as lf:
+                for new_row, pos in enumerate(live):
+                    chunk = self.store.chunks[self.store.id_map[pos]]
+                    vf.write(np.asarray(vectors[pos], dtype=np.float32).tobytes())
+                    record = {
+                        "op": "add",
+                        "paper_id": chunk.paper_id,
+                        "chunk_type": chunk.chunk_type.value,
+                        "text": chunk.text,
+                        "text_hash": self._text_hashes[chunk.chunk_id],
+                        "metadata": chunk.metadata,
+                        "part": chunk.part,
+                        "row": new_row,
+                    }
+                    lf.write(json.dumps(record, default=str) + "\n")
+                vf.flush()
+                os.fsync(vf.fileno())
+                lf.flush()
+                os.fsync(lf.fileno())
+            del vectors
+
+            os.replace(vectors_tmp, self.vectors_path)
+            os.replace(log_tmp, self.log_path)
+            self._write_config({"dimension": self.dimension, "generation": self._generation + 1})
+
+            self._reset()
+            self._refresh_locked()
+
+        return dropped
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def contains(self, paper_id: str) -> bool:
+        """Check whether any live chunk belongs to the paper."""
+        prefix = f"{paper_id}:"
+        return any(chunk_id.startswith(prefix) for chunk_id in self._text_hashes)
+
+    def search(
+        self,
+        query_vector: list[float],
+        top_k: int = 10,
+        paper_ids: Optional[Iterable[str]] = None,
+        **filters: Any,
+    ) -> list[tuple[TextChunk, float]]:
+        """Search the corpus, optionally restricted to a workflow's papers.
+
+        Args:
+            query_vector: Query embedding vector
+            top_k: Number of results to return
+            paper_ids: Papers in scope (None = whole corpus)
+            **filters: Extra ``VectorStore.search`` filters (chunk_types, exclude_paper_ids)
+
+        Returns:
+            List of (chunk, distance) tuples, lower distance = more similar
+        """
+        return self.search_batch([query_vector], top_k=top_k, paper_ids=paper_ids, **filters)[0]
+
+    def search_batch(
+        self,
+        query_vectors: Union[np.ndarray, list[list[float]]],
+        top_k: int = 10,
+        paper_ids: Optional[Iterable[str]] = None,
+        **filters: Any,
+    ) -> list[list[tuple[TextChunk, float]]]:
+        """Search the corpus for many queries with one FAISS call.
+
+        Args:
+            query_vectors: Query embedding vectors, one per row
+            top_k: Number of results per query
+            paper_ids: Papers in scope (None = whole corpus)
+            **filters: Extra ``VectorStore.search_batch`` filters
+
+        Returns:
+            One list of (chunk, distance) tuples per query
+        """
+        with self._file_lock(exclusive=False):
+            self._refresh_locked()
+            return self.store.search_batch(
+                query_vectors, top_k=top_k, paper_ids=paper_ids, **filters
+            )
+
+    @property
+    def size(self) -> int:
+        """Number of live chunks in the corpus."""
+        return self.store.size
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get statistics about the corpus index.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self.store.get_stats()
+        stats.update(
+            {
+                "index_dir": str(self.index_dir),
+                "generation": self._generation,
+                "vector_file_bytes": self.vectors_path.stat().st_size,
+            }
+        )
+        return stats
+
+
+_corpus_indexes: dict[Path, CorpusIndex] = {}
+_corpus_indexes_lock = threading.Lock()
+
+
+def get_corpus_index(
+    index_dir: Optional[Union[Path, str]] = None, dimension: int = 1536
+) -> CorpusIndex:
+    """Get the process-wide corpus index for a directory.
+
+    All workflows in a process share one instance per directory; other
+    processes on the node share the same files.
+
+    Args:
+        index_dir: Index directory (defaults to ``settings.rag_corpus_index_dir``)
+        dimension: Embedding dimension
+
+    Returns:
+        Shared CorpusIndex
+    """
+    path = Path(index_dir or get_settings().rag_corpus_index_dir).resolve()
+    with _corpus_indexes_lock:
+        if path not in _corpus_indexes:
+            _corpus_indexes[path] = CorpusIndex(path, dimension=dimension)
+        return _corpus_indexes[path]
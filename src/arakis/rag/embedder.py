@@ -3,14 +3,22 @@
 Generates embeddings using OpenAI's text-embedding models with caching.
 """
 
-import tiktoken
+import hashlib
+from typing import Optional
+
+import numpy as np
 from openai import AsyncOpenAI
 
 from arakis.config import get_settings
 from arakis.models.paper import Paper
 from arakis.models.rag import ChunkType, Embedding, TextChunk
 from arakis.rag.cache import EmbeddingCacheStore
-from arakis.utils import get_openai_rate_limiter, retry_with_exponential_backoff
+from arakis.rag.chunker import TextChunker
+from arakis.utils import (
+    get_openai_rate_limiter,
+    get_token_encoding,
+    retry_with_exponential_backoff,
+)
 
 
 class Embedder:
@@ -21,6 +29,8 @@ class Embedder:
         model: str = "text-embedding-3-small",
         cache_dir: str = ".arakis_cache",
         batch_size: int = 100,
+        chunker: Optional[TextChunker] = None,
+        include_full_text: bool = True,
     ):
         """Initialize the embedder.
 
@@ -28,6 +38,8 @@ class Embedder:
             model: OpenAI embedding model to use
             cache_dir: Directory for embedding cache
             batch_size: Number of texts to embed in one API call
+            chunker: Full-text chunker (creates default if None)
+            include_full_text: Whether to chunk ``Paper.full_text`` when present
         """
         settings = get_settings()
         self.client = AsyncOpenAI(api_key=settings.openai_api_key)
@@ -35,7 +47,9 @@ class Embedder:
         self.batch_size = batch_size
         self.cache = EmbeddingCacheStore(cache_dir)
         self.rate_limiter = get_openai_rate_limiter()
-        self.encoding = tiktoken.get_encoding("cl100k_base")  # For token counting
+        self.encoding = get_token_encoding("cl100k_base")  # For token counting
+        self.chunker = chunker or TextChunker()
+        self.include_full_text = include_full_text
 
     def _count_tokens(self, text: str) -> int:
         """Count tokens in text.
@@ -88,6 +102,14 @@ class Embedder:
                 )
             )
 
+        # Full-text windows (only once the PDF has been fetched and extracted)
+        if self.include_full_text and paper.full_text:
+            chunks.extend(
+                self.chunker.chunk_paper(
+                    paper, metadata={"year": paper.year, "journal": paper.journal}
+                )
+            )
+
         return chunks
 
     @retry_with_exponential_backoff(max_retries=5, initial_delay=1.0, max_delay=30.0)
@@ -107,8 +129,9 @@ class Embedder:
 
         response = await self.client.embeddings.create(input=texts, model=self.model)
 
-        # Extract vectors in order
-        vectors = [item.embedding for item in response.data]
+        # Extract vectors in order, rounded to float32 so fresh and cached
+        # embeddings of the same text are identical
+        vectors = [np.asarray(item.embedding, dtype=np.float32).tolist() for item in response.data]
         return vectors
 
     async def embed_chunk(self, chunk: TextChunk, use_cache: bool = True) -> Embedding:
@@ -161,13 +184,17 @@ class Embedder:
         chunks_to_embed = []
         chunk_indices = []
 
-        # Check cache for each chunk
+        # Check cache for all chunks in one query
+        cached = {}
+        if use_cache:
+            cached = self.cache.get_many(
+                ((chunk.chunk_id, chunk.text) for chunk in chunks), self.model
+            )
+
         for i, chunk in enumerate(chunks):
-            if use_cache:
-                cached = self.cache.get(chunk.chunk_id, chunk.text, self.model)
-                if cached:
-                    embeddings.append((i, cached))
-                    continue
+            if chunk.chunk_id in cached:
+                embeddings.append((i, cached[chunk.chunk_id]))
+                continue
 
             chunks_to_embed.append(chunk)
             chunk_indices.append(i)
@@ -184,23 +211,25 @@ class Embedder:
                 # Embed batch
                 vectors = await self._embed_batch(texts)
 
-                # Create and cache embeddings
-                for chunk, vector in zip(batch, vectors):
+                # Create embeddings
+                to_cache = []
+                for offset, (chunk, vector) in enumerate(zip(batch, vectors)):
                     embedding = Embedding(
                         chunk_id=chunk.chunk_id,
                         vector=vector,
                         model=self.model,
                         dimensions=len(vector),
                     )
-
-                    # Cache it
                     token_count = self._count_tokens(chunk.text)
-                    self.cache.put(chunk.chunk_id, chunk.text, embedding, token_count)
+                    to_cache.append((chunk.chunk_id, chunk.text, embedding, token_count))
 
                     # Add to results
-                    original_idx = chunk_indices[batch_start + batch.index(chunk)]
+                    original_idx = chunk_indices[batch_start + offset]
                     embeddings.append((original_idx, embedding))
 
+                # Cache the whole batch in one transaction
+                self.cache.put_many(to_cache)
+
                 # Small delay between batches
                 if batch_end < len(chunks_to_embed):
                     await self.rate_limiter.wait()
@@ -209,6 +238,32 @@ class Embedder:
         embeddings.sort(key=lambda x: x[0])
         return [emb for _, emb in embeddings]
 
+    async def embed_texts(self, texts: list[str], use_cache: bool = True) -> list[list[float]]:
+        """Embed free-form texts (e.g. retrieval queries) in batched requests.
+
+        Texts are keyed by content hash, so repeated queries are served from
+        the embedding cache.
+
+        Args:
+            texts: Texts to embed
+            use_cache: Whether to use cached embeddings
+
+        Returns:
+            One embedding vector per input text, in order
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        chunks = [
+            TextChunk(
+                paper_id=f"query_{hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}",
+                chunk_type=ChunkType.ABSTRACT,
+                text=text,
+            )
+            for text in unique_texts
+        ]
+        embeddings = await self.embed_chunks(chunks, use_cache=use_cache)
+        vectors = {text: emb.vector for text, emb in zip(unique_texts, embeddings)}
+        return [vectors[text] for text in texts]
+
     async def embed_papers(
         self, papers: list[Paper], use_cache: bool = True
     ) -> dict[str, list[Embedding]]:
@@ -0,0 +1,223 @@
+"""Hybrid lexical + semantic retriever.
+
+Runs BM25 and vector search side by side and merges the two rankings with
+reciprocal-rank fusion (RRF), which needs no score calibration between the
+two systems. Over large collections the BM25 scores double as a cheap
+pre-filter: vector search is restricted to the papers with the strongest
+lexical match before it touches the FAISS index.
+"""
+
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional, Union
+
+from arakis.models.rag import RetrievalQuery, RetrievalResponse, TextChunk
+from arakis.rag.bm25 import BM25Index
+from arakis.rag.corpus_index import CorpusIndex
+from arakis.rag.embedder import Embedder
+from arakis.rag.retriever import Retriever
+from arakis.rag.vector_store import VectorStore
+
+
+class HybridRetriever(Retriever):
+    """Retrieves documents by fusing BM25 and vector-similarity rankings."""
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        vector_store: Optional[VectorStore] = None,
+        cache_dir: str = ".arakis_cache",
+        corpus_index: Optional[CorpusIndex] = None,
+        bm25_index: Optional[BM25Index] = None,
+        rrf_k: int = 60,
+        candidates: int = 50,
+        prefilter_papers: Optional[int] = 200,
+    ):
+        """Initialize the hybrid retriever.
+
+        Args:
+            embedder: Embedder instance (creates default if None)
+            vector_store: Vector store instance (creates default if None)
+            cache_dir: Directory for caching
+            corpus_index: Shared corpus index (see ``Retriever``)
+            bm25_index: Lexical index (creates empty index if None)
+            rrf_k: RRF damping constant; larger values flatten rank differences
+            candidates: Minimum candidates taken from each ranking before fusion
+            prefilter_papers: When more papers than this are indexed, vector search
+                only considers the this many best lexical matches (None = never)
+        """
+        super().__init__(
+            embedder=embedder,
+            vector_store=vector_store,
+            cache_dir=cache_dir,
+            corpus_index=corpus_index,
+        )
+        self.bm25_index = bm25_index or BM25Index()
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        self.prefilter_papers = prefilter_papers
+
+    async def _index_chunks(self, chunks: list[TextChunk]):
+        """Index chunks in both the vector store and the BM25 index.
+
+        Args:
+            chunks: Chunks to index
+        """
+        await super()._index_chunks(chunks)
+        self.bm25_index.add_batch(chunks)
+
+    def _prefilter(self, lexical_scores: dict[str, float]) -> Optional[set[str]]:
+        """Pick the papers vector search is restricted to.
+
+        Args:
+            lexical_scores: BM25 scores of the candidate chunks
+
+        Returns:
+            Paper IDs to search, or None to search without restriction
+        """
+        if self.prefilter_papers is None or self.bm25_index.paper_count <= self.prefilter_papers:
+            return None
+
+        paper_scores: dict[str, float] = defaultdict(float)
+        for chunk_id, score in lexical_scores.items():
+            paper_id = self.bm25_index.chunks[chunk_id].paper_id
+            paper_scores[paper_id] = max(paper_scores[paper_id], score)
+
+        if len(paper_scores) <= self.prefilter_papers:
+            # Too few lexical matches to narrow safely; fall back to full search
+            return None
+
+        ranked = sorted(paper_scores, key=paper_scores.__getitem__, reverse=True)
+        return set(ranked[: self.prefilter_papers])
+
+    def _fuse(self, *rankings: list[TextChunk]) -> list[tuple[TextChunk, float]]:
+        """Merge rankings with reciprocal-rank fusion.
+
+        Scores are normalized so a chunk ranked first by every list scores 1.0.
+
+        Args:
+            rankings: Chunk lists, best first
+
+        Returns:
+            List of (chunk, fused score) tuples, best first
+        """
+        fused: dict[str, float] = defaultdict(float)
+        chunks: dict[str, TextChunk] = {}
+        for ranking in rankings:
+            for rank, chunk in enumerate(ranking, start=1):
+                fused[chunk.chunk_id] += 1.0 / (self.rrf_k + rank)
+                chunks[chunk.chunk_id] = chunk
+
+        best = len(rankings) / (self.rrf_k + 1)
+        ordered = sorted(fused, key=fused.__getitem__, reverse=True)
+        return [(chunks[chunk_id], fused[chunk_id] / best) for chunk_id in ordered]
+
+    async def retrieve_many(self, queries: list[RetrievalQuery]) -> list[RetrievalResponse]:
+        """Retrieve relevant documents for several queries using hybrid search.
+
+        Query texts are embedded in one batched request. For each query BM25
+        runs first (with the chunk-type and paper filters applied before
+        scoring), optionally narrows the papers handed to vector search, and
+        the two rankings are fused. Result scores are normalized RRF scores
+        in [0, 1], so ``min_score`` applies to the fused score.
+
+        Args:
+            queries: Retrieval queries
+
+        Returns:
+            One retrieval response per query, in order
+        """
+        if not queries:
+            return []
+
+        start_time = time.time()
+
+        query_vectors = await self.embedder.embed_texts([q.query_text for q in queries])
+        scope = self.paper_scope if self.corpus_index is not None else None
+
+        fused_results = []
+        for query, vector in zip(queries, query_vectors):
+            # Diversity keeps one chunk per paper, so fetch extra candidates
+            search_k = query.top_k * 3 if query.diversity_weight > 0.5 else query.top_k
+            search_k = max(search_k, self.candidates)
+            filters = {
+                "chunk_types": query.chunk_types,
+                "exclude_paper_ids": query.exclude_paper_ids,
+            }
+
+            lexical_scores = self.bm25_index.score(query.query_text, paper_ids=scope, **filters)
+            lexical = sorted(lexical_scores, key=lexical_scores.__getitem__, reverse=True)
+            lexical_chunks = [self.bm25_index.chunks[chunk_id] for chunk_id in lexical[:search_k]]
+
+            paper_ids = self._prefilter(lexical_scores)
+            if paper_ids is None:
+                paper_ids = scope
+            elif scope is not None:
+                paper_ids &= scope
+
+            if self.corpus_index is not None:
+                semantic = self.corpus_index.search(
+                    vector, top_k=search_k, paper_ids=paper_ids, **filters
+                )
+            else:
+                semantic = self.vector_store.search(
+                    vector, top_k=search_k, paper_ids=paper_ids, **filters
+                )
+
+            fused_results.append(self._fuse(lexical_chunks, [chunk for chunk, _ in semantic]))
+
+        elapsed_ms = int((time.time() - start_time) * 1000)
+
+        return [
+            self._build_response(query, fused, elapsed_ms)
+            for query, fused in zip(queries, fused_results)
+        ]
+
+    def save(self, save_dir: Optional[Union[Path, str]] = None):
+        """Save the vector store and the BM25 index side by side.
+
+        Args:
+            save_dir: Directory to save to (uses cache_dir if None)
+        """
+        save_dir = Path(save_dir) if save_dir else self.cache_dir / "retriever"
+        super().save(save_dir)
+        self.bm25_index.save(save_dir / "bm25")
+
+    @classmethod
+    def load(
+        cls, load_dir: Union[Path, str], cache_dir: str = ".arakis_cache"
+    ) -> "HybridRetriever":
+        """Load a saved hybrid retriever.
+
+        Args:
+            load_dir: Directory to load from
+            cache_dir: Cache directory for embedder
+
+        Returns:
+            Loaded retriever
+        """
+        retriever = super().load(load_dir, cache_dir=cache_dir)
+
+        bm25_dir = Path(load_dir) / "bm25"
+        if bm25_dir.exists():
+            retriever.bm25_index = BM25Index.load(bm25_dir)
+        else:
+            # Saved by a plain Retriever: rebuild the lexical index from the chunks
+            retriever.bm25_index.add_batch(retriever.vector_store.chunks.values())
+        return retriever
+
+    def get_stats(self) -> dict:
+        """Get retriever statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = super().get_stats()
+        stats["bm25"] = self.bm25_index.get_stats()
+        return stats
+
+    def clear(self):
+        """Clear the vector store scope and the BM25 index (keeps embedding cache)."""
+        super().clear()
+        self.bm25_index.clear()
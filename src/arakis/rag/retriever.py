@@ -9,12 +9,12 @@ from typing import Optional, Union
 
 from arakis.models.paper import Paper
 from arakis.models.rag import (
-    ChunkType,
     RetrievalQuery,
     RetrievalResponse,
     RetrievalResult,
     TextChunk,
 )
+from arakis.rag.corpus_index import CorpusIndex
 from arakis.rag.embedder import Embedder
 from arakis.rag.vector_store import VectorStore
 
@@ -27,6 +27,7 @@ class Retriever:
         embedder: Optional[Embedder] = None,
         vector_store: Optional[VectorStore] = None,
         cache_dir: str = ".arakis_cache",
+        corpus_index: Optional[CorpusIndex] = None,
     ):
         """Initialize the retriever.
 
@@ -34,10 +35,21 @@ class Retriever:
             embedder: Embedder instance (creates default if None)
             vector_store: Vector store instance (creates default if None)
             cache_dir: Directory for caching
+            corpus_index: Shared corpus index. When given, papers are indexed into
+                the corpus (reusing existing embeddings) and retrieval is scoped to
+                the papers passed to ``index_papers``.
         """
         self.embedder = embedder or Embedder(cache_dir=cache_dir)
-        self.vector_store = vector_store or VectorStore(dimension=1536)
+        self.corpus_index = corpus_index
+        if corpus_index is not None:
+            self.vector_store = corpus_index.store
+        else:
+            self.vector_store = vector_store or VectorStore(
+                dimension=1536, index_type="auto", metric="cosine"
+            )
         self.cache_dir = Path(cache_dir)
+        # Papers this retriever may return when backed by the shared corpus
+        self.paper_scope: set[str] = set()
 
     async def index_papers(self, papers: list[Paper], show_progress: bool = False) -> int:
         """Index papers for retrieval.
@@ -58,11 +70,7 @@ class Retriever:
         if show_progress:
             print(f"Indexing {len(all_chunks)} chunks from {len(papers)} papers...")
 
-        # Embed chunks (with caching)
-        embeddings = await self.embedder.embed_chunks(all_chunks, use_cache=True)
-
-        # Add to vector store
-        self.vector_store.add_batch(all_chunks, embeddings)
+        await self._index_chunks(all_chunks)
 
         if show_progress:
             stats = self.embedder.get_cache_stats()
@@ -71,6 +79,23 @@ class Retriever:
 
         return len(all_chunks)
 
+    async def _index_chunks(self, chunks: list[TextChunk]):
+        """Embed chunks and add them to the vector store or shared corpus.
+
+        Args:
+            chunks: Chunks to index
+        """
+        if self.corpus_index is not None:
+            # Only chunks the corpus doesn't hold yet are embedded and appended
+            await self.corpus_index.index_chunks(chunks, self.embedder)
+            self.paper_scope.update(chunk.paper_id for chunk in chunks)
+        else:
+            # Embed chunks (with caching)
+            embeddings = await self.embedder.embed_chunks(chunks, use_cache=True)
+
+            # Add to vector store
+            self.vector_store.add_batch(chunks, embeddings)
+
     async def retrieve(self, query: RetrievalQuery) -> RetrievalResponse:
         """Retrieve relevant documents for a query.
 
@@ -80,37 +105,93 @@ class Retriever:
         Returns:
             Retrieval response with ranked results
         """
+        responses = await self.retrieve_many([query])
+        return responses[0]
+
+    async def retrieve_many(self, queries: list[RetrievalQuery]) -> list[RetrievalResponse]:
+        """Retrieve relevant documents for several queries at once.
+
+        All query texts are embedded in one batched (and cached) request, and
+        queries sharing the same filters are answered by a single matrix search.
+        Chunk-type and paper filters are applied inside the index, so no
+        candidates are wasted on filtered-out chunks.
+
+        Args:
+            queries: Retrieval queries
+
+        Returns:
+            One retrieval response per query, in order
+        """
+        if not queries:
+            return []
+
         start_time = time.time()
 
-        # Embed the query
-        query_chunk = TextChunk(
-            paper_id="query",
-            chunk_type=ChunkType.ABSTRACT,
-            text=query.query_text,
-        )
-        query_embedding = await self.embedder.embed_chunk(query_chunk, use_cache=False)
+        # Embed all queries in one request
+        query_vectors = await self.embedder.embed_texts([q.query_text for q in queries])
+
+        # Group queries with identical filters so each group is one FAISS call
+        groups: dict[tuple, list[int]] = {}
+        for i, query in enumerate(queries):
+            chunk_types = tuple(sorted(t.value for t in query.chunk_types or []))
+            key = (chunk_types, tuple(sorted(query.exclude_paper_ids)))
+            groups.setdefault(key, []).append(i)
+
+        raw_results: list[list[tuple[TextChunk, float]]] = [[] for _ in queries]
+        for indices in groups.values():
+            first = queries[indices[0]]
+            # Diversity keeps one chunk per paper, so fetch extra candidates
+            search_k = max(
+                queries[i].top_k * 3 if queries[i].diversity_weight > 0.5 else queries[i].top_k
+                for i in indices
+            )
+            filters = {
+                "top_k": search_k,
+                "chunk_types": first.chunk_types,
+                "exclude_paper_ids": first.exclude_paper_ids,
+            }
+            vectors = [query_vectors[i] for i in indices]
+            if self.corpus_index is not None:
+                group_results = self.corpus_index.search_batch(
+                    vectors, paper_ids=self.paper_scope, **filters
+                )
+            else:
+                group_results = self.vector_store.search_batch(vectors, **filters)
+            for i, results in zip(indices, group_results):
+                raw_results[i] = results
 
-        # Search vector store
-        # Note: We search for more than top_k to allow filtering
-        search_k = query.top_k * 3 if query.chunk_types or query.exclude_paper_ids else query.top_k
-        raw_results = self.vector_store.search(query_embedding.vector, top_k=search_k)
+        elapsed_ms = int((time.time() - start_time) * 1000)
 
-        # Convert distances to similarity scores (inverse of L2 distance)
-        # For L2 distance, closer = lower distance, so we use 1/(1+distance)
-        results = []
-        seen_papers = set()
+        # Convert distances to similarity scores (higher = more similar)
+        return [
+            self._build_response(
+                query,
+                [(chunk, self.vector_store.similarity(distance)) for chunk, distance in raw],
+                elapsed_ms,
+            )
+            for query, raw in zip(queries, raw_results)
+        ]
 
-        for chunk, distance in raw_results:
-            # Apply filters
-            if query.chunk_types and chunk.chunk_type not in query.chunk_types:
-                continue
+    def _build_response(
+        self,
+        query: RetrievalQuery,
+        scored_results: list[tuple[TextChunk, float]],
+        elapsed_ms: int,
+    ) -> RetrievalResponse:
+        """Filter, diversify and truncate ranked search results for one query.
 
-            if chunk.paper_id in query.exclude_paper_ids:
-                continue
+        Args:
+            query: Retrieval query
+            scored_results: (chunk, score) tuples, best first
+            elapsed_ms: Search time to report
 
-            # Convert distance to similarity score (0-1, higher = more similar)
-            score = 1.0 / (1.0 + distance)
+        Returns:
+            Retrieval response with ranked results
+        """
+        results = []
+        seen_papers = set()
 
+        for chunk, score in scored_results:
             # Apply minimum score filter
             if query.min_score is not None and score < query.min_score:
                 continue
@@ -133,12 +214,10 @@ class Retriever:
             if len(results) >= query.top_k:
                 break
 
-        elapsed_ms = int((time.time() - start_time) * 1000)
-
         return RetrievalResponse(
             query=query,
             results=results,
-            total_candidates=len(raw_results),
+            total_candidates=len(scored_results),
             search_time_ms=elapsed_ms,
             model_used=self.embedder.model,
         )
@@ -217,5 +296,12 @@ class Retriever:
         }
 
     def clear(self):
-        """Clear the vector store (keeps embedding cache)."""
-        self.vector_store.clear()
+        """Clear the vector store (keeps embedding cache).
+
+        For a corpus-backed retriever only the paper scope is cleared; the
+        shared corpus is left intact for other workflows.
+        """
+        if self.corpus_index is not None:
+            self.paper_scope.clear()
+        else:
+            self.vector_store.clear()
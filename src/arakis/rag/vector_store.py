@@ -1,47 +1,240 @@
 """Vector store for embeddings using FAISS.
 
 Stores and searches embedding vectors efficiently.
+
+Index types:
+
+- ``flat``: exact search
+- ``hnsw``: graph-based approximate search (tunable via ``ef_search``)
+- ``ivf``: inverted file index (tunable via ``nprobe``)
+- ``ivfpq``: inverted file with product quantization, for very large corpora;
+  candidates are re-ranked exactly (``pq_refine``) because PQ distances alone
+  lose too much recall
+- ``auto``: starts exact and upgrades to HNSW, then IVF-PQ as the corpus grows
+
+IVF-based indexes are trained lazily: vectors are kept in an exact index
+until enough exist to train the quantizers, then the index is rebuilt.
 """
 
 import json
+import math
 import pickle
+from collections import defaultdict
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, Optional, Union
 
 import faiss
 import numpy as np
 
-from arakis.models.rag import Embedding, TextChunk
+from arakis.models.rag import ChunkType, Embedding, TextChunk
+
+INDEX_TYPES = ("flat", "hnsw", "ivf", "ivfpq", "auto")
+METRICS = ("l2", "cosine")
+
+# Physical index types ordered by scale; a store only ever upgrades along this order
+_INDEX_RANK = {"flat": 0, "hnsw": 1, "ivf": 2, "ivfpq": 3}
+
+# FAISS k-means wants ~39 points per centroid; PQ uses 256 centroids per sub-quantizer
+_MIN_POINTS_PER_CENTROID = 39
+_PQ_CENTROIDS = 256
 
 
 class VectorStore:
     """FAISS-based vector store for similarity search."""
 
-    def __init__(self, dimension: int = 1536, index_type: str = "flat"):
+    # Corpus sizes at which index_type="auto" switches index
+    AUTO_HNSW_MIN_VECTORS = 10_000
+    AUTO_IVFPQ_MIN_VECTORS = 200_000
+
+    def __init__(
+        self,
+        dimension: int = 1536,
+        index_type: str = "flat",
+        metric: str = "l2",
+        nlist: Optional[int] = None,
+        nprobe: int = 16,
+        ef_search: int = 64,
+        hnsw_m: int = 32,
+        pq_refine: int = 4,
+    ):
         """Initialize the vector store.
 
         Args:
             dimension: Dimension of embedding vectors (1536 for text-embedding-3-small)
-            index_type: Type of FAISS index ('flat' for exact search, 'ivf' for approximate)
+            index_type: 'flat', 'hnsw', 'ivf', 'ivfpq' or 'auto' (chosen by corpus size)
+            metric: 'l2' (Euclidean distance) or 'cosine' (inner product on normalized vectors)
+            nlist: Number of IVF lists (None = 100 for 'ivf', sqrt-scaled for 'ivfpq')
+            nprobe: IVF lists visited per query (higher = better recall, slower)
+            ef_search: HNSW candidate list size per query (higher = better recall, slower)
+            hnsw_m: HNSW graph degree
+            pq_refine: For IVF-PQ, re-rank ``top_k * pq_refine`` candidates with exact
+                vectors (0 = PQ codes only, smallest memory footprint)
         """
-        self.dimension = dimension
-        self.index_type = index_type
-
-        # Initialize FAISS index
-        if index_type == "flat":
-            # Exact search (L2 distance)
-            self.index = faiss.IndexFlatL2(dimension)
-        elif index_type == "ivf":
-            # Approximate search with inverted file index
-            quantizer = faiss.IndexFlatL2(dimension)
-            self.index = faiss.IndexIVFFlat(quantizer, dimension, 100)
-        else:
+        if index_type not in INDEX_TYPES:
             raise ValueError(f"Unknown index type: {index_type}")
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
 
+        self.dimension = dimension
+        self.index_type = index_type
+        self.metric = metric
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.hnsw_m = hnsw_m
+        self.pq_refine = pq_refine
+
+        # Physical FAISS index currently in use (differs from index_type for 'auto'
+        # and while IVF indexes wait for enough training vectors)
+        self.active_type = "hnsw" if index_type == "hnsw" else "flat"
+        self.index = self._create_index(self.active_type)
+
+        self._reset_metadata()
+
+    def _reset_metadata(self):
+        """Drop all chunk metadata and position bookkeeping."""
         # Store metadata (chunk_id -> TextChunk)
         self.chunks: dict[str, TextChunk] = {}
         # Map index position to chunk_id
         self.id_map: list[str] = []
+        # Index positions that were removed but are still physically in the FAISS index
+        self.tombstones: set[int] = set()
+        # Live index position for each chunk_id
+        self._positions: dict[str, int] = {}
+        # Live positions partitioned by paper and by chunk type; metadata filters
+        # are applied inside FAISS through ID selectors built from these
+        self._paper_positions: dict[str, set[int]] = defaultdict(set)
+        self._type_positions: dict[ChunkType, set[int]] = defaultdict(set)
+
+    def _track(self, chunk: TextChunk, position: int):
+        """Register a live chunk at an index position."""
+        self.chunks[chunk.chunk_id] = chunk
+        self._positions[chunk.chunk_id] = position
+        self._paper_positions[chunk.paper_id].add(position)
+        self._type_positions[chunk.chunk_type].add(position)
+
+    def _untrack(self, chunk_id: str):
+        """Tombstone a live chunk's position and drop its metadata."""
+        chunk = self.chunks.pop(chunk_id)
+        position = self._positions.pop(chunk_id)
+        self.tombstones.add(position)
+        self._paper_positions[chunk.paper_id].discard(position)
+        if not self._paper_positions[chunk.paper_id]:
+            del self._paper_positions[chunk.paper_id]
+        self._type_positions[chunk.chunk_type].discard(position)
+
+    # ------------------------------------------------------------------
+    # Index construction
+    # ------------------------------------------------------------------
+
+    @property
+    def _faiss_metric(self) -> int:
+        return faiss.METRIC_INNER_PRODUCT if self.metric == "cosine" else faiss.METRIC_L2
+
+    def _flat_index(self) -> faiss.Index:
+        if self.metric == "cosine":
+            return faiss.IndexFlatIP(self.dimension)
+        return faiss.IndexFlatL2(self.dimension)
+
+    def _pq_subquantizers(self) -> int:
+        """Largest divisor of the dimension giving >= 8 dimensions per sub-quantizer."""
+        for m in range(max(1, self.dimension // 8), 0, -1):
+            if self.dimension % m == 0:
+                return m
+        return 1
+
+    def _nlist_for(self, kind: str, n: int) -> int:
+        """Number of IVF lists to use when training on ``n`` vectors."""
+        if self.nlist:
+            return self.nlist
+        if kind == "ivf":
+            return 100
+        return max(1, min(int(4 * math.sqrt(n)), n // _MIN_POINTS_PER_CENTROID))
+
+    def _train_threshold(self, kind: str) -> int:
+        """Minimum vectors needed before an IVF index of ``kind`` is trained."""
+        if kind == "ivf":
+            return _MIN_POINTS_PER_CENTROID * self._nlist_for("ivf", 0)
+        threshold = _MIN_POINTS_PER_CENTROID * _PQ_CENTROIDS
+        if self.nlist:
+            threshold = max(threshold, _MIN_POINTS_PER_CENTROID * self.nlist)
+        return threshold
+
+    def _create_index(self, kind: str, n: int = 0) -> faiss.Index:
+        """Create an empty FAISS index of the given physical type."""
+        if kind == "flat":
+            return self._flat_index()
+        if kind == "hnsw":
+            index = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, self._faiss_metric)
+            index.hnsw.efConstruction = max(40, 2 * self.hnsw_m)
+            index.hnsw.efSearch = self.ef_search
+            return index
+
+        quantizer = self._flat_index()
+        nlist = self._nlist_for(kind, n)
+        if kind == "ivf":
+            index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist, self._faiss_metric)
+            index.nprobe = self.nprobe
+            return index
+
+        index = faiss.IndexIVFPQ(
+            quantizer, self.dimension, nlist, self._pq_subquantizers(), 8, self._faiss_metric
+        )
+        index.nprobe = self.nprobe
+        if self.pq_refine:
+            index = faiss.IndexRefineFlat(index)
+            index.k_factor = self.pq_refine
+        return index
+
+    def _ivf_index(self) -> Optional[faiss.Index]:
+        """The underlying IVF index, unwrapping the IVF-PQ refine stage."""
+        if self.active_type not in ("ivf", "ivfpq"):
+            return None
+        if isinstance(self.index, faiss.IndexRefine):
+            return faiss.downcast_index(self.index.base_index)
+        return self.index
+
+    def _target_type(self, n: int) -> str:
+        """Physical index type appropriate for ``n`` stored vectors."""
+        if self.index_type == "auto":
+            if n >= self.AUTO_IVFPQ_MIN_VECTORS:
+                return "ivfpq"
+            if n >= self.AUTO_HNSW_MIN_VECTORS:
+                return "hnsw"
+            return "flat"
+        if self.index_type in ("ivf", "ivfpq"):
+            return self.index_type if n >= self._train_threshold(self.index_type) else "flat"
+        return self.index_type
+
+    def _reconstruct_all(self) -> np.ndarray:
+        """Return every stored vector (including tombstoned ones) in position order."""
+        if self.index.ntotal == 0:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        if self.active_type in ("ivf", "ivfpq") and not isinstance(self.index, faiss.IndexRefine):
+            self.index.make_direct_map()
+        return self.index.reconstruct_n(0, self.index.ntotal)
+
+    def _rebuild(self, kind: str):
+        """Move all vectors into a new index of ``kind``, keeping positions stable."""
+        vectors = self._reconstruct_all()
+        index = self._create_index(kind, len(vectors))
+        if not index.is_trained:
+            index.train(vectors)
+        index.add(vectors)
+        self.index = index
+        self.active_type = kind
+
+    def _prepare(self, vectors: Union[np.ndarray, list[list[float]]]) -> np.ndarray:
+        """Convert to a contiguous float32 array, normalized for cosine search."""
+        array = np.array(vectors, dtype=np.float32)
+        if self.metric == "cosine":
+            faiss.normalize_L2(array)
+        return array
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
 
     def add(self, chunk: TextChunk, embedding: Embedding):
         """Add a single embedding to the store.
@@ -65,51 +258,184 @@ class VectorStore:
         # Convert to numpy array
         vectors = np.array([emb.vector for emb in embeddings], dtype=np.float32)
 
-        # Train index if needed (for IVF)
-        if self.index_type == "ivf" and not self.index.is_trained:
-            self.index.train(vectors)
+        self.add_vectors(chunks, vectors)
+
+    def add_vectors(self, chunks: list[TextChunk], vectors: np.ndarray):
+        """Add chunks with a pre-built vector matrix.
+
+        Bulk path used when vectors already live in a NumPy array (for example a
+        memory-mapped file), avoiding the per-vector ``Embedding`` round trip.
+        Re-adding an existing chunk_id tombstones its previous vector.
+
+        Args:
+            chunks: List of text chunks
+            vectors: Array of shape (len(chunks), dimension)
+        """
+        if len(chunks) != len(vectors):
+            raise ValueError("Number of chunks and embeddings must match")
+        if len(chunks) == 0:
+            return
+
+        self.index.add(self._prepare(vectors))
 
-        # Add to index
-        self.index.add(vectors)
+        # Switch index once the corpus outgrows the current one (or IVF can be trained)
+        target = self._target_type(self.index.ntotal)
+        if _INDEX_RANK[target] > _INDEX_RANK[self.active_type]:
+            self._rebuild(target)
 
         # Store metadata
         for chunk in chunks:
-            self.chunks[chunk.chunk_id] = chunk
+            if chunk.chunk_id in self._positions:
+                self._untrack(chunk.chunk_id)
+            self._track(chunk, len(self.id_map))
             self.id_map.append(chunk.chunk_id)
 
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """Tune the recall/latency trade-off of approximate indexes.
+
+        Args:
+            nprobe: IVF lists visited per query
+            ef_search: HNSW candidate list size per query
+        """
+        if nprobe is not None:
+            self.nprobe = nprobe
+            ivf_index = self._ivf_index()
+            if ivf_index is not None:
+                ivf_index.nprobe = nprobe
+        if ef_search is not None:
+            self.ef_search = ef_search
+            if self.active_type == "hnsw":
+                self.index.hnsw.efSearch = ef_search
+
+    def _search_params(self, selector: Optional[Any]) -> Optional[Any]:
+        """Build per-query FAISS search parameters for the active index."""
+        if self.active_type in ("ivf", "ivfpq"):
+            params = faiss.SearchParametersIVF(nprobe=self.nprobe)
+        elif self.active_type == "hnsw":
+            params = faiss.SearchParametersHNSW(efSearch=self.ef_search)
+        elif selector is not None:
+            params = faiss.SearchParameters()
+        else:
+            return None
+        if selector is not None:
+            params.sel = selector
+
+        if isinstance(self.index, faiss.IndexRefine):
+            base_params = params
+            params = faiss.IndexRefineSearchParameters(
+                k_factor=self.pq_refine, base_index_params=base_params
+            )
+            # The refine parameters do not own the base parameters
+            params.referenced = base_params
+        return params
+
+    def similarity(self, distance: float) -> float:
+        """Convert a distance returned by ``search`` to a similarity score.
+
+        Args:
+            distance: Distance from ``search`` (lower = more similar)
+
+        Returns:
+            Cosine similarity for 'cosine', 1/(1+d) for 'l2' (higher = more similar)
+        """
+        if self.metric == "cosine":
+            return 1.0 - distance
+        return 1.0 / (1.0 + distance)
+
     def search(
-        self, query_vector: list[float], top_k: int = 10, min_distance: Optional[float] = None
+        self,
+        query_vector: list[float],
+        top_k: int = 10,
+        min_distance: Optional[float] = None,
+        paper_ids: Optional[Iterable[str]] = None,
+        chunk_types: Optional[Iterable[ChunkType]] = None,
+        exclude_paper_ids: Optional[Iterable[str]] = None,
     ) -> list[tuple[TextChunk, float]]:
         """Search for similar vectors.
 
+        Tombstoned vectors are never returned. For the 'cosine' metric the
+        distance is ``1 - cosine_similarity``.
+
         Args:
             query_vector: Query embedding vector
             top_k: Number of results to return
             min_distance: Minimum distance threshold (filter out results with distance > threshold)
+            paper_ids: Restrict results to chunks of these papers (None = all papers)
+            chunk_types: Restrict results to these chunk types (None = all types)
+            exclude_paper_ids: Never return chunks of these papers
 
         Returns:
             List of (chunk, distance) tuples, sorted by distance (lower = more similar)
         """
+        return self.search_batch(
+            [query_vector],
+            top_k=top_k,
+            min_distance=min_distance,
+            paper_ids=paper_ids,
+            chunk_types=chunk_types,
+            exclude_paper_ids=exclude_paper_ids,
+        )[0]
+
+    def search_batch(
+        self,
+        query_vectors: Union[np.ndarray, list[list[float]]],
+        top_k: int = 10,
+        min_distance: Optional[float] = None,
+        paper_ids: Optional[Iterable[str]] = None,
+        chunk_types: Optional[Iterable[ChunkType]] = None,
+        exclude_paper_ids: Optional[Iterable[str]] = None,
+    ) -> list[list[tuple[TextChunk, float]]]:
+        """Search for many query vectors with a single FAISS call.
+
+        Metadata filters are applied inside FAISS, so each query gets up to
+        ``top_k`` matching results without over-fetching.
+
+        Args:
+            query_vectors: Query embedding vectors, one per row
+            top_k: Number of results to return per query
+            min_distance: Minimum distance threshold (filter out results with distance > threshold)
+            paper_ids: Restrict results to chunks of these papers (None = all papers)
+            chunk_types: Restrict results to these chunk types (None = all types)
+            exclude_paper_ids: Never return chunks of these papers
+
+        Returns:
+            One list of (chunk, distance) tuples per query, sorted by distance
+        """
         # Convert to numpy
-        query = np.array([query_vector], dtype=np.float32)
+        queries = self._prepare(query_vectors)
 
-        # Search
-        distances, indices = self.index.search(query, top_k)
+        # Search (the selector must stay referenced until FAISS returns)
+        selector = self._build_selector(paper_ids, chunk_types, exclude_paper_ids)
+        params = self._search_params(selector)
+        if params is None:
+            distances, indices = self.index.search(queries, top_k)
+        else:
+            distances, indices = self.index.search(queries, top_k, params=params)
+
+        if self.metric == "cosine":
+            distances = 1.0 - distances
 
         # Convert to results
-        results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx == -1:  # FAISS uses -1 for empty slots
-                continue
+        all_results = []
+        for row_distances, row_indices in zip(distances, indices):
+            results = []
+            for dist, idx in zip(row_distances, row_indices):
+                if idx == -1:  # FAISS uses -1 for empty slots
+                    continue
 
-            if min_distance is not None and dist > min_distance:
-                continue
+                if min_distance is not None and dist > min_distance:
+                    continue
 
-            chunk_id = self.id_map[idx]
-            chunk = self.chunks[chunk_id]
-            results.append((chunk, float(dist)))
+                chunk_id = self.id_map[idx]
+                chunk = self.chunks[chunk_id]
+                results.append((chunk, float(dist)))
+            all_results.append(results)
 
-        return results
+        return all_results
 
     def get_chunk(self, chunk_id: str) -> Optional[TextChunk]:
         """Get chunk by ID.
@@ -122,17 +448,112 @@ class VectorStore:
         """
         return self.chunks.get(chunk_id)
 
+    def _build_selector(
+        self,
+        paper_ids: Optional[Iterable[str]] = None,
+        chunk_types: Optional[Iterable[ChunkType]] = None,
+        exclude_paper_ids: Optional[Iterable[str]] = None,
+    ) -> Optional[Any]:
+        """Build a FAISS ID selector from the metadata partitions.
+
+        Tombstoned positions are always excluded.
+
+        Args:
+            paper_ids: Papers to restrict the search to (None = all papers)
+            chunk_types: Chunk types to restrict the search to (None = all types)
+            exclude_paper_ids: Papers to leave out
+
+        Returns:
+            FAISS IDSelector, or None if every vector is searchable
+        """
+        include: Optional[set[int]] = None
+        if paper_ids is not None:
+            include = set().union(*(self._paper_positions.get(p, ()) for p in set(paper_ids)))
+        if chunk_types:
+            typed = set().union(*(self._type_positions.get(t, ()) for t in set(chunk_types)))
+            include = typed if include is None else include & typed
+
+        excluded = set().union(*(self._paper_positions.get(p, ()) for p in exclude_paper_ids or ()))
+
+        if include is not None:
+            allowed = np.fromiter(sorted(include - excluded), dtype=np.int64)
+            return faiss.IDSelectorBatch(allowed)
+
+        hidden = self.tombstones | excluded
+        if hidden:
+            deleted = faiss.IDSelectorBatch(np.fromiter(sorted(hidden), dtype=np.int64))
+            selector = faiss.IDSelectorNot(deleted)
+            # IDSelectorNot does not own the wrapped selector
+            selector.referenced = deleted
+            return selector
+
+        return None
+
+    # ------------------------------------------------------------------
+    # Removal
+    # ------------------------------------------------------------------
+
     def remove(self, chunk_id: str):
         """Remove a chunk from the store.
 
-        Note: FAISS doesn't support efficient removal, so this only removes from metadata.
-        Consider rebuilding the index if you need to remove many items.
+        FAISS doesn't support efficient removal, so the vector is tombstoned and
+        skipped at search time. Call ``compact()`` to physically drop tombstoned
+        vectors once enough of them accumulate.
 
         Args:
             chunk_id: Chunk identifier to remove
         """
         if chunk_id in self.chunks:
-            del self.chunks[chunk_id]
+            self._untrack(chunk_id)
+
+    def remove_paper(self, paper_id: str) -> int:
+        """Remove every chunk belonging to a paper.
+
+        Args:
+            paper_id: Paper identifier
+
+        Returns:
+            Number of chunks removed
+        """
+        positions = self._paper_positions.get(paper_id, ())
+        chunk_ids = [self.id_map[pos] for pos in positions]
+        for chunk_id in chunk_ids:
+            self.remove(chunk_id)
+        return len(chunk_ids)
+
+    @property
+    def tombstone_ratio(self) -> float:
+        """Fraction of physical vectors that are tombstoned."""
+        if not self.id_map:
+            return 0.0
+        return len(self.tombstones) / len(self.id_map)
+
+    def compact(self) -> int:
+        """Rebuild the FAISS index without tombstoned vectors.
+
+        Trained quantizers are kept, so IVF indexes are not retrained.
+
+        Returns:
+            Number of vectors dropped
+        """
+        if not self.tombstones:
+            return 0
+
+        dropped = len(self.tombstones)
+        live = [pos for pos in range(len(self.id_map)) if pos not in self.tombstones]
+
+        vectors = self._reconstruct_all()[live]
+        chunks = [self.chunks[self.id_map[pos]] for pos in live]
+
+        self.index.reset()
+        self._reset_metadata()
+        self.add_vectors(chunks, vectors)
+
+        return dropped
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
 
     def save(self, save_dir: Union[Path, str]):
         """Save the vector store to disk.
@@ -153,10 +574,20 @@ class VectorStore:
         with open(save_dir / "id_map.json", "w") as f:
             json.dump(self.id_map, f)
 
+        with open(save_dir / "tombstones.json", "w") as f:
+            json.dump(sorted(self.tombstones), f)
+
         # Save config
         config = {
             "dimension": self.dimension,
             "index_type": self.index_type,
+            "active_type": self.active_type,
+            "metric": self.metric,
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "ef_search": self.ef_search,
+            "hnsw_m": self.hnsw_m,
+            "pq_refine": self.pq_refine,
             "total_vectors": len(self.id_map),
         }
         with open(save_dir / "config.json", "w") as f:
@@ -179,36 +610,56 @@ class VectorStore:
             config = json.load(f)
 
         # Create instance
-        store = cls(dimension=config["dimension"], index_type=config["index_type"])
-
-        # Load FAISS index
+        store = cls(
+            dimension=config["dimension"],
+            index_type=config["index_type"],
+            metric=config.get("metric", "l2"),
+            nlist=config.get("nlist"),
+            nprobe=config.get("nprobe", 16),
+            ef_search=config.get("ef_search", 64),
+            hnsw_m=config.get("hnsw_m", 32),
+            pq_refine=config.get("pq_refine", 4),
+        )
+
+        # Load FAISS index (stores saved before auto-selection trained IVF eagerly)
         store.index = faiss.read_index(str(load_dir / "faiss.index"))
+        store.active_type = config.get("active_type", config["index_type"])
 
         # Load metadata
         with open(load_dir / "chunks.pkl", "rb") as f:
-            store.chunks = pickle.load(f)
+            chunks = pickle.load(f)
 
         with open(load_dir / "id_map.json") as f:
             store.id_map = json.load(f)
 
+        tombstones_path = load_dir / "tombstones.json"
+        if tombstones_path.exists():
+            with open(tombstones_path) as f:
+                store.tombstones = set(json.load(f))
+
+        # Stores saved before tombstoning only dropped metadata on removal
+        for pos, chunk_id in enumerate(store.id_map):
+            if chunk_id not in chunks or pos in store.tombstones:
+                store.tombstones.add(pos)
+                continue
+            if chunk_id in store._positions:
+                store._untrack(chunk_id)
+            store._track(chunks[chunk_id], pos)
+
         return store
 
     def clear(self):
         """Clear all vectors and metadata from the store."""
         # Reset index
-        if self.index_type == "flat":
-            self.index = faiss.IndexFlatL2(self.dimension)
-        elif self.index_type == "ivf":
-            quantizer = faiss.IndexFlatL2(self.dimension)
-            self.index = faiss.IndexIVFFlat(quantizer, self.dimension, 100)
+        self.active_type = "hnsw" if self.index_type == "hnsw" else "flat"
+        self.index = self._create_index(self.active_type)
 
-        self.chunks = {}
-        self.id_map = []
+        self._reset_metadata()
 
     @property
     def size(self) -> int:
-        """Number of vectors in the store."""
-        return len(self.id_map)
+        """Number of live (non-tombstoned) vectors in the store."""
+        return len(self.id_map) - len(self.tombstones)
 
     def get_stats(self) -> dict[str, Any]:
         """Get statistics about the vector store.
@@ -220,6 +671,9 @@ class VectorStore:
             "total_vectors": self.size,
             "dimension": self.dimension,
             "index_type": self.index_type,
-            "is_trained": self.index.is_trained if self.index_type == "ivf" else True,
+            "active_index_type": self.active_type,
+            "metric": self.metric,
+            "is_trained": self.index.is_trained,
+            "tombstones": len(self.tombstones),
             "unique_papers": len(set(chunk.paper_id for chunk in self.chunks.values())),
         }
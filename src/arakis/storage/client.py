@@ -15,6 +15,9 @@ from botocore.exceptions import ClientError, NoCredentialsError
 
 from arakis.config import get_settings
 
+# Cache policy for objects whose key changes whenever their content does
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
 
 @dataclass
 class StorageResult:
@@ -173,6 +176,7 @@ class StorageClient:
         key: str,
         content_type: str = "application/pdf",
         metadata: dict | None = None,
+        cache_control: str | None = None,
     ) -> StorageResult:
         """
         Upload bytes to storage.
@@ -182,6 +186,7 @@ class StorageClient:
             key: Storage key/path
             content_type: MIME type
             metadata: Optional metadata dict
+            cache_control: Optional Cache-Control header stored with the object
 
         Returns:
             StorageResult with success status and URL
@@ -196,6 +201,8 @@ class StorageClient:
             extra_args: dict[str, Any] = {"ContentType": content_type}
             if metadata:
                 extra_args["Metadata"] = metadata
+            if cache_control:
+                extra_args["CacheControl"] = cache_control
 
             self.client.upload_fileobj(
                 io.BytesIO(data),
@@ -422,13 +429,65 @@ class StorageClient:
                 error=str(e),
             )
 
-    def get_presigned_url(self, key: str, expires_in: int = 3600) -> str | None:
+    def open_object(
+        self, key: str, byte_range: str | None = None
+    ) -> tuple[dict[str, Any] | None, StorageResult]:
+        """
+        Open an object for streaming without reading it into memory.
+
+        Args:
+            key: Storage key/path
+            byte_range: Optional HTTP Range header value (e.g. "bytes=0-1023")
+
+        Returns:
+            Tuple of (get_object response or None, StorageResult). The response's
+            "Body" is a streaming body the caller must read and close.
+        """
+        if not self.is_configured:
+            return None, StorageResult(
+                success=False,
+                error="Storage not configured",
+            )
+
+        params: dict[str, Any] = {"Bucket": self.bucket_name, "Key": key}
+        if byte_range:
+            params["Range"] = byte_range
+
+        try:
+            response = self.client.get_object(**params)
+            return response, StorageResult(
+                success=True,
+                key=key,
+                size_bytes=response.get("ContentLength"),
+            )
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            return None, StorageResult(
+                success=False,
+                key=key,
+                error=error_code,
+            )
+        except Exception as e:
+            return None, StorageResult(
+                success=False,
+                key=key,
+                error=str(e),
+            )
+
+    def get_presigned_url(
+        self,
+        key: str,
+        expires_in: int = 3600,
+        response_headers: dict[str, str] | None = None,
+    ) -> str | None:
         """
         Generate a presigned URL for temporary access.
 
         Args:
             key: Storage key/path
             expires_in: URL validity in seconds (default: 1 hour)
+            response_headers: Optional response header overrides signed into the
+                URL (e.g. {"ResponseCacheControl": "max-age=60"})
 
         Returns:
             Presigned URL or None if failed
@@ -439,7 +498,7 @@ class StorageClient:
         try:
             url = self.client.generate_presigned_url(
                 "get_object",
-                Params={"Bucket": self.bucket_name, "Key": key},
+                Params={"Bucket": self.bucket_name, "Key": key, **(response_headers or {})},
                 ExpiresIn=expires_in,
             )
             return url
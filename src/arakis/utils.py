@@ -4,7 +4,7 @@ import asyncio
 import random
 import time
 from collections.abc import Awaitable
-from functools import wraps
+from functools import cache, wraps
 from typing import Any, Callable, TypeVar
 
 import httpx
@@ -69,6 +69,24 @@ def get_openai_rate_limiter() -> RateLimiter:
     return _openai_rate_limiter
 
 
+@cache
+def get_token_encoding(name: str = "cl100k_base"):
+    """Get a shared tiktoken encoding.
+
+    Encodings are loaded once per process and shared by the embedder,
+    chunker and extraction agents instead of being rebuilt per call.
+
+    Args:
+        name: tiktoken encoding name
+
+    Returns:
+        tiktoken Encoding instance
+    """
+    import tiktoken
+
+    return tiktoken.get_encoding(name)
+
+
 def retry_http_request(
     max_retries: int = 3,
     initial_delay: float = 1.0,
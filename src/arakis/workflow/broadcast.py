@@ -0,0 +1,287 @@
+"""Pub/sub channel for live workflow progress.
+
+``ProgressTracker`` publishes every progress event here instead of writing it
+to the database; checkpoints are only persisted at phase boundaries. API
+processes subscribe per workflow and stream the events to clients over SSE.
+
+Two backends are available (``progress_backend`` setting):
+
+- ``memory``: in-process fan-out. Sufficient when the worker runs inside the
+  API process (``worker_inline``) or in the CLI.
+- ``redis``: events are published on a Redis channel per workflow and the
+  latest progress snapshot of each stage is kept in a Redis hash, so API
+  processes see progress from separate ``arakis worker`` processes.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per subscriber before it is considered lagging
+SUBSCRIBER_QUEUE_SIZE = 256
+
+_CHANNEL_PREFIX = "arakis:progress:"
+_SNAPSHOT_PREFIX = "arakis:progress-snapshot:"
+
+
+class Subscription:
+    """Stream of progress messages for one workflow.
+
+    Slow consumers do not block publishers: when the buffer is full, further
+    messages are dropped and ``lagged`` is set so the consumer can resync from
+    a snapshot.
+    """
+
+    def __init__(self, workflow_id: str, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.workflow_id = workflow_id
+        self.lagged = False
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, message: dict[str, Any]) -> None:
+        """Deliver a message without blocking."""
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict[str, Any]]:
+        """Wait for the next message.
+
+        Args:
+            timeout: Seconds to wait (None waits forever)
+
+        Returns:
+            The message, or None if the timeout expired
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self) -> None:
+        """Discard buffered messages and clear the lagged flag."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self.lagged = False
+
+
+class ProgressBroadcaster:
+    """In-process progress broadcaster."""
+
+    def __init__(self):
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+        self._snapshots: dict[str, dict[str, dict[str, Any]]] = defaultdict(dict)
+
+    async def publish(
+        self,
+        workflow_id: str,
+        stage: str,
+        message: dict[str, Any],
+        snapshot: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Publish a progress message to the workflow's subscribers.
+
+        Args:
+            workflow_id: Workflow the message belongs to
+            stage: Stage that produced the message
+            message: JSON-serializable message (usually an event plus changed fields)
+            snapshot: Full current progress of the stage, served to late subscribers
+        """
+        if snapshot is not None:
+            self._snapshots[workflow_id][stage] = snapshot
+        self._deliver(workflow_id, message)
+
+    async def snapshot(self, workflow_id: str) -> dict[str, dict[str, Any]]:
+        """Latest published progress of each stage of a workflow."""
+        return dict(self._snapshots.get(workflow_id, {}))
+
+    async def discard(self, workflow_id: str, stage: Optional[str] = None) -> None:
+        """Forget a stage's snapshot once it is persisted, or all of a workflow's.
+
+        Args:
+            workflow_id: Workflow ID
+            stage: Stage to forget (None forgets every stage)
+        """
+        if stage is None:
+            self._snapshots.pop(workflow_id, None)
+            return
+        snapshots = self._snapshots.get(workflow_id)
+        if snapshots is not None:
+            snapshots.pop(stage, None)
+            if not snapshots:
+                del self._snapshots[workflow_id]
+
+    @asynccontextmanager
+    async def subscribe(self, workflow_id: str) -> AsyncIterator[Subscription]:
+        """Subscribe to a workflow's progress messages for the duration of the block."""
+        subscription = Subscription(workflow_id)
+        self._subscribers[workflow_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(workflow_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[workflow_id]
+
+    def subscriber_count(self, workflow_id: str) -> int:
+        """Number of local subscribers of a workflow."""
+        return len(self._subscribers.get(workflow_id, ()))
+
+    def _deliver(self, workflow_id: str, message: dict[str, Any]) -> None:
+        for subscription in self._subscribers.get(workflow_id, ()):
+            subscription.put(message)
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class RedisProgressBroadcaster(ProgressBroadcaster):
+    """Redis-backed broadcaster for multi-process deployments.
+
+    Each process holds a single pattern subscription and fans messages out to
+    its local subscribers, so the number of Redis connections does not grow
+    with the number of connected clients.
+    """
+
+    def __init__(self, redis_url: str, snapshot_ttl: int = 3600):
+        """Initialize the broadcaster.
+
+        Args:
+            redis_url: Redis connection URL
+            snapshot_ttl: Seconds a stage snapshot survives without updates
+        """
+        super().__init__()
+        self.redis_url = redis_url
+        self.snapshot_ttl = snapshot_ttl
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def connect(self) -> bool:
+        """Connect to Redis. Returns True if successful."""
+        try:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self.redis_url, encoding="utf-8", decode_responses=True)
+            await self._redis.ping()
+            return True
+        except Exception as e:
+            logger.warning(f"[progress] Redis connection failed: {e}")
+            self._redis = None
+            return False
+
+    async def publish(
+        self,
+        workflow_id: str,
+        stage: str,
+        message: dict[str, Any],
+        snapshot: Optional[dict[str, Any]] = None,
+    ) -> None:
+        try:
+            pipe = self._redis.pipeline()
+            if snapshot is not None:
+                key = f"{_SNAPSHOT_PREFIX}{workflow_id}"
+                pipe.hset(key, stage, json.dumps(snapshot, default=str))
+                pipe.expire(key, self.snapshot_ttl)
+            pipe.publish(f"{_CHANNEL_PREFIX}{workflow_id}", json.dumps(message, default=str))
+            await pipe.execute()
+        except Exception as e:
+            # Progress is best-effort; never fail a stage over it
+            logger.warning(f"[progress] Failed to publish to Redis: {e}")
+
+    async def snapshot(self, workflow_id: str) -> dict[str, dict[str, Any]]:
+        try:
+            raw = await self._redis.hgetall(f"{_SNAPSHOT_PREFIX}{workflow_id}")
+        except Exception as e:
+            logger.warning(f"[progress] Failed to read snapshot from Redis: {e}")
+            return {}
+        return {stage: json.loads(data) for stage, data in raw.items()}
+
+    async def discard(self, workflow_id: str, stage: Optional[str] = None) -> None:
+        key = f"{_SNAPSHOT_PREFIX}{workflow_id}"
+        try:
+            if stage is None:
+                await self._redis.delete(key)
+            else:
+                await self._redis.hdel(key, stage)
+        except Exception as e:
+            logger.warning(f"[progress] Failed to clear snapshot in Redis: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, workflow_id: str) -> AsyncIterator[Subscription]:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        async with super().subscribe(workflow_id) as subscription:
+            yield subscription
+
+    async def _listen(self) -> None:
+        """Fan messages from Redis out to local subscribers."""
+        pubsub = self._redis.pubsub()
+        await pubsub.psubscribe(f"{_CHANNEL_PREFIX}*")
+        try:
+            while True:
+                try:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                except Exception as e:
+                    logger.warning(f"[progress] Redis subscription error: {e}")
+                    await asyncio.sleep(1.0)
+                    continue
+                if message is None:
+                    continue
+                workflow_id = message["channel"][len(_CHANNEL_PREFIX) :]
+                if workflow_id in self._subscribers:
+                    self._deliver(workflow_id, json.loads(message["data"]))
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+# Global broadcaster instance
+_broadcaster: Optional[ProgressBroadcaster] = None
+
+
+async def get_progress_broadcaster() -> ProgressBroadcaster:
+    """Get the process-wide progress broadcaster.
+
+    Uses Redis when ``progress_backend`` is ``redis`` and Redis is reachable,
+    otherwise the in-process broadcaster.
+    """
+    global _broadcaster
+    if _broadcaster is None:
+        from arakis.config import get_settings
+
+        settings = get_settings()
+        broadcaster: ProgressBroadcaster = ProgressBroadcaster()
+        if settings.progress_backend == "redis":
+            redis_broadcaster = RedisProgressBroadcaster(
+                settings.redis_url, snapshot_ttl=settings.progress_snapshot_ttl
+            )
+            if await redis_broadcaster.connect():
+                broadcaster = redis_broadcaster
+            else:
+                logger.warning("[progress] Falling back to in-process progress broadcaster")
+        _broadcaster = broadcaster
+    return _broadcaster
+
+
+async def shutdown_progress_broadcaster() -> None:
+    """Close the process-wide progress broadcaster."""
+    global _broadcaster
+    if _broadcaster is not None:
+        await _broadcaster.close()
+        _broadcaster = None
@@ -16,7 +16,7 @@ from typing import Any, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from arakis.config import ModeConfig, get_mode_config
+from arakis.config import ModeConfig, get_mode_config, get_settings
 from arakis.database.models import Workflow, WorkflowStageCheckpoint
 from arakis.workflow.stages import (
     AnalysisStageExecutor,
@@ -232,25 +232,14 @@ class WorkflowOrchestrator:
         Returns:
             StageResult from the stage execution
         """
-        if stage not in self.STAGE_ORDER:
-            raise ValueError(f"Invalid stage: {stage}")
+        await self.validate_rerun(workflow_id, stage)
 
         logger.info(f"[orchestrator] Re-running stage {stage} for workflow {workflow_id}")
 
         # Load workflow to get cost_mode
         workflow = await self._get_workflow(workflow_id)
         mode_config = get_mode_config(workflow.cost_mode)
-
-        # Validate dependencies are met
         stage_index = self.STAGE_ORDER.index(stage)
-        if stage_index > 0:
-            required_stages = self.STAGE_ORDER[:stage_index]
-            for req_stage in required_stages:
-                checkpoint = await self._get_checkpoint(workflow_id, req_stage)
-                if not checkpoint or checkpoint.status not in ("completed", "skipped"):
-                    raise ValueError(
-                        f"Cannot re-run {stage}: required stage {req_stage} is not completed"
-                    )
 
         # Load input data from previous stages
         input_data = await self._load_checkpoint_data(workflow_id, stage_index)
@@ -268,6 +257,26 @@ class WorkflowOrchestrator:
 
         return result
 
+    async def validate_rerun(self, workflow_id: str, stage: str) -> None:
+        """Check that a stage exists and all stages before it are completed.
+
+        Args:
+            workflow_id: The workflow ID
+            stage: Stage to re-run
+
+        Raises:
+            ValueError: If the stage is invalid or a required stage is not completed
+        """
+        if stage not in self.STAGE_ORDER:
+            raise ValueError(f"Invalid stage: {stage}")
+
+        for req_stage in self.STAGE_ORDER[: self.STAGE_ORDER.index(stage)]:
+            checkpoint = await self._get_checkpoint(workflow_id, req_stage)
+            if not checkpoint or checkpoint.status not in ("completed", "skipped"):
+                raise ValueError(
+                    f"Cannot re-run {stage}: required stage {req_stage} is not completed"
+                )
+
     async def resume_workflow(self, workflow_id: str) -> dict[str, Any]:
         """Resume a paused workflow from the last incomplete stage.
 
@@ -298,6 +307,48 @@ class WorkflowOrchestrator:
 
         return await self.execute_workflow(workflow_id, initial_data, start_from=last_stage)
 
+    async def continue_workflow(
+        self,
+        workflow_id: str,
+        initial_data: dict[str, Any],
+        skip_stages: Optional[list[str]] = None,
+    ) -> dict[str, Any]:
+        """Continue an interrupted run from its last completed checkpoint.
+
+        Used by workers that reclaim a job after the previous worker died:
+        completed stages are not re-executed.
+
+        Args:
+            workflow_id: The workflow ID
+            initial_data: Initial input data the run was started with
+            skip_stages: List of stages to skip (as in ``execute_workflow``)
+
+        Returns:
+            Workflow execution result
+        """
+        start_from = await self._find_resume_point(workflow_id)
+        if start_from is not None:
+            logger.info(f"[orchestrator] Continuing workflow {workflow_id} from '{start_from}'")
+            return await self.execute_workflow(
+                workflow_id, initial_data, start_from=start_from, skip_stages=skip_stages
+            )
+
+        # Every stage finished; only the final assembly may be missing
+        from arakis.database.models import Manuscript
+
+        accumulated_data = dict(initial_data)
+        accumulated_data.update(
+            await self._load_checkpoint_data(workflow_id, len(self.STAGE_ORDER))
+        )
+        result = await self.db.execute(
+            select(Manuscript.id).where(Manuscript.workflow_id == workflow_id)
+        )
+        if result.scalar_one_or_none() is None:
+            await self._assemble_manuscript(workflow_id, accumulated_data)
+        await self._update_workflow_status(workflow_id, "completed")
+
+        return {"status": "completed", "data": accumulated_data}
+
     async def get_stage_status(self, workflow_id: str) -> list[dict]:
         """Get status of all stages for a workflow.
 
@@ -553,3 +604,20 @@ class WorkflowOrchestrator:
         await self.db.commit()
 
         logger.info(f"[orchestrator] Assembled manuscript for workflow {workflow_id}")
+
+        await self._schedule_exports(workflow_id)
+
+    async def _schedule_exports(self, workflow_id: str) -> None:
+        """Queue pre-generation of manuscript exports, if configured.
+
+        Args:
+            workflow_id: The workflow ID
+        """
+        formats = get_settings().export_pregenerate_formats
+        if not formats:
+            return
+
+        from arakis.workflow.queue import JOB_EXPORT, enqueue_job
+
+        await enqueue_job(self.db, workflow_id, JOB_EXPORT, payload={"formats": list(formats)})
+        await self.db.commit()
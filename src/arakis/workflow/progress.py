@@ -1,12 +1,14 @@
 """Progress tracking infrastructure for real-time workflow feedback.
 
 Provides granular progress updates during workflow execution with:
-- Batched database writes (every 2 seconds)
+- Live events published to the progress broadcaster (streamed to clients over SSE)
+- Database writes only at phase boundaries
 - Rolling buffer of recent events (last 20)
 - Summary statistics for UI display
 - Estimated time remaining calculations
 """
 
+import copy
 import logging
 from collections import deque
 from dataclasses import dataclass, field
@@ -17,6 +19,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from arakis.database.models import WorkflowStageCheckpoint
+from arakis.workflow.broadcast import ProgressBroadcaster, get_progress_broadcaster
 
 logger = logging.getLogger(__name__)
 
@@ -131,10 +134,14 @@ class WritingProgressData:
 
 
 class ProgressTracker:
-    """Batches progress updates to database every 2 seconds.
+    """Publishes progress events live and persists them at phase boundaries.
 
     Maintains a rolling buffer of the last 20 events and summary statistics.
-    Updates are batched to avoid overwhelming the database with writes.
+    Every event is published to the progress broadcaster as a delta (the event
+    plus the progress fields it changed). The checkpoint row is only written
+    when a phase changes, the last item completes or the stage finalizes, so
+    the database sees a handful of writes per stage instead of one every few
+    seconds.
     """
 
     def __init__(
@@ -142,8 +149,8 @@ class ProgressTracker:
         workflow_id: str,
         stage: str,
         db: AsyncSession,
-        batch_interval: float = 2.0,
         max_events: int = 20,
+        broadcaster: Optional[ProgressBroadcaster] = None,
     ):
         """Initialize the progress tracker.
 
@@ -151,14 +158,14 @@ class ProgressTracker:
             workflow_id: The workflow ID
             stage: The stage name (search, screen, etc.)
             db: Async database session
-            batch_interval: Seconds between database writes (default 2.0)
             max_events: Maximum events to keep in rolling buffer (default 20)
+            broadcaster: Broadcaster for live events (defaults to the process-wide one)
         """
         self.workflow_id = workflow_id
         self.stage = stage
         self.db = db
-        self.batch_interval = batch_interval
         self.max_events = max_events
+        self._broadcaster = broadcaster
 
         # Rolling buffer of recent events
         self._recent_events: deque[dict[str, Any]] = deque(maxlen=max_events)
@@ -169,8 +176,9 @@ class ProgressTracker:
         # Summary statistics
         self._summary: dict[str, Any] = {}
 
-        # Timing for batching
-        self._last_flush: datetime = datetime.now(timezone.utc)
+        # Last published progress, for computing deltas
+        self._last_published: dict[str, Any] = {}
+
         self._start_time: Optional[datetime] = None
         self._items_processed: int = 0
         self._total_items: int = 0
@@ -206,16 +214,16 @@ class ProgressTracker:
                 elapsed = (event.timestamp - prev_time).total_seconds()
                 self._processing_times.append(elapsed)
 
-        # Determine if we should flush to database
-        elapsed_since_flush = (datetime.now(timezone.utc) - self._last_flush).total_seconds()
-        should_flush = (
-            elapsed_since_flush >= self.batch_interval
-            or event.event_type == "stage_completed"
+        await self._publish(event)
+
+        # Persist only at phase boundaries; live progress goes through the broadcaster
+        is_boundary = (
+            event.event_type == "stage_completed"
             or event.event_type == "phase_changed"
-            or (event.current == event.total and event.total > 0)
+            or (event.event_type == "item_completed" and event.current == event.total > 0)
         )
 
-        if should_flush:
+        if is_boundary:
             await self._flush()
 
     async def emit_thought(self, thought: str) -> None:
@@ -368,6 +376,46 @@ class ProgressTracker:
         remaining_items = self._total_items - self._items_processed
         return int(avg_time * remaining_items)
 
+    def _progress_data(self) -> dict[str, Any]:
+        """Build the full progress snapshot stored on the checkpoint."""
+        return {
+            **self._stage_data,
+            "summary": self._summary,
+            "recent_decisions": list(self._recent_events),
+            "estimated_remaining_seconds": self._estimate_remaining_seconds(),
+            "items_processed": self._items_processed,
+            "total_items": self._total_items,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def _publish(self, event: ProgressEvent) -> None:
+        """Publish an event and the progress fields it changed."""
+        try:
+            if self._broadcaster is None:
+                self._broadcaster = await get_progress_broadcaster()
+
+            # Copy so later in-place updates of stage data show up in the next delta
+            snapshot = copy.deepcopy(self._progress_data())
+            changes = {
+                key: value
+                for key, value in snapshot.items()
+                if key != "recent_decisions" and self._last_published.get(key) != value
+            }
+            message = {
+                "type": "progress",
+                "workflow_id": self.workflow_id,
+                "stage": self.stage,
+                "event": event.to_dict(),
+                "changes": changes,
+            }
+            await self._broadcaster.publish(
+                self.workflow_id, self.stage, message, snapshot=snapshot
+            )
+            self._last_published = snapshot
+
+        except Exception as e:
+            logger.warning(f"[progress] Failed to publish progress: {e}")
+
     async def _flush(self) -> None:
         """Write progress data to the database checkpoint."""
         try:
@@ -386,22 +434,10 @@ class ProgressTracker:
                 )
                 return
 
-            # Build progress data
-            progress_data = {
-                **self._stage_data,
-                "summary": self._summary,
-                "recent_decisions": list(self._recent_events),
-                "estimated_remaining_seconds": self._estimate_remaining_seconds(),
-                "items_processed": self._items_processed,
-                "total_items": self._total_items,
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-            }
-
             # Update checkpoint
-            checkpoint.progress_data = progress_data
+            checkpoint.progress_data = self._progress_data()
             await self.db.commit()
 
-            self._last_flush = datetime.now(timezone.utc)
             logger.debug(
                 f"[progress] Flushed progress for {self.stage}: "
                 f"{self._items_processed}/{self._total_items}"
@@ -414,6 +450,22 @@ class ProgressTracker:
         """Finalize progress tracking and ensure all data is written."""
         await self._flush()
 
+        # The checkpoint now holds the final progress; drop the live copy
+        if self._broadcaster is not None:
+            try:
+                await self._broadcaster.publish(
+                    self.workflow_id,
+                    self.stage,
+                    {
+                        "type": "stage_finalized",
+                        "workflow_id": self.workflow_id,
+                        "stage": self.stage,
+                    },
+                )
+                await self._broadcaster.discard(self.workflow_id, self.stage)
+            except Exception as e:
+                logger.warning(f"[progress] Failed to publish stage finalization: {e}")
+
 
 def create_screening_callback(
     tracker: ProgressTracker,
@@ -0,0 +1,351 @@
+"""Durable workflow job queue.
+
+Jobs are rows in ``workflow_jobs``, written in the same transaction as the
+workflow change that requested them, so nothing is lost when an API process
+restarts. Any number of ``arakis worker`` processes consume the queue.
+
+Claiming uses ``SELECT ... FOR UPDATE SKIP LOCKED`` on PostgreSQL, so
+concurrent workers never block on or double-claim the same row. SQLite (local
+development and tests) ignores the row lock; there the claim is decided by a
+conditional UPDATE, which SQLite's single-writer locking makes atomic.
+
+A claimed job carries a lease that the worker renews with heartbeats. When a
+worker dies its lease expires and another worker reclaims the job, resuming
+the workflow from its last completed stage checkpoint.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from arakis.database.models import Workflow, WorkflowJob
+
+logger = logging.getLogger(__name__)
+
+# Job kinds
+JOB_EXECUTE = "execute"
+JOB_RESUME = "resume"
+JOB_RERUN = "rerun"
+JOB_EXPORT = "export"
+JOB_KINDS = (JOB_EXECUTE, JOB_RESUME, JOB_RERUN, JOB_EXPORT)
+
+# Kinds that run the workflow itself; their final failure fails the workflow
+WORKFLOW_RUN_KINDS = (JOB_EXECUTE, JOB_RESUME)
+
+# Statuses in which a job still occupies its workflow
+ACTIVE_STATUSES = ("queued", "running")
+
+# Lost claim races retried within a single claim() call
+_CLAIM_RETRIES = 3
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    workflow_id: str,
+    kind: str,
+    payload: Optional[dict[str, Any]] = None,
+    max_attempts: Optional[int] = None,
+) -> WorkflowJob:
+    """Add a job to the queue inside the caller's transaction.
+
+    The job becomes visible to workers when the caller commits, so a workflow
+    row and the job that runs it are written atomically. If the workflow
+    already has an active execute or resume job, that job is returned instead
+    of queueing a duplicate run.
+
+    Args:
+        db: Async database session (caller commits)
+        workflow_id: Workflow the job operates on
+        kind: One of ``JOB_KINDS``
+        payload: Kind-specific arguments (must be JSON-serializable)
+        max_attempts: Executions before giving up (defaults to settings)
+
+    Returns:
+        The queued (or already active) job
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Invalid job kind: {kind}. Must be one of: {', '.join(JOB_KINDS)}")
+
+    if kind != JOB_RERUN:
+        result = await db.execute(
+            select(WorkflowJob).where(
+                WorkflowJob.workflow_id == workflow_id,
+                WorkflowJob.kind == kind,
+                WorkflowJob.status.in_(ACTIVE_STATUSES),
+            )
+        )
+        existing = result.scalars().first()
+        if existing is not None:
+            return existing
+
+    if max_attempts is None:
+        from arakis.config import get_settings
+
+        max_attempts = get_settings().worker_max_attempts
+
+    job = WorkflowJob(
+        workflow_id=workflow_id,
+        kind=kind,
+        payload=payload or {},
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts,
+        created_at=_utc_now(),
+    )
+    db.add(job)
+    await db.flush()
+    return job
+
+
+class JobQueue:
+    """Worker-side operations on the workflow job queue."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        lease_seconds: int = 300,
+        retry_backoff_seconds: float = 30.0,
+    ):
+        """Initialize the queue.
+
+        Args:
+            session_factory: Factory for short-lived sessions (one per queue operation)
+            lease_seconds: How long a claim stays valid without a heartbeat
+            retry_backoff_seconds: Base delay before a failed job is retried
+                (doubled for each further attempt)
+        """
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+    def _claimable(self, now: datetime):
+        """Condition for jobs a worker may claim right now."""
+        return or_(
+            and_(
+                WorkflowJob.status == "queued",
+                or_(WorkflowJob.run_after.is_(None), WorkflowJob.run_after <= now),
+            ),
+            and_(
+                WorkflowJob.status == "running",
+                WorkflowJob.lease_expires_at < now,
+                WorkflowJob.attempts < WorkflowJob.max_attempts,
+            ),
+        )
+
+    async def claim(self, worker_id: str) -> Optional[WorkflowJob]:
+        """Claim the oldest runnable job, including jobs with expired leases.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            The claimed job (status ``running``, attempts incremented) or None
+        """
+        async with self.session_factory() as db:
+            await self._fail_exhausted(db)
+
+            for _ in range(_CLAIM_RETRIES):
+                now = _utc_now()
+                result = await db.execute(
+                    select(WorkflowJob.id)
+                    .where(self._claimable(now))
+                    .order_by(WorkflowJob.id)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                job_id = result.scalar_one_or_none()
+                if job_id is None:
+                    await db.rollback()
+                    return None
+
+                claimed = await db.execute(
+                    update(WorkflowJob)
+                    .where(WorkflowJob.id == job_id, self._claimable(now))
+                    .values(
+                        status="running",
+                        lease_owner=worker_id,
+                        lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                        heartbeat_at=now,
+                        attempts=WorkflowJob.attempts + 1,
+                        started_at=func.coalesce(WorkflowJob.started_at, now),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+
+                if claimed.rowcount == 1:
+                    return await db.get(WorkflowJob, job_id, populate_existing=True)
+                # Another worker won the race; try the next job
+
+        return None
+
+    async def _fail_exhausted(self, db: AsyncSession) -> None:
+        """Fail jobs whose lease expired on their final attempt, and their workflows."""
+        now = _utc_now()
+        result = await db.execute(
+            select(WorkflowJob).where(
+                WorkflowJob.status == "running",
+                WorkflowJob.lease_expires_at < now,
+                WorkflowJob.attempts >= WorkflowJob.max_attempts,
+            )
+        )
+        exhausted = result.scalars().all()
+        if not exhausted:
+            return
+
+        for job in exhausted:
+            logger.error(
+                f"[queue] Job {job.id} ({job.kind}) for workflow {job.workflow_id} lost its "
+                f"lease after {job.attempts} attempts"
+            )
+            job.status = "failed"
+            job.finished_at = now
+            job.lease_owner = None
+            job.error_message = f"Worker lost after {job.attempts} attempts"
+            if job.kind in WORKFLOW_RUN_KINDS:
+                workflow = await db.get(Workflow, job.workflow_id)
+                if workflow is not None and workflow.status == "running":
+                    workflow.status = "failed"
+                    workflow.error_message = "Workflow worker stopped responding. Please retry."
+                    workflow.completed_at = now
+        await db.commit()
+
+    async def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Renew a job's lease.
+
+        Args:
+            job_id: Job ID
+            worker_id: Worker that claimed the job
+
+        Returns:
+            False if the worker no longer owns the job (lease expired and
+            the job was reclaimed); the worker must then abandon it
+        """
+        now = _utc_now()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(WorkflowJob)
+                .where(
+                    WorkflowJob.id == job_id,
+                    WorkflowJob.status == "running",
+                    WorkflowJob.lease_owner == worker_id,
+                )
+                .values(
+                    heartbeat_at=now,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def complete(self, job_id: int, worker_id: str, error: Optional[str] = None) -> bool:
+        """Mark a job as finished.
+
+        Args:
+            job_id: Job ID
+            worker_id: Worker that claimed the job
+            error: Non-retryable error to record (the job still completes)
+
+        Returns:
+            True if the worker still owned the job
+        """
+        return await self._finish(job_id, worker_id, status="completed", error=error)
+
+    async def fail(self, job_id: int, worker_id: str, error: str, retry: bool = True) -> str:
+        """Record a failed execution, requeueing the job if attempts remain.
+
+        Args:
+            job_id: Job ID
+            worker_id: Worker that claimed the job
+            error: Error message
+            retry: Whether the failure is worth retrying
+
+        Returns:
+            New job status: ``queued`` (will be retried) or ``failed``
+        """
+        async with self.session_factory() as db:
+            job = await db.get(WorkflowJob, job_id)
+            if job is None or job.lease_owner != worker_id:
+                return job.status if job is not None else "failed"
+
+            job.error_message = error
+            job.lease_owner = None
+            job.lease_expires_at = None
+            if retry and job.attempts < job.max_attempts:
+                delay = self.retry_backoff_seconds * 2 ** (job.attempts - 1)
+                job.status = "queued"
+                job.run_after = _utc_now() + timedelta(seconds=delay)
+            else:
+                job.status = "failed"
+                job.finished_at = _utc_now()
+            await db.commit()
+            return job.status
+
+    async def release(self, job_id: int, worker_id: str) -> bool:
+        """Hand a job back to the queue without counting the attempt.
+
+        Used on graceful shutdown so another worker resumes the job
+        immediately instead of waiting for the lease to expire.
+
+        Args:
+            job_id: Job ID
+            worker_id: Worker that claimed the job
+
+        Returns:
+            True if the worker still owned the job
+        """
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(WorkflowJob)
+                .where(WorkflowJob.id == job_id, WorkflowJob.lease_owner == worker_id)
+                .values(
+                    status="queued",
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    run_after=None,
+                    attempts=WorkflowJob.attempts - 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def _finish(
+        self, job_id: int, worker_id: str, status: str, error: Optional[str] = None
+    ) -> bool:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(WorkflowJob)
+                .where(WorkflowJob.id == job_id, WorkflowJob.lease_owner == worker_id)
+                .values(
+                    status=status,
+                    error_message=error,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    finished_at=_utc_now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def get(self, job_id: int) -> Optional[WorkflowJob]:
+        """Load a job by ID."""
+        async with self.session_factory() as db:
+            return await db.get(WorkflowJob, job_id)
+
+    async def pending_count(self) -> int:
+        """Number of jobs waiting to be claimed (including expired leases)."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(func.count(WorkflowJob.id)).where(self._claimable(_utc_now()))
+            )
+            return result.scalar_one()
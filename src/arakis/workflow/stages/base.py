@@ -10,6 +10,8 @@ Provides common functionality for all stage executors:
 
 import asyncio
 import logging
+import mimetypes
+import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -25,7 +27,7 @@ from arakis.database.models import (
     WorkflowStageCheckpoint,
     WorkflowTable,
 )
-from arakis.storage.client import get_storage_client
+from arakis.storage.client import IMMUTABLE_CACHE_CONTROL, get_storage_client
 from arakis.workflow.progress import ProgressTracker
 
 logger = logging.getLogger(__name__)
@@ -345,19 +347,21 @@ class BaseStageExecutor(ABC):
         with open(local_path, "rb") as f:
             content = f.read()
 
-        # Generate R2 key
+        # Generate R2 key (timestamped, so the object never changes once written)
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        r2_key = f"workflows/{self.workflow_id}/figures/{figure_type}_{timestamp}.png"
+        extension = os.path.splitext(local_path)[1] or ".png"
+        r2_key = f"workflows/{self.workflow_id}/figures/{figure_type}_{timestamp}{extension}"
 
         # Upload to R2
         result = self.storage_client.upload_bytes(
             data=content,
             key=r2_key,
-            content_type="image/png",
+            content_type=mimetypes.guess_type(r2_key)[0] or "image/png",
             metadata={
                 "workflow_id": self.workflow_id,
                 "figure_type": figure_type,
             },
+            cache_control=IMMUTABLE_CACHE_CONTROL,
         )
 
         if not result.success:
@@ -0,0 +1,362 @@
+"""Workflow worker - runs queued workflow jobs outside the API process.
+
+Started with ``arakis worker``. Each worker claims up to ``concurrency`` jobs
+from the durable queue, renews their leases with heartbeats while
+``WorkflowOrchestrator`` runs them, and records the outcome. Failed jobs are
+retried with backoff; reclaimed jobs (after a crash or deploy) continue from
+the workflow's last completed stage checkpoint.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import traceback
+from collections.abc import Awaitable
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from arakis.database.models import Workflow, WorkflowJob
+from arakis.workflow.queue import (
+    JOB_EXECUTE,
+    JOB_EXPORT,
+    JOB_RERUN,
+    JOB_RESUME,
+    WORKFLOW_RUN_KINDS,
+    JobQueue,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def describe_workflow_error(error: Exception, full_error: str) -> str:
+    """Turn a workflow exception into a message suitable for end users.
+
+    Args:
+        error: The exception raised by the workflow
+        full_error: Formatted traceback
+
+    Returns:
+        User-facing error message
+    """
+    error_msg = str(error)
+
+    if "Semantic Scholar" in full_error:
+        error_msg = "Semantic Scholar rate limit exceeded. Try using only PubMed or OpenAlex."
+    elif "OpenAlex" in full_error and "RateLimitError" in full_error:
+        error_msg = "OpenAlex rate limit exceeded. Try using only PubMed."
+    elif "PubMed" in full_error and "RateLimitError" in full_error:
+        error_msg = "PubMed rate limit exceeded. Please wait a minute and try again."
+    elif "RateLimitError" in error_msg or "RateLimitError" in full_error:
+        if "openai" in full_error.lower():
+            error_msg = "OpenAI API rate limit exceeded. Please wait a few minutes and try again."
+        else:
+            error_msg = "API rate limit exceeded. Try using fewer databases or wait a moment."
+    elif "APIError" in error_msg or "APIError" in full_error:
+        error_msg = "OpenAI API error. Please check your API key and try again."
+    elif "HTTPStatusError" in error_msg or "HTTPStatusError" in full_error:
+        if "429" in full_error:
+            error_msg = "Database API rate limit exceeded. Please wait and try again."
+        elif "503" in full_error:
+            error_msg = "Database service temporarily unavailable. Please try again."
+        else:
+            error_msg = "Database search failed. Please try again with fewer databases."
+    elif "RetryError" in error_msg:
+        error_msg = "Search request failed after multiple retries. Try using only PubMed."
+
+    return error_msg
+
+
+async def run_execute_job(db: AsyncSession, job: WorkflowJob) -> Optional[str]:
+    """Run (or continue) a full workflow.
+
+    Completed stages are never re-executed, so the same handler serves the
+    first attempt and every reclaimed attempt.
+    """
+    from arakis.workflow.orchestrator import WorkflowOrchestrator
+
+    payload = job.payload or {}
+
+    result = await db.execute(select(Workflow).where(Workflow.id == job.workflow_id))
+    workflow = result.scalar_one()
+    workflow.status = "running"
+    await db.commit()
+
+    orchestrator = WorkflowOrchestrator(db)
+    result = await orchestrator.continue_workflow(
+        workflow_id=job.workflow_id,
+        initial_data=payload.get("initial_data", {}),
+        skip_stages=payload.get("skip_stages") or None,
+    )
+
+    logger.info(f"[worker] Workflow {job.workflow_id} finished with status: {result['status']}")
+    return None
+
+
+async def run_resume_job(db: AsyncSession, job: WorkflowJob) -> Optional[str]:
+    """Resume a workflow paused for user action."""
+    from arakis.workflow.orchestrator import WorkflowOrchestrator
+
+    orchestrator = WorkflowOrchestrator(db)
+    result = await orchestrator.resume_workflow(job.workflow_id)
+
+    logger.info(f"[worker] Workflow {job.workflow_id} resumed, status: {result['status']}")
+    return None
+
+
+async def run_rerun_job(db: AsyncSession, job: WorkflowJob) -> Optional[str]:
+    """Re-run a single stage; a failed stage is recorded on the job, not retried."""
+    from arakis.workflow.orchestrator import WorkflowOrchestrator
+
+    payload = job.payload or {}
+    orchestrator = WorkflowOrchestrator(db)
+    result = await orchestrator.rerun_stage(
+        job.workflow_id, payload["stage"], payload.get("input_override")
+    )
+    return None if result.success else (result.error or "Stage failed")
+
+
+async def run_export_job(db: AsyncSession, job: WorkflowJob) -> Optional[str]:
+    """Pre-generate manuscript exports; conversion errors are recorded, not retried."""
+    from arakis.api.exports import pregenerate_exports
+
+    payload = job.payload or {}
+    errors = await pregenerate_exports(db, job.workflow_id, payload.get("formats", []))
+    return "; ".join(errors) or None
+
+
+JobHandler = Callable[[AsyncSession, WorkflowJob], Awaitable[Optional[str]]]
+
+JOB_HANDLERS: dict[str, JobHandler] = {
+    JOB_EXECUTE: run_execute_job,
+    JOB_RESUME: run_resume_job,
+    JOB_RERUN: run_rerun_job,
+    JOB_EXPORT: run_export_job,
+}
+
+
+def default_worker_id() -> str:
+    """Identifier unique to this worker process."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+
+
+class Worker:
+    """Claims workflow jobs from the queue and runs them concurrently."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        session_factory: async_sessionmaker[AsyncSession],
+        worker_id: Optional[str] = None,
+        concurrency: int = 2,
+        poll_interval: float = 2.0,
+        heartbeat_interval: float = 30.0,
+        shutdown_grace: float = 10.0,
+    ):
+        """Initialize the worker.
+
+        Args:
+            queue: Job queue to consume
+            session_factory: Factory for the database session each job runs in
+            worker_id: Lease owner name (defaults to host:pid:random)
+            concurrency: Maximum jobs run at once by this worker
+            poll_interval: Seconds between queue polls while idle or full
+            heartbeat_interval: Seconds between lease renewals
+            shutdown_grace: Seconds running jobs get to finish on shutdown before
+                they are handed back to the queue
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.queue = queue
+        self.session_factory = session_factory
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.shutdown_grace = shutdown_grace
+
+        self._running: dict[int, asyncio.Task] = {}
+        self._lost_leases: set[int] = set()
+        self._shutting_down = False
+
+    @property
+    def active_jobs(self) -> int:
+        """Number of jobs currently running on this worker."""
+        return len(self._running)
+
+    async def run(self, stop: Optional[asyncio.Event] = None, drain: bool = False) -> None:
+        """Process jobs until stopped.
+
+        Args:
+            stop: Event that ends the loop when set
+            drain: Return once the queue is empty and no job is running
+        """
+        stop = stop or asyncio.Event()
+        logger.info(f"[worker] {self.worker_id} started (concurrency={self.concurrency})")
+
+        try:
+            while not stop.is_set():
+                claimed_any = await self._fill_slots()
+
+                if drain and not claimed_any and not self._running:
+                    break
+
+                # Sleep until a slot frees up, the stop event fires or the poll interval passes
+                stop_waiter = asyncio.ensure_future(stop.wait())
+                try:
+                    await asyncio.wait(
+                        {stop_waiter, *self._running.values()},
+                        timeout=self.poll_interval,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                finally:
+                    stop_waiter.cancel()
+        finally:
+            await self._shutdown()
+            logger.info(f"[worker] {self.worker_id} stopped")
+
+    async def _fill_slots(self) -> bool:
+        """Claim jobs until every concurrency slot is busy or the queue is empty."""
+        claimed_any = False
+        while len(self._running) < self.concurrency:
+            try:
+                job = await self.queue.claim(self.worker_id)
+            except Exception as e:
+                logger.warning(f"[worker] Failed to poll queue: {e}")
+                break
+            if job is None:
+                break
+
+            claimed_any = True
+            logger.info(
+                f"[worker] Claimed job {job.id} ({job.kind}) for workflow {job.workflow_id}, "
+                f"attempt {job.attempts}/{job.max_attempts}"
+            )
+            task = asyncio.create_task(self._run_job(job), name=f"workflow-job-{job.id}")
+            self._running[job.id] = task
+            task.add_done_callback(lambda _, job_id=job.id: self._running.pop(job_id, None))
+        return claimed_any
+
+    async def _run_job(self, job: WorkflowJob) -> None:
+        """Run one claimed job, keeping its lease alive until it finishes."""
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, asyncio.current_task()))
+        try:
+            handler = JOB_HANDLERS[job.kind]
+            async with self.session_factory() as db:
+                error = await handler(db, job)
+            await self.queue.complete(job.id, self.worker_id, error=error)
+        except asyncio.CancelledError:
+            if job.id in self._lost_leases:
+                logger.warning(f"[worker] Abandoned job {job.id}: lease taken over")
+            else:
+                # Shutting down: let another worker pick the job up right away
+                await self.queue.release(job.id, self.worker_id)
+                logger.info(f"[worker] Released job {job.id} back to the queue")
+            raise
+        except Exception as e:
+            full_error = traceback.format_exc()
+            error_msg = describe_workflow_error(e, full_error)
+            logger.error(f"[worker] Job {job.id} for workflow {job.workflow_id} failed: {e}")
+            logger.debug(full_error)
+
+            # Invalid input will not fix itself; everything else gets another attempt
+            status = await self.queue.fail(
+                job.id, self.worker_id, error_msg, retry=not isinstance(e, ValueError)
+            )
+            if status == "failed" and job.kind in WORKFLOW_RUN_KINDS:
+                await self._mark_workflow_failed(job.workflow_id, error_msg)
+        finally:
+            heartbeat.cancel()
+            self._lost_leases.discard(job.id)
+
+    async def _heartbeat(self, job_id: int, job_task: asyncio.Task) -> None:
+        """Renew a job's lease periodically; abandon the job if the lease is lost."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                owned = await self.queue.heartbeat(job_id, self.worker_id)
+            except Exception as e:
+                # Transient DB error - the lease has slack for a missed beat
+                logger.warning(f"[worker] Heartbeat for job {job_id} failed: {e}")
+                continue
+            if not owned:
+                self._lost_leases.add(job_id)
+                job_task.cancel()
+                return
+
+    async def _mark_workflow_failed(self, workflow_id: str, error_msg: str) -> None:
+        """Record a permanent failure on the workflow."""
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(select(Workflow).where(Workflow.id == workflow_id))
+                workflow = result.scalar_one_or_none()
+                if workflow is not None:
+                    workflow.status = "failed"
+                    workflow.error_message = error_msg
+                    workflow.completed_at = datetime.now(timezone.utc)
+                    await db.commit()
+        except Exception as db_error:
+            logger.critical(
+                f"Failed to update workflow {workflow_id} status to 'failed': {db_error}"
+            )
+
+    async def _shutdown(self) -> None:
+        """Give running jobs a grace period, then hand the rest back to the queue."""
+        if self._shutting_down or not self._running:
+            return
+        self._shutting_down = True
+
+        tasks = list(self._running.values())
+        _, pending = await asyncio.wait(tasks, timeout=self.shutdown_grace)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._shutting_down = False
+
+
+async def run_worker(
+    concurrency: Optional[int] = None,
+    worker_id: Optional[str] = None,
+    drain: bool = False,
+) -> None:
+    """Run a worker against the configured database until SIGINT/SIGTERM.
+
+    Args:
+        concurrency: Maximum concurrent jobs (defaults to settings)
+        worker_id: Lease owner name (defaults to host:pid:random)
+        drain: Exit once the queue is empty
+    """
+    from arakis.config import get_settings
+    from arakis.database.connection import AsyncSessionLocal, async_engine
+    from arakis.workflow.broadcast import shutdown_progress_broadcaster
+
+    settings = get_settings()
+    queue = JobQueue(AsyncSessionLocal, lease_seconds=settings.worker_lease_seconds)
+    worker = Worker(
+        queue,
+        AsyncSessionLocal,
+        worker_id=worker_id,
+        concurrency=concurrency or settings.worker_concurrency,
+        poll_interval=settings.worker_poll_interval,
+        heartbeat_interval=settings.worker_heartbeat_seconds,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    try:
+        await worker.run(stop, drain=drain)
+    finally:
+        await shutdown_progress_broadcaster()
+        await async_engine.dispose()
@@ -0,0 +1,245 @@
+"""Tests for the cached, non-blocking manuscript export service."""
+
+import asyncio
+import stat
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from arakis.api.exports import (
+    ExportError,
+    ExportService,
+    build_manuscript_response,
+    etag_matches,
+    export_etag,
+)
+from arakis.database.models import Base, Manuscript, Workflow
+
+# ==============================================================================
+# Fixtures
+# ==============================================================================
+
+
+def _write_script(path, body: str) -> str:
+    path.write_text(f"#!/bin/sh\n{body}\n")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+@pytest.fixture
+def fake_pandoc(tmp_path):
+    """A pandoc stand-in that copies its input and logs each invocation."""
+    calls = tmp_path / "calls.log"
+    script = _write_script(
+        tmp_path / "pandoc",
+        f'echo run >> "{calls}"\nsleep 0.1\ncp "$1" "$3"',
+    )
+    return script, calls
+
+
+def _workflow() -> Workflow:
+    return Workflow(
+        id="wf-1",
+        research_question="Does aspirin prevent sepsis?",
+        status="completed",
+        session_id="session-1",
+        papers_found=10,
+        papers_included=3,
+        total_cost=1.5,
+        databases=["pubmed"],
+    )
+
+
+def _manuscript(**overrides) -> Manuscript:
+    fields = {
+        "workflow_id": "wf-1",
+        "title": "Aspirin and sepsis",
+        "introduction": "Intro text",
+        "figures": {"prisma_flow": {"title": "PRISMA", "caption": "Flow", "type": "prisma"}},
+    }
+    fields.update(overrides)
+    return Manuscript(**fields)
+
+
+@pytest.fixture
+def manuscript_data():
+    return build_manuscript_response(_workflow(), _manuscript())
+
+
+# ==============================================================================
+# Service
+# ==============================================================================
+
+
+class TestExportService:
+    """Tests for conversion, caching and the concurrency cap."""
+
+    async def test_converts_once_and_caches_on_disk(self, tmp_path, fake_pandoc, manuscript_data):
+        """A second export of the same manuscript is served from the cache."""
+        pandoc, calls = fake_pandoc
+        service = ExportService(cache_dir=tmp_path / "cache", pandoc_path=pandoc)
+
+        first = await service.export("wf-1", "docx", manuscript_data)
+        second = await service.export("wf-1", "docx", manuscript_data)
+
+        assert b"# Aspirin and sepsis" in first.content
+        assert not first.cached
+        assert second.cached
+        assert second.content == first.content
+        assert first.etag == export_etag(manuscript_data, "docx")
+        assert calls.read_text().count("run") == 1
+
+    async def test_changed_manuscript_is_rendered_again(
+        self, tmp_path, fake_pandoc, manuscript_data
+    ):
+        """Editing the manuscript changes the ETag and replaces the cached artifact."""
+        pandoc, calls = fake_pandoc
+        cache_dir = tmp_path / "cache"
+        service = ExportService(cache_dir=cache_dir, pandoc_path=pandoc)
+        await service.export("wf-1", "docx", manuscript_data)
+
+        edited = build_manuscript_response(_workflow(), _manuscript(introduction="New intro"))
+        artifact = await service.export("wf-1", "docx", edited)
+
+        assert b"New intro" in artifact.content
+        assert artifact.etag != export_etag(manuscript_data, "docx")
+        assert calls.read_text().count("run") == 2
+        assert len(list((cache_dir / "exports" / "wf-1").glob("*.docx"))) == 1
+
+    async def test_concurrent_requests_share_one_conversion(
+        self, tmp_path, fake_pandoc, manuscript_data
+    ):
+        """Simultaneous downloads of the same export run pandoc once."""
+        pandoc, calls = fake_pandoc
+        service = ExportService(cache_dir=tmp_path / "cache", pandoc_path=pandoc)
+
+        artifacts = await asyncio.gather(
+            *(service.export("wf-1", "pdf", manuscript_data) for _ in range(5))
+        )
+
+        assert len({a.content for a in artifacts}) == 1
+        assert calls.read_text().count("run") == 1
+
+    async def test_concurrency_cap(self, tmp_path, manuscript_data):
+        """No more than max_concurrency pandoc processes run at once."""
+        running = tmp_path / "running"
+        running.mkdir()
+        peak = tmp_path / "peak"
+        pandoc = _write_script(
+            tmp_path / "pandoc",
+            f'touch "{running}/$$"\nls "{running}" | wc -l >> "{peak}"\nsleep 0.2\n'
+            f'rm "{running}/$$"\ncp "$1" "$3"',
+        )
+        service = ExportService(max_concurrency=2, pandoc_path=pandoc)
+        documents = [
+            build_manuscript_response(_workflow(), _manuscript(introduction=f"Intro {i}"))
+            for i in range(4)
+        ]
+
+        await asyncio.gather(*(service.export("wf-1", "docx", doc) for doc in documents))
+
+        assert max(int(line) for line in peak.read_text().split()) <= 2
+
+    async def test_pandoc_failure_raises_export_error(self, tmp_path, manuscript_data):
+        """pandoc's stderr is surfaced and nothing is cached."""
+        pandoc = _write_script(tmp_path / "pandoc", 'echo "xelatex not found" >&2\nexit 43')
+        service = ExportService(cache_dir=tmp_path / "cache", pandoc_path=pandoc)
+
+        with pytest.raises(ExportError, match="xelatex not found"):
+            await service.export("wf-1", "pdf", manuscript_data)
+        assert not (tmp_path / "cache").exists()
+
+    async def test_slow_conversion_is_killed(self, tmp_path, manuscript_data):
+        """Conversions exceeding the timeout are killed."""
+        pandoc = _write_script(tmp_path / "pandoc", "exec sleep 10")
+        service = ExportService(timeout=0.2, pandoc_path=pandoc)
+
+        with pytest.raises(ExportError, match="timed out"):
+            await service.export("wf-1", "pdf", manuscript_data)
+
+    async def test_missing_pandoc(self, manuscript_data):
+        """A missing pandoc binary raises FileNotFoundError."""
+        service = ExportService(pandoc_path="/nonexistent/pandoc")
+
+        with pytest.raises(FileNotFoundError):
+            await service.export("wf-1", "docx", manuscript_data)
+
+    async def test_uses_object_storage_when_configured(self, fake_pandoc, manuscript_data):
+        """Artifacts are cached in object storage keyed by content hash."""
+        pandoc, _ = fake_pandoc
+        storage = MagicMock(is_configured=True)
+        storage.exists.return_value = False
+        storage.upload_bytes.return_value = MagicMock(success=True)
+        service = ExportService(storage=storage, pandoc_path=pandoc)
+
+        await service.export("wf-1", "docx", manuscript_data)
+
+        data, key, media_type = storage.upload_bytes.call_args.args
+        assert key.startswith("exports/wf-1/") and key.endswith(".docx")
+        assert media_type.endswith("wordprocessingml.document")
+
+
+def test_etag_matches():
+    """If-None-Match handling covers lists, weak tags and wildcards."""
+    assert etag_matches('"abc-pdf"', '"abc-pdf"')
+    assert etag_matches('"old-pdf", W/"abc-pdf"', '"abc-pdf"')
+    assert etag_matches("*", '"abc-pdf"')
+    assert not etag_matches('"old-pdf"', '"abc-pdf"')
+    assert not etag_matches(None, '"abc-pdf"')
+
+
+# ==============================================================================
+# Endpoint
+# ==============================================================================
+
+
+class TestExportEndpoint:
+    """Tests for ETag revalidation on the download endpoints."""
+
+    @pytest.fixture
+    async def db(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'exports.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as session:
+            session.add(_workflow())
+            session.add(_manuscript())
+            await session.commit()
+        async with factory() as session:
+            yield session
+        await engine.dispose()
+
+    def _request(self, if_none_match=None):
+        request = MagicMock()
+        request.cookies = {"arakis_session": "session-1"}
+        request.headers = {"if-none-match": if_none_match} if if_none_match else {}
+        return request
+
+    async def test_download_then_revalidate(self, db, monkeypatch, manuscript_data):
+        """Downloads carry an ETag; a matching If-None-Match returns 304 without rendering."""
+        from arakis.api.exports import ExportArtifact
+        from arakis.api.routers import manuscripts
+
+        etag = export_etag(manuscript_data, "pdf")
+        service = MagicMock()
+        service.export = AsyncMock(
+            return_value=ExportArtifact(
+                content=b"%PDF", etag=etag, format=manuscripts.EXPORT_FORMATS["pdf"]
+            )
+        )
+        monkeypatch.setattr(manuscripts, "get_export_service", lambda: service)
+
+        response = await manuscripts.export_manuscript_pdf(
+            "wf-1", self._request(), db=db, current_user=None
+        )
+        assert response.status_code == 200
+        assert response.body == b"%PDF"
+        assert response.headers["etag"] == etag
+
+        response = await manuscripts.export_manuscript_pdf(
+            "wf-1", self._request(if_none_match=etag), db=db, current_user=None
+        )
+        assert response.status_code == 304
+        assert service.export.await_count == 1
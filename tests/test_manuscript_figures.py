@@ -0,0 +1,187 @@
+"""Tests for serving manuscript figures from object storage and local disk."""
+
+import io
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from arakis.api.routers import manuscripts
+from arakis.config import get_settings
+from arakis.database.models import Base, Manuscript, Workflow, WorkflowFigure
+from arakis.storage.client import IMMUTABLE_CACHE_CONTROL, StorageResult
+
+FOREST_KEY = "workflows/wf-1/figures/forest_plot_20260101_120000.png"
+PRISMA_KEY = "workflows/wf-1/figures/prisma_flow_20260101_120000.svg"
+
+# ==============================================================================
+# Fixtures
+# ==============================================================================
+
+
+@pytest.fixture
+async def db(tmp_path):
+    """Session on a fresh database with one workflow, its figures and a manuscript."""
+    local_figure = tmp_path / "rob_summary.png"
+    local_figure.write_bytes(b"\x89PNG local figure")
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'figures.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add(
+            Workflow(id="wf-1", research_question="Q", status="completed", session_id="s-1")
+        )
+        session.add_all(
+            [
+                WorkflowFigure(workflow_id="wf-1", figure_type="forest_plot", r2_key=FOREST_KEY),
+                WorkflowFigure(workflow_id="wf-1", figure_type="prisma_flow", r2_key=PRISMA_KEY),
+            ]
+        )
+        session.add(
+            Manuscript(
+                workflow_id="wf-1",
+                title="T",
+                figures={"rob_summary": {"file_path": str(local_figure)}},
+            )
+        )
+        await session.commit()
+    async with factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """Configured storage client stand-in."""
+    client = MagicMock(is_configured=True)
+    client.get_presigned_url.return_value = "https://r2.example.com/signed"
+    monkeypatch.setattr(manuscripts, "get_storage_client", lambda: client)
+    return client
+
+
+def _use_delivery(monkeypatch, delivery: str) -> None:
+    settings = get_settings().model_copy(update={"figure_delivery": delivery})
+    monkeypatch.setattr(manuscripts, "get_settings", lambda: settings)
+
+
+def _request(**headers):
+    request = MagicMock()
+    request.cookies = {"arakis_session": "s-1"}
+    request.headers = headers
+    return request
+
+
+async def _get(db, figure_id, **headers):
+    return await manuscripts.get_figure(
+        "wf-1", figure_id, _request(**headers), db=db, current_user=None
+    )
+
+
+async def _body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+# ==============================================================================
+# Object storage
+# ==============================================================================
+
+
+class TestStorageFigures:
+    """Figures uploaded to object storage."""
+
+    async def test_redirects_to_presigned_url(self, db, storage, monkeypatch):
+        """The API answers with a cacheable redirect and never touches the bytes."""
+        _use_delivery(monkeypatch, "redirect")
+
+        response = await _get(db, "prisma_flow")
+
+        assert response.status_code == 307
+        assert response.headers["location"] == "https://r2.example.com/signed"
+        assert response.headers["cache-control"].startswith("private, max-age=")
+        key = storage.get_presigned_url.call_args.args[0]
+        signed_headers = storage.get_presigned_url.call_args.kwargs["response_headers"]
+        assert key == PRISMA_KEY
+        assert signed_headers["ResponseContentType"] == "image/svg+xml"
+        assert signed_headers["ResponseCacheControl"] == IMMUTABLE_CACHE_CONTROL
+        storage.open_object.assert_not_called()
+
+    async def test_streams_requested_range(self, db, storage, monkeypatch):
+        """In stream mode a Range request is passed to storage and answered with 206."""
+        _use_delivery(monkeypatch, "stream")
+        storage.open_object.return_value = (
+            {"Body": io.BytesIO(b"PNG"), "ContentLength": 3, "ContentRange": "bytes 0-2/100"},
+            StorageResult(success=True, key=FOREST_KEY),
+        )
+
+        response = await _get(db, "forest_plot", range="bytes=0-2")
+
+        assert response.status_code == 206
+        assert storage.open_object.call_args.args == (FOREST_KEY, "bytes=0-2")
+        assert response.headers["content-range"] == "bytes 0-2/100"
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.media_type == "image/png"
+        assert await _body(response) == b"PNG"
+
+    async def test_multi_range_falls_back_to_full_object(self, db, storage, monkeypatch):
+        """Multipart ranges are not proxied; the whole figure is returned."""
+        _use_delivery(monkeypatch, "stream")
+        storage.open_object.return_value = (
+            {"Body": io.BytesIO(b"PNG"), "ContentLength": 3},
+            StorageResult(success=True, key=FOREST_KEY),
+        )
+
+        response = await _get(db, "forest_plot", range="bytes=0-1,5-9")
+
+        assert response.status_code == 200
+        assert storage.open_object.call_args.args == (FOREST_KEY, None)
+
+    async def test_matching_etag_skips_storage(self, db, storage, monkeypatch):
+        """Revalidation is answered from the key alone."""
+        _use_delivery(monkeypatch, "stream")
+        storage.open_object.return_value = (
+            {"Body": io.BytesIO(b"PNG"), "ContentLength": 3},
+            StorageResult(success=True, key=FOREST_KEY),
+        )
+        first = await _get(db, "forest_plot")
+
+        response = await _get(db, "forest_plot", **{"if-none-match": first.headers["etag"]})
+
+        assert response.status_code == 304
+        assert storage.open_object.call_count == 1
+
+
+# ==============================================================================
+# Local fallback
+# ==============================================================================
+
+
+class TestLocalFigures:
+    """Figures only present on the API node's disk."""
+
+    async def test_serves_file_with_revalidation(self, db, storage):
+        """Local files support ranges via FileResponse and revalidate by ETag."""
+        response = await _get(db, "rob_summary")
+
+        assert response.status_code == 200
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["cache-control"] == "private, no-cache"
+
+        response = await _get(db, "rob_summary", **{"if-none-match": response.headers["etag"]})
+        assert response.status_code == 304
+
+    async def test_unknown_figure(self, db, storage):
+        """Figures that are neither stored nor in the manuscript are 404."""
+        with pytest.raises(HTTPException) as exc_info:
+            await _get(db, "funnel_plot")
+        assert exc_info.value.status_code == 404
+
+    async def test_other_sessions_cannot_read(self, db, storage):
+        """Figures are only served to the workflow's owner."""
+        request = _request()
+        request.cookies = {"arakis_session": "someone-else"}
+        with pytest.raises(HTTPException) as exc_info:
+            await manuscripts.get_figure("wf-1", "forest_plot", request, db=db, current_user=None)
+        assert exc_info.value.status_code == 404
@@ -0,0 +1,230 @@
+"""Tests for live progress broadcasting and the SSE progress stream."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from arakis.database.models import Base, Workflow, WorkflowStageCheckpoint
+from arakis.workflow.broadcast import ProgressBroadcaster, Subscription
+from arakis.workflow.progress import ProgressTracker
+
+# ==============================================================================
+# Fixtures
+# ==============================================================================
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """Session factory bound to a fresh SQLite database with one running workflow."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'progress.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        db.add(Workflow(id="wf-1", research_question="Q", status="running", session_id="session-1"))
+        db.add(
+            WorkflowStageCheckpoint(
+                workflow_id="wf-1",
+                stage="screen",
+                status="in_progress",
+                progress_data={"summary": {"total": 0}},
+            )
+        )
+        await db.commit()
+
+    yield factory
+
+    await engine.dispose()
+
+
+async def _checkpoint_progress(session_factory) -> dict:
+    async with session_factory() as db:
+        checkpoint = await db.get(WorkflowStageCheckpoint, 1)
+        return checkpoint.progress_data
+
+
+# ==============================================================================
+# Broadcaster
+# ==============================================================================
+
+
+class TestProgressBroadcaster:
+    """Tests for the in-process broadcaster."""
+
+    async def test_fan_out_to_workflow_subscribers(self):
+        """Messages reach every subscriber of their workflow and no other."""
+        broadcaster = ProgressBroadcaster()
+
+        async with (
+            broadcaster.subscribe("wf-1") as first,
+            broadcaster.subscribe("wf-1") as second,
+            broadcaster.subscribe("wf-2") as other,
+        ):
+            await broadcaster.publish("wf-1", "screen", {"type": "progress", "n": 1})
+
+            assert (await first.get(timeout=1))["n"] == 1
+            assert (await second.get(timeout=1))["n"] == 1
+            assert await other.get(timeout=0.01) is None
+
+        assert broadcaster.subscriber_count("wf-1") == 0
+
+    async def test_snapshot_and_discard(self):
+        """Late subscribers can read the latest progress of each stage."""
+        broadcaster = ProgressBroadcaster()
+        await broadcaster.publish("wf-1", "search", {}, snapshot={"phase": "searching"})
+        await broadcaster.publish("wf-1", "screen", {}, snapshot={"items_processed": 3})
+
+        assert await broadcaster.snapshot("wf-1") == {
+            "search": {"phase": "searching"},
+            "screen": {"items_processed": 3},
+        }
+
+        await broadcaster.discard("wf-1", "search")
+        assert list(await broadcaster.snapshot("wf-1")) == ["screen"]
+        await broadcaster.discard("wf-1")
+        assert await broadcaster.snapshot("wf-1") == {}
+
+    async def test_slow_subscriber_is_marked_lagged(self):
+        """A full subscriber buffer drops messages instead of blocking publishers."""
+        subscription = Subscription("wf-1", maxsize=2)
+        for i in range(3):
+            subscription.put({"n": i})
+
+        assert subscription.lagged
+        subscription.drain()
+        assert not subscription.lagged
+        assert await subscription.get(timeout=0.01) is None
+
+
+# ==============================================================================
+# Tracker
+# ==============================================================================
+
+
+class TestProgressTracker:
+    """Tests for publishing progress and persisting it at phase boundaries."""
+
+    async def test_items_are_published_not_persisted(self, session_factory):
+        """Item events stream live; the checkpoint is only written on the last item."""
+        broadcaster = ProgressBroadcaster()
+        async with session_factory() as db, broadcaster.subscribe("wf-1") as subscription:
+            tracker = ProgressTracker("wf-1", "screen", db, broadcaster=broadcaster)
+
+            await tracker.emit_item_completed(
+                1, 2, {"id": "p1"}, {"decision": "INCLUDE", "is_conflict": False}
+            )
+            message = await subscription.get(timeout=1)
+            assert message["type"] == "progress"
+            assert message["event"]["item_data"] == {"id": "p1"}
+            assert message["changes"]["summary"]["included"] == 1
+            assert "recent_decisions" not in message["changes"]
+            assert await _checkpoint_progress(session_factory) == {"summary": {"total": 0}}
+
+            await tracker.emit_item_completed(
+                2, 2, {"id": "p2"}, {"decision": "EXCLUDE", "is_conflict": False}
+            )
+            message = await subscription.get(timeout=1)
+            # Only changed fields are sent
+            assert "total_items" not in message["changes"]
+            assert message["changes"]["items_processed"] == 2
+
+        persisted = await _checkpoint_progress(session_factory)
+        assert persisted["summary"] == {"total": 2, "included": 1, "excluded": 1}
+        assert len(persisted["recent_decisions"]) == 2
+
+    async def test_phase_change_is_persisted(self, session_factory):
+        """Phase changes are durable so a restarted API shows the current phase."""
+        broadcaster = ProgressBroadcaster()
+        async with session_factory() as db:
+            tracker = ProgressTracker("wf-1", "screen", db, broadcaster=broadcaster)
+            await tracker.emit_thought("Reading abstracts")
+            assert "thought_process" not in await _checkpoint_progress(session_factory)
+
+            await tracker.emit_phase_change("screening")
+
+        assert (await _checkpoint_progress(session_factory))["phase"] == "screening"
+        assert (await broadcaster.snapshot("wf-1"))["screen"]["phase"] == "screening"
+
+    async def test_finalize_persists_and_drops_live_snapshot(self, session_factory):
+        """Finalizing writes the final progress and announces the stage is done."""
+        broadcaster = ProgressBroadcaster()
+        async with session_factory() as db, broadcaster.subscribe("wf-1") as subscription:
+            tracker = ProgressTracker("wf-1", "screen", db, broadcaster=broadcaster)
+            await tracker.emit_thought("Almost done")
+            await tracker.finalize()
+
+            assert (await subscription.get(timeout=1))["type"] == "progress"
+            assert (await subscription.get(timeout=1))["type"] == "stage_finalized"
+
+        assert await broadcaster.snapshot("wf-1") == {}
+        assert (await _checkpoint_progress(session_factory))["items_processed"] == 0
+
+
+# ==============================================================================
+# SSE endpoint
+# ==============================================================================
+
+
+def _parse_sse(chunk: str) -> tuple[str, dict]:
+    lines = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+class TestProgressStreamEndpoint:
+    """Tests for GET /api/workflows/{id}/progress/stream."""
+
+    def _request(self, session_id: str = "session-1"):
+        request = MagicMock()
+        request.cookies = {"arakis_session": session_id}
+        request.is_disconnected = AsyncMock(return_value=False)
+        return request
+
+    async def test_streams_snapshot_then_deltas(self, session_factory, monkeypatch):
+        """The stream starts with merged persisted/live progress, then relays events."""
+        from arakis.api.routers import workflows
+
+        broadcaster = ProgressBroadcaster()
+        monkeypatch.setattr(
+            workflows, "get_progress_broadcaster", AsyncMock(return_value=broadcaster)
+        )
+        await broadcaster.publish("wf-1", "search", {}, snapshot={"phase": "deduplicating"})
+
+        async with session_factory() as db:
+            response = await workflows.stream_workflow_progress(
+                "wf-1", self._request(), db=db, current_user=None
+            )
+        assert response.media_type == "text/event-stream"
+
+        stream = response.body_iterator
+        event, data = _parse_sse(await stream.__anext__())
+        assert event == "snapshot"
+        assert data["stages"] == {
+            "screen": {"summary": {"total": 0}},
+            "search": {"phase": "deduplicating"},
+        }
+
+        await broadcaster.publish(
+            "wf-1", "screen", {"type": "progress", "stage": "screen", "changes": {"x": 1}}
+        )
+        event, data = _parse_sse(await stream.__anext__())
+        assert event == "progress"
+        assert data["changes"] == {"x": 1}
+
+        await stream.aclose()
+        assert broadcaster.subscriber_count("wf-1") == 0
+
+    async def test_other_sessions_cannot_stream(self, session_factory):
+        """Workflows are only streamed to their owner."""
+        from fastapi import HTTPException
+
+        from arakis.api.routers import workflows
+
+        async with session_factory() as db:
+            with pytest.raises(HTTPException) as exc_info:
+                await workflows.stream_workflow_progress(
+                    "wf-1", self._request("someone-else"), db=db, current_user=None
+                )
+        assert exc_info.value.status_code == 404
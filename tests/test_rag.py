@@ -134,6 +134,128 @@ class TestEmbeddingCache:
             assert stats.total_embeddings == 5
             assert stats.total_tokens_embedded == 50
 
+    def test_get_many_and_put_many(self):
+        """Test batched cache reads and writes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = EmbeddingCacheStore(tmpdir)
+
+            from arakis.models.rag import Embedding
+
+            entries = [
+                (
+                    f"paper_{i}:abstract",
+                    f"Abstract {i}",
+                    Embedding(
+                        chunk_id=f"paper_{i}:abstract",
+                        vector=[float(i)] * 16,
+                        model="test-model",
+                        dimensions=16,
+                    ),
+                    7,
+                )
+                for i in range(3)
+            ]
+            cache.put_many(entries)
+
+            hits = cache.get_many(
+                [
+                    ("paper_0:abstract", "Abstract 0"),
+                    ("paper_1:abstract", "Changed text"),
+                    ("paper_2:abstract", "Abstract 2"),
+                    ("missing:abstract", "Nothing"),
+                ],
+                "test-model",
+            )
+
+            assert set(hits) == {"paper_0:abstract", "paper_2:abstract"}
+            assert hits["paper_2:abstract"].vector == [2.0] * 16
+
+    def test_float16_storage(self):
+        """Test half-precision vector storage."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = EmbeddingCacheStore(tmpdir, dtype="float16")
+
+            from arakis.models.rag import Embedding
+
+            embedding = Embedding(
+                chunk_id="p:title", vector=[0.25, -1.5, 3.0], model="m", dimensions=3
+            )
+            cache.put("p:title", "Title", embedding, token_count=1)
+
+            retrieved = cache.get("p:title", "Title", "m")
+            assert retrieved.vector == [0.25, -1.5, 3.0]
+
+    def test_migrates_json_vectors(self):
+        """Test that a database with JSON text vectors is converted to BLOBs."""
+        import hashlib
+        import json
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "embeddings.db"
+            with sqlite3.connect(db_path) as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE embeddings (
+                        chunk_id TEXT PRIMARY KEY,
+                        embedding_hash TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        vector TEXT NOT NULL,
+                        dimensions INTEGER NOT NULL,
+                        token_count INTEGER NOT NULL,
+                        created_at TEXT NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    "INSERT INTO embeddings VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        "old:title",
+                        hashlib.sha256(b"Old title").hexdigest(),
+                        "test-model",
+                        json.dumps([0.5, 0.25]),
+                        2,
+                        3,
+                        "2025-01-01T00:00:00",
+                    ),
+                )
+
+            cache = EmbeddingCacheStore(tmpdir)
+
+            retrieved = cache.get("old:title", "Old title", "test-model")
+            assert retrieved.vector == [0.5, 0.25]
+            (kind,) = cache._conn.execute("SELECT typeof(vector) FROM embeddings").fetchone()
+            assert kind == "blob"
+
+    def test_export_numpy(self):
+        """Test exporting cached vectors to a memory-mapped array."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = EmbeddingCacheStore(tmpdir)
+
+            from arakis.models.rag import Embedding
+
+            cache.put_many(
+                [
+                    (
+                        f"p{i}:title",
+                        f"Title {i}",
+                        Embedding(
+                            chunk_id=f"p{i}:title", vector=[float(i)] * 4, model="m", dimensions=4
+                        ),
+                        1,
+                    )
+                    for i in range(3)
+                ]
+            )
+
+            vectors, chunk_ids = cache.export_numpy(
+                Path(tmpdir) / "vectors.npy", "m", chunk_ids=["p2:title", "p0:title"]
+            )
+
+            assert chunk_ids == ["p2:title", "p0:title"]
+            assert vectors.shape == (2, 4)
+            assert vectors[0].tolist() == [2.0] * 4
+
 
 class TestVectorStore:
     """Tests for vector store."""
@@ -211,6 +333,103 @@ class TestVectorStore:
             assert "test:abstract" in loaded_store.chunks
 
 
+class TestVectorStoreIndexModes:
+    """Tests for approximate index modes and auto-selection."""
+
+    def _random_batch(self, count, dimension=16, seed=0):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        vectors = rng.standard_normal((count, dimension)).astype("float32")
+        chunks = [
+            TextChunk(paper_id=f"p{seed}_{i}", chunk_type=ChunkType.ABSTRACT, text=f"Text {i}")
+            for i in range(count)
+        ]
+        return chunks, vectors
+
+    def test_unknown_metric(self):
+        """Unknown metrics are rejected."""
+        with pytest.raises(ValueError):
+            VectorStore(dimension=8, metric="manhattan")
+
+    def test_cosine_distance_and_similarity(self):
+        """Cosine search returns 1 - cosine similarity as distance."""
+        store = VectorStore(dimension=4, metric="cosine")
+        chunks, _ = self._random_batch(2, dimension=4)
+        store.add_vectors(chunks, [[2.0, 0, 0, 0], [0, 3.0, 0, 0]])
+
+        results = store.search([5.0, 0, 0, 0], top_k=2)
+
+        assert results[0][0].paper_id == chunks[0].paper_id
+        assert results[0][1] == pytest.approx(0.0, abs=1e-6)
+        assert store.similarity(results[1][1]) == pytest.approx(0.0, abs=1e-6)
+
+    def test_hnsw_search(self):
+        """HNSW finds an exact match in a small corpus."""
+        store = VectorStore(dimension=16, index_type="hnsw", metric="cosine", ef_search=32)
+        chunks, vectors = self._random_batch(200)
+        store.add_vectors(chunks, vectors)
+
+        results = store.search(vectors[42].tolist(), top_k=1)
+
+        assert store.active_type == "hnsw"
+        assert results[0][0].chunk_id == chunks[42].chunk_id
+
+    def test_ivf_training_is_deferred(self):
+        """IVF stays exact until enough vectors exist to train it."""
+        store = VectorStore(dimension=16, index_type="ivf", nlist=4)
+
+        few_chunks, few_vectors = self._random_batch(10, seed=1)
+        store.add_vectors(few_chunks, few_vectors)
+        assert store.active_type == "flat"
+        assert store.search(few_vectors[3].tolist(), top_k=1)[0][0] == few_chunks[3]
+
+        chunks, vectors = self._random_batch(200, seed=2)
+        store.add_vectors(chunks, vectors)
+        assert store.active_type == "ivf"
+        assert store.index.is_trained
+
+        # Positions survive the rebuild
+        store.set_search_params(nprobe=4)
+        assert store.search(few_vectors[3].tolist(), top_k=1)[0][0] == few_chunks[3]
+
+    def test_auto_upgrades_with_corpus_size(self):
+        """Auto mode moves from flat to HNSW to IVF-PQ as the corpus grows."""
+        store = VectorStore(dimension=16, index_type="auto", metric="cosine")
+        store.AUTO_HNSW_MIN_VECTORS = 50
+        store.AUTO_IVFPQ_MIN_VECTORS = 10_000
+
+        chunks, vectors = self._random_batch(20, seed=3)
+        store.add_vectors(chunks, vectors)
+        assert store.active_type == "flat"
+
+        more_chunks, more_vectors = self._random_batch(40, seed=4)
+        store.add_vectors(more_chunks, more_vectors)
+        assert store.active_type == "hnsw"
+        assert store.search(vectors[5].tolist(), top_k=1)[0][0] == chunks[5]
+
+        bulk_chunks, bulk_vectors = self._random_batch(10_000, seed=5)
+        store.add_vectors(bulk_chunks, bulk_vectors)
+        assert store.active_type == "ivfpq"
+        assert store.size == 10_060
+        assert store.search(bulk_vectors[0].tolist(), top_k=1)[0][0] == bulk_chunks[0]
+
+    def test_save_and_load_keeps_index_mode(self):
+        """Saved stores reload with the same physical index and metric."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = VectorStore(dimension=16, index_type="hnsw", metric="cosine", ef_search=40)
+            chunks, vectors = self._random_batch(30)
+            store.add_vectors(chunks, vectors)
+            store.save(tmpdir)
+
+            loaded = VectorStore.load(tmpdir)
+
+            assert loaded.active_type == "hnsw"
+            assert loaded.metric == "cosine"
+            assert loaded.ef_search == 40
+            assert loaded.search(vectors[7].tolist(), top_k=1)[0][0] == chunks[7]
+
+
 class TestEmbedder:
     """Tests for embedder."""
 
@@ -407,3 +626,431 @@ class TestRetriever:
             # Load
             loaded = Retriever.load(save_path, cache_dir=tmpdir)
             assert loaded.vector_store.size == 1
+
+
+class TestVectorStoreTombstones:
+    """Tests for tombstone deletes and compaction in the vector store."""
+
+    def _populate(self, store, count):
+        from arakis.models.rag import Embedding
+
+        chunks = [
+            TextChunk(paper_id=f"paper{i}", chunk_type=ChunkType.TITLE, text=f"Title {i}")
+            for i in range(count)
+        ]
+        embeddings = [
+            Embedding(
+                chunk_id=chunk.chunk_id,
+                vector=[float(i)] * store.dimension,
+                model="test",
+                dimensions=store.dimension,
+            )
+            for i, chunk in enumerate(chunks)
+        ]
+        store.add_batch(chunks, embeddings)
+
+    def test_removed_chunk_not_returned(self):
+        """Removed chunks are skipped at search time."""
+        store = VectorStore(dimension=8)
+        self._populate(store, 3)
+
+        store.remove("paper0:title")
+
+        results = store.search([0.0] * 8, top_k=3)
+        assert [chunk.paper_id for chunk, _ in results] == ["paper1", "paper2"]
+        assert store.size == 2
+        assert store.index.ntotal == 3
+
+    def test_compact_drops_tombstones(self):
+        """Compaction physically removes tombstoned vectors."""
+        store = VectorStore(dimension=8)
+        self._populate(store, 4)
+        store.remove("paper1:title")
+
+        assert store.compact() == 1
+        assert store.index.ntotal == 3
+        assert store.tombstones == set()
+        results = store.search([1.0] * 8, top_k=1)
+        assert results[0][0].paper_id in {"paper0", "paper2"}
+
+    def test_search_scoped_to_papers(self):
+        """Search can be restricted to a subset of papers."""
+        store = VectorStore(dimension=8)
+        self._populate(store, 5)
+
+        results = store.search([0.0] * 8, top_k=5, paper_ids=["paper3", "paper4"])
+        assert [chunk.paper_id for chunk, _ in results] == ["paper3", "paper4"]
+
+
+class TestCorpusIndex:
+    """Tests for the persistent corpus index."""
+
+    def _chunks_and_embeddings(self, paper_ids, dimension=8, offset=0.0):
+        from arakis.models.rag import Embedding
+
+        chunks = [
+            TextChunk(paper_id=pid, chunk_type=ChunkType.ABSTRACT, text=f"Abstract of {pid}")
+            for pid in paper_ids
+        ]
+        embeddings = [
+            Embedding(
+                chunk_id=chunk.chunk_id,
+                vector=[float(i) + offset] * dimension,
+                model="test",
+                dimensions=dimension,
+            )
+            for i, chunk in enumerate(chunks)
+        ]
+        return chunks, embeddings
+
+    def test_append_and_reload(self):
+        """Appended chunks are visible after reopening the index."""
+        from arakis.rag import CorpusIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = CorpusIndex(tmpdir, dimension=8)
+            chunks, embeddings = self._chunks_and_embeddings(["10.1/a", "10.1/b"])
+            assert index.add(chunks, embeddings) == 2
+
+            # Same text is not appended twice
+            assert index.add(chunks, embeddings) == 0
+
+            reopened = CorpusIndex(tmpdir, dimension=8)
+            assert reopened.size == 2
+            assert reopened.contains("10.1/a")
+            results = reopened.search([1.0] * 8, top_k=1)
+            assert results[0][0].paper_id == "10.1/b"
+
+    def test_refresh_sees_other_writers(self):
+        """A second handle picks up rows appended by another writer."""
+        from arakis.rag import CorpusIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            reader = CorpusIndex(tmpdir, dimension=8)
+            writer = CorpusIndex(tmpdir, dimension=8)
+            writer.add(*self._chunks_and_embeddings(["pmid1"]))
+
+            reader.refresh()
+            assert reader.contains("pmid1")
+
+    def test_delete_and_compact(self):
+        """Deletes are tombstoned and compaction rewrites the files."""
+        from arakis.rag import CorpusIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = CorpusIndex(tmpdir, dimension=8, compact_threshold=1.0)
+            index.add(*self._chunks_and_embeddings(["p1", "p2", "p3"]))
+
+            assert index.delete_paper("p2")
+            assert not index.delete_paper("missing")
+            assert index.size == 2
+            assert index.store.tombstones
+
+            assert index.compact() == 1
+            assert index.vectors_path.stat().st_size == 2 * 8 * 4
+
+            reopened = CorpusIndex(tmpdir, dimension=8)
+            assert {c.paper_id for c in reopened.store.chunks.values()} == {"p1", "p3"}
+
+    def test_delete_triggers_compaction(self):
+        """Crossing the tombstone threshold compacts automatically."""
+        from arakis.rag import CorpusIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = CorpusIndex(tmpdir, dimension=8, compact_threshold=0.1)
+            index.add(*self._chunks_and_embeddings(["p1", "p2"]))
+
+            index.delete_paper("p1")
+            assert index.store.tombstones == set()
+            assert index.size == 1
+
+    @pytest.mark.asyncio
+    async def test_index_chunks_only_embeds_missing(self):
+        """Only chunks absent from the corpus are sent to the embedder."""
+        from arakis.rag import CorpusIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = CorpusIndex(tmpdir, dimension=8)
+            existing, existing_embeddings = self._chunks_and_embeddings(["p1"])
+            index.add(existing, existing_embeddings)
+
+            new_chunks, new_embeddings = self._chunks_and_embeddings(["p2"])
+            embedder = MagicMock()
+            embedder.embed_chunks = AsyncMock(return_value=new_embeddings)
+
+            added = await index.index_chunks(existing + new_chunks, embedder)
+
+            assert added == 1
+            embedded = embedder.embed_chunks.call_args[0][0]
+            assert [c.paper_id for c in embedded] == ["p2"]
+
+    def test_dimension_mismatch(self):
+        """Opening an index with the wrong dimension fails loudly."""
+        from arakis.rag import CorpusIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            CorpusIndex(tmpdir, dimension=8)
+            with pytest.raises(ValueError):
+                CorpusIndex(tmpdir, dimension=16)
+
+    @pytest.mark.asyncio
+    async def test_retriever_scoped_to_workflow_papers(self):
+        """A corpus-backed retriever only returns papers it indexed."""
+        from arakis.rag import CorpusIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = CorpusIndex(tmpdir, dimension=8)
+            index.add(*self._chunks_and_embeddings(["other-workflow"]))
+
+            chunks, embeddings = self._chunks_and_embeddings(["mine"], offset=5.0)
+            embedder = MagicMock()
+            embedder.model = "test"
+            embedder.create_chunks_from_paper = MagicMock(return_value=chunks)
+            embedder.embed_chunks = AsyncMock(return_value=embeddings)
+            embedder.embed_texts = AsyncMock(return_value=[[0.0] * 8])
+
+            retriever = Retriever(embedder=embedder, cache_dir=tmpdir, corpus_index=index)
+            await retriever.index_papers([Paper(id="mine", title="Mine")])
+
+            response = await retriever.retrieve(RetrievalQuery(query_text="q", top_k=5))
+            assert [r.chunk.paper_id for r in response.results] == ["mine"]
+
+
+class TestBatchedRetrieval:
+    """Tests for multi-query search and retrieval."""
+
+    def _store(self):
+        import numpy as np
+
+        store = VectorStore(dimension=4, metric="cosine")
+        chunks = []
+        for i in range(4):
+            chunks.append(
+                TextChunk(paper_id=f"p{i}", chunk_type=ChunkType.TITLE, text=f"Title {i}")
+            )
+            chunks.append(
+                TextChunk(paper_id=f"p{i}", chunk_type=ChunkType.ABSTRACT, text=f"Abstract {i}")
+            )
+        vectors = np.repeat(np.eye(4, dtype="float32"), 2, axis=0)
+        store.add_vectors(chunks, vectors)
+        return store
+
+    def test_search_batch_matches_single_search(self):
+        """A matrix search returns the same results as per-query searches."""
+        store = self._store()
+        queries = [[1.0, 0, 0, 0], [0, 0, 1.0, 0]]
+
+        batched = store.search_batch(queries, top_k=3)
+
+        assert batched == [store.search(q, top_k=3) for q in queries]
+
+    def test_filters_applied_inside_index(self):
+        """Chunk-type and exclusion filters don't consume top_k slots."""
+        store = self._store()
+
+        results = store.search(
+            [1.0, 0, 0, 0],
+            top_k=2,
+            chunk_types=[ChunkType.ABSTRACT],
+            exclude_paper_ids=["p0"],
+        )
+
+        assert len(results) == 2
+        assert all(chunk.chunk_type == ChunkType.ABSTRACT for chunk, _ in results)
+        assert all(chunk.paper_id != "p0" for chunk, _ in results)
+
+    @pytest.mark.asyncio
+    async def test_retrieve_many_embeds_once(self):
+        """All queries are embedded in one call and answered per query."""
+        store = self._store()
+        embedder = MagicMock()
+        embedder.model = "test"
+        embedder.embed_texts = AsyncMock(return_value=[[1.0, 0, 0, 0], [0, 1.0, 0, 0]])
+        retriever = Retriever(embedder=embedder, vector_store=store)
+
+        responses = await retriever.retrieve_many(
+            [
+                RetrievalQuery(query_text="first", top_k=1, chunk_types=[ChunkType.TITLE]),
+                RetrievalQuery(query_text="second", top_k=2, diversity_weight=0.9),
+            ]
+        )
+
+        embedder.embed_texts.assert_awaited_once_with(["first", "second"])
+        assert [r.chunk.chunk_id for r in responses[0].results] == ["p0:title"]
+        assert responses[1].query.query_text == "second"
+        assert responses[1].results[0].chunk.paper_id == "p1"
+        assert len({r.chunk.paper_id for r in responses[1].results}) == 2
+        assert responses[0].results[0].score == pytest.approx(1.0)
+
+
+class TestFullTextChunking:
+    """Tests for token-window chunking of full text."""
+
+    def test_split_overlapping_windows(self):
+        """Windows have the configured size and overlap and cover the whole text."""
+        from arakis.rag import TextChunker
+
+        chunker = TextChunker(chunk_tokens=50, overlap_tokens=10)
+        tokens = chunker.encoding.encode_ordinary(" ".join(f"word{i}" for i in range(200)))
+
+        windows = chunker.split(chunker.encoding.decode(tokens))
+
+        starts = [start for _, start in windows]
+        assert starts == list(range(0, starts[-1] + 1, 40))
+        assert starts[-1] + 50 >= len(tokens)
+        assert all(len(chunker.encoding.encode_ordinary(text)) <= 50 for text, _ in windows)
+
+    def test_short_text_single_window(self):
+        """Text shorter than a window yields one chunk with normalized whitespace."""
+        from arakis.rag import TextChunker
+
+        assert TextChunker().split("  short\n\ntext  ") == [("short text", 0)]
+        assert TextChunker().split("   ") == []
+
+    def test_invalid_overlap(self):
+        """Overlap must be smaller than the window."""
+        from arakis.rag import TextChunker
+
+        with pytest.raises(ValueError):
+            TextChunker(chunk_tokens=10, overlap_tokens=10)
+
+    def test_embedder_adds_full_text_chunks(self, sample_papers):
+        """Papers with full text get uniquely identified FULL_TEXT chunks."""
+        from arakis.rag import TextChunker
+
+        paper = sample_papers[0]
+        paper.full_text = " ".join(f"token{i}" for i in range(300))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            embedder = Embedder(
+                cache_dir=tmpdir, chunker=TextChunker(chunk_tokens=100, overlap_tokens=20)
+            )
+            chunks = embedder.create_chunks_from_paper(paper)
+
+        full_text = [c for c in chunks if c.chunk_type == ChunkType.FULL_TEXT]
+        assert len(full_text) == 4
+        assert [c.part for c in full_text] == [0, 1, 2, 3]
+        assert len({c.chunk_id for c in chunks}) == len(chunks)
+        assert full_text[1].chunk_id == f"{paper.best_identifier}:full_text:1"
+        assert full_text[1].metadata["token_start"] == 80
+
+
+class TestBM25Index:
+    """Tests for the BM25 inverted index."""
+
+    def _index(self):
+        from arakis.rag import BM25Index
+
+        index = BM25Index()
+        index.add_batch(
+            [
+                TextChunk("p1", ChunkType.ABSTRACT, "Metformin lowers HbA1c in type 2 diabetes"),
+                TextChunk("p2", ChunkType.ABSTRACT, "Exercise improves glycemic control"),
+                TextChunk("p3", ChunkType.TITLE, "Metformin and metformin dosing strategies"),
+                TextChunk("p3", ChunkType.ABSTRACT, "Insulin therapy outcomes in adults"),
+            ]
+        )
+        return index
+
+    def test_ranks_term_matches(self):
+        """Chunks with more (and rarer) query terms rank higher."""
+        index = self._index()
+
+        results = index.search("metformin diabetes", top_k=5)
+
+        assert [c.chunk_id for c, _ in results] == ["p1:abstract", "p3:title"]
+        assert results[0][1] > results[1][1] > 0
+
+    def test_filters_before_scoring(self):
+        """Paper, type and exclusion filters restrict the candidates."""
+        index = self._index()
+
+        assert index.search("metformin", chunk_types=[ChunkType.ABSTRACT])[0][0].paper_id == "p1"
+        assert index.search("metformin", exclude_paper_ids=["p1"])[0][0].paper_id == "p3"
+        assert index.search("metformin", paper_ids=["p2"]) == []
+
+    def test_remove_paper(self):
+        """Removing a paper drops its postings and length statistics."""
+        index = self._index()
+
+        assert index.remove_paper("p3") == 2
+        assert index.size == 2
+        assert index.paper_count == 2
+        assert "dosing" not in index.postings
+        assert [c.paper_id for c, _ in index.search("metformin")] == ["p1"]
+
+    def test_save_load(self):
+        """Saved index returns identical results after loading."""
+        from arakis.rag import BM25Index
+
+        index = self._index()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index.save(tmpdir)
+            loaded = BM25Index.load(tmpdir)
+
+        assert loaded.search("metformin insulin") == index.search("metformin insulin")
+
+
+class TestHybridRetriever:
+    """Tests for BM25 + vector reciprocal-rank fusion."""
+
+    def _retriever(self, **kwargs):
+        import numpy as np
+
+        from arakis.rag import HybridRetriever
+
+        store = VectorStore(dimension=4, metric="cosine")
+        chunks = [
+            TextChunk(f"p{i}", ChunkType.ABSTRACT, text)
+            for i, text in enumerate(
+                [
+                    "metformin glucose trial",
+                    "exercise program outcomes",
+                    "insulin pump adherence",
+                    "diet counselling study",
+                ]
+            )
+        ]
+        store.add_vectors(chunks, np.eye(4, dtype="float32"))
+        embedder = MagicMock()
+        embedder.model = "test"
+        embedder.embed_texts = AsyncMock(return_value=[[0, 1.0, 0, 0]])
+        retriever = HybridRetriever(embedder=embedder, vector_store=store, **kwargs)
+        retriever.bm25_index.add_batch(chunks)
+        return retriever
+
+    @pytest.mark.asyncio
+    async def test_fuses_lexical_and_semantic(self):
+        """Lexical and semantic top hits both rank above unmatched chunks."""
+        retriever = self._retriever()
+
+        response = await retriever.retrieve(RetrievalQuery(query_text="metformin", top_k=4))
+
+        top_two = {r.chunk.paper_id for r in response.results[:2]}
+        assert top_two == {"p0", "p1"}
+        assert response.results[0].score <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_prefilter_restricts_vector_search(self):
+        """Over large collections vector search only sees lexical matches."""
+        retriever = self._retriever(prefilter_papers=1)
+        retriever.bm25_index.add(TextChunk("p2", ChunkType.TITLE, "metformin insulin"))
+
+        response = await retriever.retrieve(RetrievalQuery(query_text="metformin", top_k=4))
+
+        assert "p1" not in {r.chunk.paper_id for r in response.results}
+
+    @pytest.mark.asyncio
+    async def test_save_load_keeps_bm25(self):
+        """The BM25 index is saved next to the vector store."""
+        from arakis.rag import HybridRetriever
+
+        retriever = self._retriever()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            retriever.save(tmpdir)
+            assert (Path(tmpdir) / "bm25" / "chunks.pkl").exists()
+            with patch("arakis.rag.retriever.Embedder"):
+                loaded = HybridRetriever.load(tmpdir, cache_dir=tmpdir)
+
+        assert loaded.bm25_index.size == 4
+        assert loaded.vector_store.size == 4
@@ -0,0 +1,110 @@
+"""Tests for the GCRA API rate limiters."""
+
+import pytest
+
+from arakis.api.ratelimit import InMemoryRateLimiter, RedisRateLimiter, gcra
+
+
+class TestGcra:
+    """Tests for the pure GCRA step."""
+
+    def test_admits_burst_of_limit_then_rejects(self):
+        """Exactly `limit` simultaneous requests pass, counting down remaining."""
+        tat, now = 0.0, 1000.0
+        remaining_seen = []
+        for _ in range(5):
+            allowed, tat, remaining, _ = gcra(tat, now, limit=5, window_seconds=60)
+            assert allowed
+            remaining_seen.append(remaining)
+
+        allowed, rejected_tat, remaining, retry_after = gcra(tat, now, 5, 60)
+
+        assert remaining_seen == [4, 3, 2, 1, 0]
+        assert not allowed
+        assert rejected_tat == tat
+        assert retry_after == 12  # one emission interval (60 / 5)
+
+    def test_capacity_recovers_gradually(self):
+        """One slot frees up every window/limit seconds."""
+        tat = 0.0
+        for _ in range(3):
+            _, tat, _, _ = gcra(tat, 0.0, limit=3, window_seconds=30)
+
+        assert not gcra(tat, 9.9, 3, 30)[0]
+        allowed, tat, remaining, _ = gcra(tat, 10.0, 3, 30)
+        assert allowed and remaining == 0
+        assert gcra(tat, 60.0, 3, 30)[2] == 2
+
+
+class TestInMemoryRateLimiter:
+    """Tests for the in-process limiter."""
+
+    async def test_limits_per_key(self):
+        """Keys are limited independently."""
+        limiter = InMemoryRateLimiter()
+
+        results = [await limiter.is_allowed("a", 2, 60) for _ in range(3)]
+        assert [r[0] for r in results] == [True, True, False]
+        assert results[2][2] >= 1
+        assert (await limiter.is_allowed("b", 2, 60))[0]
+
+        await limiter.reset("a")
+        assert (await limiter.is_allowed("a", 2, 60))[0]
+
+    async def test_state_is_constant_per_key(self, monkeypatch):
+        """Drained keys are swept and each key holds a single timestamp."""
+        clock = [100.0]
+        monkeypatch.setattr("arakis.api.ratelimit.time.monotonic", lambda: clock[0])
+        limiter = InMemoryRateLimiter()
+
+        for _ in range(1000):
+            await limiter.is_allowed("a", 10_000, 1)
+        await limiter.is_allowed("b", 1, 1)
+        assert set(limiter._tats) == {"a", "b"}
+
+        clock[0] += 5
+        assert await limiter.cleanup() == 2
+        assert limiter._tats == {}
+
+
+class TestRedisRateLimiter:
+    """Tests for the Lua-script limiter against fakeredis."""
+
+    @pytest.fixture
+    async def limiter(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+
+        limiter = RedisRateLimiter("redis://fake")
+        limiter._redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        limiter._script = limiter._redis.register_script(
+            __import__("arakis.api.ratelimit", fromlist=["_GCRA_SCRIPT"])._GCRA_SCRIPT
+        )
+        yield limiter
+        await limiter.disconnect()
+
+    async def test_single_key_with_expiry(self, limiter):
+        """Each check touches one key, which expires once the bucket drains."""
+        results = [await limiter.is_allowed("login:1.2.3.4", 3, 60) for _ in range(4)]
+
+        assert [r[:2] for r in results[:3]] == [(True, 2), (True, 1), (True, 0)]
+        assert results[3][0] is False
+        assert 1 <= results[3][2] <= 20
+        assert await limiter._redis.keys("*") == ["ratelimit:login:1.2.3.4"]
+        assert 0 < await limiter._redis.pttl("ratelimit:login:1.2.3.4") <= 60_000
+
+    async def test_rejection_does_not_consume_capacity(self, limiter):
+        """Rejected requests leave the stored state untouched."""
+        await limiter.is_allowed("k", 1, 60)
+        before = await limiter._redis.get("ratelimit:k")
+
+        for _ in range(5):
+            assert not (await limiter.is_allowed("k", 1, 60))[0]
+
+        assert await limiter._redis.get("ratelimit:k") == before
+
+    async def test_reset(self, limiter):
+        """Resetting a key restores its full allowance."""
+        await limiter.is_allowed("k", 1, 60)
+        await limiter.reset("k")
+        assert await limiter.is_allowed("k", 1, 60) == (True, 0, 0)
@@ -0,0 +1,307 @@
+"""Tests for the durable workflow job queue and worker.
+
+Runs against the SQLite stand-in for the PostgreSQL queue.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from arakis.database.models import Base, Workflow, WorkflowJob
+from arakis.workflow.queue import JOB_EXECUTE, JOB_RERUN, JOB_RESUME, JobQueue, enqueue_job
+from arakis.workflow.worker import Worker
+
+# ==============================================================================
+# Fixtures
+# ==============================================================================
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """Session factory bound to a fresh SQLite database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queue.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+async def _create_workflow(session_factory, workflow_id: str = "wf-1", **job_kwargs) -> int:
+    """Insert a workflow and its execute job; return the job ID."""
+    async with session_factory() as db:
+        db.add(Workflow(id=workflow_id, research_question="Q", status="pending"))
+        job = await enqueue_job(db, workflow_id, JOB_EXECUTE, payload={"initial_data": {}})
+        if job_kwargs:
+            for key, value in job_kwargs.items():
+                setattr(job, key, value)
+        await db.commit()
+        return job.id
+
+
+async def _expire_lease(session_factory, job_id: int) -> None:
+    async with session_factory() as db:
+        await db.execute(
+            update(WorkflowJob)
+            .where(WorkflowJob.id == job_id)
+            .values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        await db.commit()
+
+
+# ==============================================================================
+# Queue
+# ==============================================================================
+
+
+class TestJobQueue:
+    """Tests for claiming, leasing and retrying jobs."""
+
+    async def test_claim_marks_job_running(self, session_factory):
+        """A claimed job is leased to the worker and not handed out twice."""
+        job_id = await _create_workflow(session_factory)
+        queue = JobQueue(session_factory, lease_seconds=60)
+
+        job = await queue.claim("worker-a")
+
+        assert job.id == job_id
+        assert job.status == "running"
+        assert job.lease_owner == "worker-a"
+        assert job.attempts == 1
+        assert await queue.claim("worker-b") is None
+
+    async def test_concurrent_claims_get_distinct_jobs(self, session_factory):
+        """Workers racing for the queue never claim the same job."""
+        for i in range(4):
+            await _create_workflow(session_factory, workflow_id=f"wf-{i}")
+        queue = JobQueue(session_factory)
+
+        jobs = await asyncio.gather(*(queue.claim(f"worker-{i}") for i in range(6)))
+
+        claimed = [job.id for job in jobs if job is not None]
+        assert len(claimed) == 4
+        assert len(set(claimed)) == 4
+
+    async def test_enqueue_deduplicates_active_runs(self, session_factory):
+        """A second execute request for the same workflow reuses the active job."""
+        job_id = await _create_workflow(session_factory)
+
+        async with session_factory() as db:
+            again = await enqueue_job(db, "wf-1", JOB_EXECUTE)
+            rerun = await enqueue_job(db, "wf-1", JOB_RERUN, payload={"stage": "screen"})
+            await db.commit()
+
+        assert again.id == job_id
+        assert rerun.id != job_id
+
+    async def test_expired_lease_is_reclaimed(self, session_factory):
+        """A job whose worker stopped heartbeating is reclaimed by another worker."""
+        job_id = await _create_workflow(session_factory)
+        queue = JobQueue(session_factory, lease_seconds=60)
+        await queue.claim("worker-a")
+        assert await queue.heartbeat(job_id, "worker-a")
+
+        await _expire_lease(session_factory, job_id)
+        job = await queue.claim("worker-b")
+
+        assert job.id == job_id
+        assert job.lease_owner == "worker-b"
+        assert job.attempts == 2
+        # The old worker learns it lost the job on its next heartbeat
+        assert not await queue.heartbeat(job_id, "worker-a")
+        assert not await queue.complete(job_id, "worker-a")
+
+    async def test_fail_requeues_with_backoff(self, session_factory):
+        """Failed jobs are retried after a delay until attempts run out."""
+        job_id = await _create_workflow(session_factory, max_attempts=2)
+        queue = JobQueue(session_factory, retry_backoff_seconds=60)
+
+        await queue.claim("worker-a")
+        assert await queue.fail(job_id, "worker-a", "boom") == "queued"
+        # Backoff: not claimable yet
+        assert await queue.claim("worker-a") is None
+
+        async with session_factory() as db:
+            await db.execute(update(WorkflowJob).values(run_after=None))
+            await db.commit()
+        await queue.claim("worker-a")
+        assert await queue.fail(job_id, "worker-a", "boom") == "failed"
+
+    async def test_lost_final_attempt_fails_workflow(self, session_factory):
+        """A job that loses its lease on the last attempt fails its workflow."""
+        job_id = await _create_workflow(session_factory, max_attempts=1)
+        queue = JobQueue(session_factory)
+        await queue.claim("worker-a")
+        async with session_factory() as db:
+            workflow = await db.get(Workflow, "wf-1")
+            workflow.status = "running"
+            await db.commit()
+
+        await _expire_lease(session_factory, job_id)
+        assert await queue.claim("worker-b") is None
+
+        async with session_factory() as db:
+            assert (await db.get(WorkflowJob, job_id)).status == "failed"
+            assert (await db.get(Workflow, "wf-1")).status == "failed"
+
+    async def test_release_returns_job_without_consuming_attempt(self, session_factory):
+        """Released jobs are immediately claimable by another worker."""
+        job_id = await _create_workflow(session_factory)
+        queue = JobQueue(session_factory)
+        await queue.claim("worker-a")
+
+        assert await queue.release(job_id, "worker-a")
+        job = await queue.claim("worker-b")
+
+        assert job.id == job_id
+        assert job.attempts == 1
+
+
+# ==============================================================================
+# Worker
+# ==============================================================================
+
+
+class TestWorker:
+    """Tests for the worker loop."""
+
+    def _worker(self, session_factory, **kwargs):
+        return Worker(
+            JobQueue(session_factory, retry_backoff_seconds=0),
+            session_factory,
+            worker_id="test-worker",
+            poll_interval=0.01,
+            **kwargs,
+        )
+
+    async def test_runs_execute_job_from_checkpoint(self, session_factory):
+        """Execute jobs continue the workflow from its last checkpoint."""
+        job_id = await _create_workflow(session_factory)
+
+        with patch(
+            "arakis.workflow.orchestrator.WorkflowOrchestrator.continue_workflow",
+            new_callable=AsyncMock,
+            return_value={"status": "completed"},
+        ) as continue_workflow:
+            await self._worker(session_factory).run(drain=True)
+
+        continue_workflow.assert_awaited_once_with(
+            workflow_id="wf-1", initial_data={}, skip_stages=None
+        )
+        async with session_factory() as db:
+            assert (await db.get(WorkflowJob, job_id)).status == "completed"
+            assert (await db.get(Workflow, "wf-1")).status == "running"
+
+    async def test_concurrency_limit(self, session_factory):
+        """A worker never runs more jobs than its concurrency limit."""
+        for i in range(5):
+            await _create_workflow(session_factory, workflow_id=f"wf-{i}")
+        worker = self._worker(session_factory, concurrency=2)
+        peak = 0
+
+        async def slow_job(self, workflow_id, initial_data, skip_stages):
+            nonlocal peak
+            peak = max(peak, worker.active_jobs)
+            await asyncio.sleep(0.02)
+            return {"status": "completed"}
+
+        with patch("arakis.workflow.orchestrator.WorkflowOrchestrator.continue_workflow", slow_job):
+            await worker.run(drain=True)
+
+        assert peak == 2
+        assert await worker.queue.pending_count() == 0
+
+    async def test_failure_marks_workflow_failed_after_last_attempt(self, session_factory):
+        """Exceptions are retried, then surface as a user-facing workflow error."""
+        job_id = await _create_workflow(session_factory, max_attempts=2)
+
+        with patch(
+            "arakis.workflow.orchestrator.WorkflowOrchestrator.continue_workflow",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("RateLimitError from openai"),
+        ) as continue_workflow:
+            await self._worker(session_factory).run(drain=True)
+
+        assert continue_workflow.await_count == 2
+        async with session_factory() as db:
+            job = await db.get(WorkflowJob, job_id)
+            workflow = await db.get(Workflow, "wf-1")
+        assert job.status == "failed"
+        assert workflow.status == "failed"
+        assert "OpenAI API rate limit" in workflow.error_message
+
+    async def test_rerun_failure_recorded_on_job(self, session_factory):
+        """A failed stage re-run completes the job with the stage error."""
+        from arakis.workflow.stages.base import StageResult
+
+        await _create_workflow(session_factory)
+        async with session_factory() as db:
+            await db.execute(update(WorkflowJob).values(status="completed"))
+            job = await enqueue_job(db, "wf-1", JOB_RERUN, payload={"stage": "screen"})
+            await db.commit()
+
+        with patch(
+            "arakis.workflow.orchestrator.WorkflowOrchestrator.rerun_stage",
+            new_callable=AsyncMock,
+            return_value=StageResult(success=False, error="bad input"),
+        ):
+            await self._worker(session_factory).run(drain=True)
+
+        async with session_factory() as db:
+            job = await db.get(WorkflowJob, job.id)
+        assert job.status == "completed"
+        assert job.error_message == "bad input"
+
+    async def test_shutdown_releases_running_jobs(self, session_factory):
+        """Stopping the worker hands unfinished jobs back to the queue."""
+        job_id = await _create_workflow(session_factory)
+        async with session_factory() as db:
+            await enqueue_job(db, "wf-1", JOB_RESUME)
+            await db.commit()
+        worker = self._worker(session_factory, concurrency=1, shutdown_grace=0)
+        stop = asyncio.Event()
+        started = asyncio.Event()
+
+        async def hang(self, *args, **kwargs):
+            started.set()
+            await asyncio.sleep(60)
+
+        with patch("arakis.workflow.orchestrator.WorkflowOrchestrator.continue_workflow", hang):
+            run = asyncio.create_task(worker.run(stop))
+            await started.wait()
+            stop.set()
+            await run
+
+        async with session_factory() as db:
+            job = await db.get(WorkflowJob, job_id)
+        assert job.status == "queued"
+        assert job.attempts == 0
+        assert job.lease_owner is None
+
+    async def test_export_failure_does_not_fail_workflow(self, session_factory):
+        """Pre-generating exports is best-effort for a completed workflow."""
+        from arakis.workflow.queue import JOB_EXPORT
+
+        async with session_factory() as db:
+            db.add(Workflow(id="wf-1", research_question="Q", status="completed"))
+            job = await enqueue_job(db, "wf-1", JOB_EXPORT, payload={"formats": ["pdf"]})
+            await db.commit()
+
+        with patch(
+            "arakis.api.exports.pregenerate_exports",
+            new_callable=AsyncMock,
+            return_value=["pdf: pandoc timed out"],
+        ):
+            await self._worker(session_factory).run(drain=True)
+
+        async with session_factory() as db:
+            job = await db.get(WorkflowJob, job.id)
+            workflow = await db.get(Workflow, "wf-1")
+        assert job.status == "completed"
+        assert job.error_message == "pdf: pandoc timed out"
+        assert workflow.status == "completed"